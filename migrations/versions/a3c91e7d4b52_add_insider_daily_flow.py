@@ -0,0 +1,70 @@
+"""add insider_daily_flow summary table
+
+Revision ID: a3c91e7d4b52
+Revises: 5ff0630fa272
+Create Date: 2026-10-19 09:12:03.481220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91e7d4b52'
+down_revision: Union[str, Sequence[str], None] = '5ff0630fa272'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'insider_daily_flow',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('issuer_ticker', sa.String(), nullable=True),
+        sa.Column('period_of_report', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('acquired_disposed', sa.String(), nullable=True),
+        sa.Column('code', sa.String(), nullable=True),
+        sa.Column('total_value', sa.Numeric(), nullable=True),
+        sa.Column('shares', sa.Numeric(), nullable=True),
+        sa.Column('n_transactions', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'issuer_ticker', 'period_of_report', 'acquired_disposed', 'code',
+            name='uq_insider_daily_flow_key',
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.create_index(
+        op.f('ix_insider_daily_flow_period_of_report'),
+        'insider_daily_flow',
+        ['period_of_report'],
+        unique=False,
+    )
+
+    # Backfill from existing transactions; the loader keeps it current after this.
+    op.execute("""
+        INSERT INTO insider_daily_flow (
+            issuer_ticker, period_of_report, acquired_disposed, code,
+            total_value, shares, n_transactions
+        )
+        SELECT
+            issuer_ticker,
+            date_trunc('day', period_of_report, 'UTC'),
+            acquired_disposed,
+            code,
+            COALESCE(SUM(total_value), 0),
+            COALESCE(SUM(shares), 0),
+            COUNT(*)
+        FROM insider_transactions
+        WHERE period_of_report IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_insider_daily_flow_period_of_report'), table_name='insider_daily_flow')
+    op.drop_table('insider_daily_flow')
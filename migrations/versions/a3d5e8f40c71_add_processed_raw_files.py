@@ -0,0 +1,41 @@
+"""add processed_raw_files ledger
+
+Raw files already loaded by build-dataset, keyed by content hash.
+
+Revision ID: a3d5e8f40c71
+Revises: f7a2c6e91d3b
+Create Date: 2026-10-19 19:12:08.441730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d5e8f40c71'
+down_revision: Union[str, Sequence[str], None] = 'f7a2c6e91d3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'processed_raw_files',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('filings', sa.Integer(), nullable=True),
+        sa.Column('rows_loaded', sa.Integer(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('processed_raw_files')
@@ -0,0 +1,38 @@
+"""add path / mtime_ns to processed_raw_files
+
+Lets build-dataset skip unchanged files by stat instead of re-hashing them.
+
+Revision ID: b8e4f2c17d95
+Revises: a3d5e8f40c71
+Create Date: 2026-10-19 22:41:53.108342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4f2c17d95'
+down_revision: Union[str, Sequence[str], None] = 'a3d5e8f40c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('processed_raw_files', sa.Column('path', sa.String(), nullable=True))
+    op.add_column('processed_raw_files', sa.Column('mtime_ns', sa.BigInteger(), nullable=True))
+    op.create_index(
+        'ix_processed_raw_files_stat',
+        'processed_raw_files',
+        ['path', 'size_bytes', 'mtime_ns'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_processed_raw_files_stat', table_name='processed_raw_files')
+    op.drop_column('processed_raw_files', 'mtime_ns')
+    op.drop_column('processed_raw_files', 'path')
@@ -0,0 +1,105 @@
+"""tune indexes for repository queries
+
+Composite / covering indexes matched to InsiderRepository access paths,
+BRIN on the append-ordered filed_at column, and removal of single-column
+indexes made redundant by a composite prefix.
+
+ohlc_exists_in_range (ticker + date) is already served by the
+ohlc_prices (ticker, date) primary key, so nothing is added for it.
+
+Revision ID: c7e2f1a9d804
+Revises: a3c91e7d4b52
+Create Date: 2026-10-19 11:40:27.093114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2f1a9d804'
+down_revision: Union[str, Sequence[str], None] = 'a3c91e7d4b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # get_transactions / get_rollup with ticker + period range
+    op.create_index(
+        'ix_insider_transactions_ticker_period',
+        'insider_transactions',
+        ['issuer_ticker', 'period_of_report'],
+        postgresql_include=['acquired_disposed', 'code', 'reporter', 'total_value'],
+    )
+    # period range only (plot handlers); index-only for the projected columns
+    op.create_index(
+        'ix_insider_transactions_period_cover',
+        'insider_transactions',
+        ['period_of_report'],
+        postgresql_include=['issuer_ticker', 'acquired_disposed', 'code', 'reporter', 'total_value'],
+    )
+    op.create_index(
+        'ix_insider_transactions_cik_period',
+        'insider_transactions',
+        ['issuer_cik', 'period_of_report'],
+    )
+    # reporter lookups: by CIK, and by name tokens (ILIKE '%tok%')
+    op.create_index(
+        'ix_insider_transactions_reporter_cik_period',
+        'insider_transactions',
+        ['reporter_cik', 'period_of_report'],
+    )
+    op.create_index(
+        'ix_insider_transactions_reporter_trgm',
+        'insider_transactions',
+        ['reporter'],
+        postgresql_using='gin',
+        postgresql_ops={'reporter': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_insider_transactions_filed_at_brin',
+        'insider_transactions',
+        ['filed_at'],
+        postgresql_using='brin',
+    )
+    # insider_rollup join side
+    op.create_index(
+        'ix_exchange_mapping_ticker_cover',
+        'exchange_mapping',
+        ['issuer_ticker'],
+        postgresql_include=[
+            'name', 'exchange', 'is_delisted', 'category',
+            'sector', 'industry', 'sic_sector', 'sic_industry',
+        ],
+    )
+
+    # superseded by the indexes above
+    op.drop_index('ix_insider_transactions_issuer_ticker', table_name='insider_transactions', if_exists=True)
+    op.drop_index('ix_insider_transactions_issuer_cik', table_name='insider_transactions', if_exists=True)
+    op.drop_index('ix_insider_transactions_period_of_report', table_name='insider_transactions', if_exists=True)
+    op.drop_index('ix_insider_transactions_filed_at', table_name='insider_transactions', if_exists=True)
+    op.drop_index('ix_exchange_mapping_issuer_ticker', table_name='exchange_mapping', if_exists=True)
+
+    op.execute("ANALYZE insider_transactions")
+    op.execute("ANALYZE exchange_mapping")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_exchange_mapping_issuer_ticker', 'exchange_mapping', ['issuer_ticker'], unique=False)
+    op.create_index('ix_insider_transactions_filed_at', 'insider_transactions', ['filed_at'], unique=False)
+    op.create_index('ix_insider_transactions_period_of_report', 'insider_transactions', ['period_of_report'], unique=False)
+    op.create_index('ix_insider_transactions_issuer_cik', 'insider_transactions', ['issuer_cik'], unique=False)
+    op.create_index('ix_insider_transactions_issuer_ticker', 'insider_transactions', ['issuer_ticker'], unique=False)
+
+    op.drop_index('ix_exchange_mapping_ticker_cover', table_name='exchange_mapping')
+    op.drop_index('ix_insider_transactions_filed_at_brin', table_name='insider_transactions')
+    op.drop_index('ix_insider_transactions_reporter_trgm', table_name='insider_transactions')
+    op.drop_index('ix_insider_transactions_reporter_cik_period', table_name='insider_transactions')
+    op.drop_index('ix_insider_transactions_cik_period', table_name='insider_transactions')
+    op.drop_index('ix_insider_transactions_period_cover', table_name='insider_transactions')
+    op.drop_index('ix_insider_transactions_ticker_period', table_name='insider_transactions')
@@ -0,0 +1,38 @@
+"""drop ix_exchange_mapping_ticker_cover
+
+It duplicated the unique index behind uq_exchange_mapping_issuer_ticker,
+which already serves the insider_rollup join on a table this small.
+
+Revision ID: d4f91b6e2a07
+Revises: b8e4f2c17d95
+Create Date: 2026-10-19 23:52:10.417206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f91b6e2a07'
+down_revision: Union[str, Sequence[str], None] = 'b8e4f2c17d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_exchange_mapping_ticker_cover', table_name='exchange_mapping', if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_exchange_mapping_ticker_cover',
+        'exchange_mapping',
+        ['issuer_ticker'],
+        postgresql_include=[
+            'name', 'exchange', 'is_delisted', 'category',
+            'sector', 'industry', 'sic_sector', 'sic_industry',
+        ],
+    )
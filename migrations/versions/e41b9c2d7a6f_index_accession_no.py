@@ -0,0 +1,34 @@
+"""index accession_no
+
+Backs the pre-transform skip of already-loaded filings
+(AccessionFilter: accession_no = ANY(:keys) per fetched batch).
+
+Revision ID: e41b9c2d7a6f
+Revises: c7e2f1a9d804
+Create Date: 2026-10-19 15:02:11.482930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b9c2d7a6f'
+down_revision: Union[str, Sequence[str], None] = 'c7e2f1a9d804'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_insider_transactions_accession_no',
+        'insider_transactions',
+        ['accession_no'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_insider_transactions_accession_no', table_name='insider_transactions')
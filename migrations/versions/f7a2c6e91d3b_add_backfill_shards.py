@@ -0,0 +1,53 @@
+"""add backfill_shards work queue
+
+Shards of a `backfill` run, claimed by workers with FOR UPDATE SKIP LOCKED.
+
+Revision ID: f7a2c6e91d3b
+Revises: e41b9c2d7a6f
+Create Date: 2026-10-19 18:05:37.102114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a2c6e91d3b'
+down_revision: Union[str, Sequence[str], None] = 'e41b9c2d7a6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'backfill_shards',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('job', sa.String(), nullable=False),
+        sa.Column('query', sa.String(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('worker', sa.String(), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('filings', sa.Integer(), nullable=True),
+        sa.Column('rows_loaded', sa.Integer(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job', 'start_date', name='uq_backfill_shards_job_start'),
+    )
+    op.create_index(
+        'ix_backfill_shards_job_status',
+        'backfill_shards',
+        ['job', 'status', 'start_date'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_backfill_shards_job_status', table_name='backfill_shards')
+    op.drop_table('backfill_shards')
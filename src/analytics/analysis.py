@@ -1,5 +1,10 @@
 import pandas as pd
 
+# Functions below only need period_of_report, issuer_ticker, acquired_disposed,
+# code and total_value unless noted, so they accept either raw
+# insider_transactions rows or the pre-aggregated insider_daily_flow table.
+# analytics.sql_analysis has SQL twins of each that aggregate in Postgres.
+
 def total_sec_acq_dis_day(df: pd.DataFrame) -> pd.DataFrame:
     """Total $ acquired and disposed per day."""
     acquired = (
@@ -19,6 +24,14 @@ def total_sec_acq_dis_day(df: pd.DataFrame) -> pd.DataFrame:
     out = pd.concat([acquired, disposed], axis=1).fillna(0)
     return out.sort_values("period_of_report")
 
+def acquired_disposed_by_year(daily: pd.DataFrame) -> pd.DataFrame:
+    """Yearly totals of a total_sec_acq_dis_day result (the amount_assets chart)."""
+    daily = daily.copy()
+    daily.index = daily.index.normalize()
+    acquired_yr = daily.groupby(pd.Grouper(freq='Y'))['acquired'].sum()
+    disposed_yr = daily.groupby(pd.Grouper(freq='Y'))['disposed'].sum()
+    return pd.merge(acquired_yr, disposed_yr, on='period_of_report', how='outer')
+
 def companies_bs_in_period(df: pd.DataFrame, start, end):
     """Top companies bought/sold in a given year."""
     mask = (
@@ -91,4 +104,42 @@ def sector_stats_by_year(df: pd.DataFrame):
                 .unstack()
     
     sector_trades = sector_trades[sector_trades["acquired_disposed"]=="A"]
-    return sector_trades.groupby([pd.Grouper(freq='Y'), "acquired_disposed", "sector"])['total_value'].sum()
\ No newline at end of file
+    return sector_trades.groupby([pd.Grouper(freq='Y'), "acquired_disposed", "sector"])['total_value'].sum()
+
+def _add(total, part):
+    if total is None:
+        return part
+    return total.add(part, fill_value=0)
+
+
+def fold_sums(chunks, func, *args, sort_values=True, **kwargs):
+    """
+    Apply a sum-based analysis function per chunk and add the results up.
+
+    Lets `func` run over repository iter_* streams without holding the
+    whole range in memory. Only valid for aggregations that are plain
+    sums (everything in this module); tuple results are folded elementwise.
+
+    Series come back sorted by value (desc) like the single-frame
+    functions, or by index when sort_values=False. DataFrames are
+    sorted by index.
+    """
+    total = None
+
+    for chunk in chunks:
+        part = func(chunk, *args, **kwargs)
+        if isinstance(part, tuple):
+            total = tuple(_add(t, p) for t, p in zip(total or (None,) * len(part), part))
+        else:
+            total = _add(total, part)
+
+    def _order(result):
+        if isinstance(result, pd.Series) and sort_values:
+            return result.sort_values(ascending=False)
+        return result.sort_index()
+
+    if total is None:
+        return None
+    if isinstance(total, tuple):
+        return tuple(_order(t) for t in total)
+    return _order(total)
@@ -0,0 +1,243 @@
+"""
+Batch report: every plot from one dataset load (`insider_cli plot report`).
+
+The plot.* commands each query the database for their own chart. The
+report reads insider_daily_flow once (the union of the columns those
+charts need) and derives the amount_assets, distribution_codes,
+top companies and sector charts from that one frame. Sectors come from
+joining the (cached) exchange mapping on issuer_ticker, which is what the
+insider_rollup view does. Only the by-reporter chart needs the reporter
+column, so it gets one extra insider_transactions read.
+
+Figures are rendered in a process pool (matplotlib is single-threaded and
+CPU bound) into one directory, next to an index.html that embeds them
+with the time spent per chart.
+"""
+import html
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from analytics.analysis import (
+    acquired_disposed_by_year,
+    companies_bs_in_period,
+    companies_bs_in_period_by_reporter,
+    distribution_by_codes,
+    sector_stats_by_year,
+    total_sec_acq_dis_day,
+)
+from utils.logger import Logger
+
+FLOW_COLUMNS = ["period_of_report", "issuer_ticker", "acquired_disposed", "code", "total_value"]
+REPORTER_COLUMNS = ["period_of_report", "reporter", "issuer_ticker", "acquired_disposed", "total_value"]
+
+# chart → analytics.plots function and the file name it saves under
+CHARTS = {
+    "amount_assets": ("plot_amount_assets_acquired_disposed", "amount_assets_{start}_{end}.png"),
+    "distribution_codes": ("plot_distribution_trans_codes", "distribution_codes_{start}_{end}.png"),
+    "n_most_companies": ("plot_n_most_companies_bs", "top_{n}_companies_{start}_{end}.png"),
+    "n_most_companies_by_reporter": ("plot_n_most_companies_bs_by_reporter", "top_{n}_by_reporter_{start}_{end}.png"),
+    "sector_stats": ("plot_sector_stats", "sector_stats_{start}_{end}.png"),
+}
+
+
+# ----------------------------------------------------------------------
+# Rendering (runs in pool workers)
+# ----------------------------------------------------------------------
+def _init_worker() -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render(plot_func: str, args: tuple, kwargs: dict) -> float:
+    """Draw and save one figure; returns the seconds it took."""
+    import matplotlib.pyplot as plt
+
+    from analytics import plots
+
+    t0 = time.perf_counter()
+    try:
+        getattr(plots, plot_func)(*args, save=True, show=False, **kwargs)
+    finally:
+        # workers are reused across charts
+        plt.close("all")
+    return time.perf_counter() - t0
+
+
+# ----------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------
+class PlotReport:
+    """
+    Load once, compute every chart's dataset, render them in parallel.
+
+    `repo` is anything with the InsiderRepository get_daily_flow /
+    get_transactions / get_mapping methods. `workers=0` renders in
+    this process.
+    """
+
+    def __init__(self, repo, start: str, end: str, n: int = 15, ticker: str | None = None, workers: int | None = None):
+        self.repo = repo
+        self.start = start
+        self.end = end
+        self.n = n
+        self.ticker = ticker
+        self.workers = min(len(CHARTS), os.cpu_count() or 1) if workers is None else workers
+        self.log = Logger(self.__class__.__name__)
+
+    # ---------------------------------------
+    # Load + compute
+    # ---------------------------------------
+    def load(self) -> dict[str, pd.DataFrame]:
+        flow = self.repo.get_daily_flow(self.start, self.end, columns=FLOW_COLUMNS)
+        mapping = self.repo.get_mapping()[["issuer_ticker", "sector"]]
+        by_reporter = self.repo.get_transactions(
+            self.start,
+            self.end,
+            columns=REPORTER_COLUMNS,
+            ticker=self.ticker,
+            side=["A", "D"],
+        )
+        return {"flow": flow, "mapping": mapping, "by_reporter": by_reporter}
+
+    def compute(self, data: dict[str, pd.DataFrame]) -> dict[str, tuple]:
+        """chart → (args, kwargs, seconds) for its plot function."""
+        flow, start, end, n = data["flow"], self.start, self.end, self.n
+        common = {"start": start, "end": end}
+        steps = {
+            "amount_assets": lambda: ((acquired_disposed_by_year(total_sec_acq_dis_day(flow)),), common),
+            "distribution_codes": lambda: ((distribution_by_codes(flow),), common),
+            "n_most_companies": lambda: (
+                companies_bs_in_period(flow, start, end), {**common, "n": n},
+            ),
+            "n_most_companies_by_reporter": lambda: (
+                companies_bs_in_period_by_reporter(data["by_reporter"], start, end, self.ticker),
+                {**common, "n": n},
+            ),
+            "sector_stats": lambda: (
+                (sector_stats_by_year(flow.merge(data["mapping"], on="issuer_ticker", how="left")),),
+                common,
+            ),
+        }
+
+        datasets = {}
+        for chart, step in steps.items():
+            t0 = time.perf_counter()
+            args, kwargs = step()
+            datasets[chart] = (args, kwargs, time.perf_counter() - t0)
+        return datasets
+
+    # ---------------------------------------
+    # Render
+    # ---------------------------------------
+    def render(self, datasets: dict[str, tuple], outdir: Path) -> list[dict]:
+        """Save every chart under outdir; one timing row per chart."""
+        rows, futures = [], {}
+        pool = ProcessPoolExecutor(self.workers, initializer=_init_worker) if self.workers else None
+        try:
+            for chart, (args, kwargs, compute_s) in datasets.items():
+                plot_func, file_name = CHARTS[chart]
+                job = (plot_func, args, {**kwargs, "outpath": str(outdir)})
+                futures[chart] = pool.submit(_render, *job) if pool else job
+                rows.append({
+                    "chart": chart,
+                    "file": file_name.format(start=self.start, end=self.end, n=self.n),
+                    "compute_s": compute_s,
+                })
+
+            for row in rows:
+                job = futures[row["chart"]]
+                try:
+                    row["render_s"] = job.result() if pool else _render(*job)
+                except Exception as e:
+                    row["render_s"] = None
+                    row["error"] = f"{type(e).__name__}: {e}"
+                    self.log.error(f"[REPORT] {row['chart']} failed: {row['error']}")
+                    self.log.debug(traceback.format_exc())
+        finally:
+            if pool:
+                pool.shutdown()
+        return rows
+
+    def run(self, outdir: str | Path) -> dict:
+        """Build the report in outdir; returns the timings written to index.html."""
+        outdir = Path(outdir)
+        outdir.mkdir(parents=True, exist_ok=True)
+        if not self.workers:
+            _init_worker()
+
+        t0 = time.perf_counter()
+        data = self.load()
+        load_s = time.perf_counter() - t0
+        self.log.info(
+            f"[REPORT] Loaded {len(data['flow'])} daily flow + {len(data['by_reporter'])} reporter rows in {load_s:.2f}s"
+        )
+
+        charts = self.render(self.compute(data), outdir)
+        report = {
+            "start": self.start,
+            "end": self.end,
+            "load_s": load_s,
+            "total_s": time.perf_counter() - t0,
+            "workers": self.workers,
+            "charts": charts,
+        }
+        (outdir / "index.html").write_text(to_html(report), encoding="utf-8")
+        self.log.info(f"[REPORT] {len(charts)} charts → {outdir / 'index.html'} in {report['total_s']:.2f}s")
+        return report
+
+
+# ----------------------------------------------------------------------
+# Output
+# ----------------------------------------------------------------------
+def _seconds(value) -> str:
+    return "—" if value is None else f"{value:.3f}"
+
+
+def timing_table(report: dict) -> str:
+    """Plain-text per-chart timings, for the terminal."""
+    lines = [f"{'chart':<30} {'compute_s':>10} {'render_s':>10}"]
+    for row in report["charts"]:
+        lines.append(
+            f"{row['chart']:<30} {_seconds(row['compute_s']):>10} {_seconds(row['render_s']):>10}"
+            + (f"  {row['error']}" if "error" in row else "")
+        )
+    lines.append(f"{'load (shared)':<30} {_seconds(report['load_s']):>10}")
+    lines.append(f"{'total':<30} {_seconds(report['total_s']):>10}")
+    return "\n".join(lines)
+
+
+def to_html(report: dict) -> str:
+    esc = html.escape
+    rows = "\n".join(
+        f"<tr><td>{esc(row['chart'])}</td><td>{_seconds(row['compute_s'])}</td>"
+        f"<td>{_seconds(row['render_s'])}</td><td>{esc(row.get('error', ''))}</td></tr>"
+        for row in report["charts"]
+    )
+    figures = "\n".join(
+        f"<figure><img src=\"{esc(row['file'])}\" alt=\"{esc(row['chart'])}\">"
+        f"<figcaption>{esc(row['chart'])}</figcaption></figure>"
+        for row in report["charts"] if "error" not in row
+    )
+    title = f"Insider trading report {esc(report['start'])} → {esc(report['end'])}"
+    return f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title>
+<style>body {{ font-family: sans-serif; }} img {{ max-width: 100%; }} td, th {{ padding: 2px 12px; text-align: right; }}</style>
+</head>
+<body>
+<h1>{title}</h1>
+<table>
+<tr><th>chart</th><th>compute_s</th><th>render_s</th><th></th></tr>
+{rows}
+<tr><td>load (shared)</td><td>{_seconds(report['load_s'])}</td><td></td><td></td></tr>
+<tr><td>total ({report['workers']} workers)</td><td>{_seconds(report['total_s'])}</td><td></td><td></td></tr>
+</table>
+{figures}
+</body>
+</html>
+"""
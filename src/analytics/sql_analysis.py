@@ -0,0 +1,184 @@
+import pandas as pd
+
+from db.repository import InsiderRepository, build_filters
+
+# SQL twins of analytics.analysis: same names, same return shapes, but the
+# GROUP BY runs in Postgres and only aggregates cross the wire.
+#
+# Each takes an InsiderRepository plus the range / filters the pandas
+# version gets pre-applied through its DataFrame, and `source` to pick the
+# table (insider_daily_flow wherever the grain allows it). The SQL sticks to
+# what Postgres and DuckDB share, so either repository backend works.
+
+
+def _utc(value):
+    # same bound the pandas functions build for their period mask
+    if value is None:
+        return None
+    return pd.to_datetime(value).tz_localize("UTC").to_pydatetime()
+
+
+def _where(repo, source: str, start, end, *extra: str, **filters) -> tuple[str, dict]:
+    if source not in repo.SOURCE_COLUMNS:
+        raise ValueError(f"[sql_analysis] Unknown source '{source}'")
+
+    available = repo.SOURCE_COLUMNS[source]
+    clauses, params = build_filters(source, available, _utc(start), _utc(end), **filters)
+    clauses += extra
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _split_sides(df: pd.DataFrame, keys: list[str]):
+    """(acquired, disposed) Series indexed by `keys`, largest first."""
+    return tuple(
+        df[df["acquired_disposed"] == side]
+        .set_index(keys)["total_value"]
+        .sort_values(ascending=False)
+        for side in ("A", "D")
+    )
+
+
+def total_sec_acq_dis_day(
+    repo: InsiderRepository,
+    start=None,
+    end=None,
+    source: str = "insider_daily_flow",
+    **filters,
+) -> pd.DataFrame:
+    """Total $ acquired and disposed per day."""
+    where, params = _where(
+        repo, source, start, end, "period_of_report IS NOT NULL", side=["A", "D"], **filters
+    )
+    sql = f"""
+        SELECT
+            period_of_report,
+            COALESCE(SUM(total_value) FILTER (WHERE acquired_disposed = 'A'), 0)::float8 AS acquired,
+            COALESCE(SUM(total_value) FILTER (WHERE acquired_disposed = 'D'), 0)::float8 AS disposed
+        FROM {source}{where}
+        GROUP BY period_of_report
+        ORDER BY period_of_report
+    """
+    df = repo.query(sql, params)
+    df["period_of_report"] = pd.to_datetime(df["period_of_report"], utc=True)
+    return df.set_index("period_of_report")
+
+
+def companies_bs_in_period(
+    repo: InsiderRepository,
+    start,
+    end,
+    source: str = "insider_daily_flow",
+    **filters,
+):
+    """Top companies bought/sold in a given period."""
+    where, params = _where(
+        repo, source, start, end, "issuer_ticker IS NOT NULL", side=["A", "D"], **filters
+    )
+    sql = f"""
+        SELECT
+            issuer_ticker,
+            acquired_disposed,
+            COALESCE(SUM(total_value), 0)::float8 AS total_value
+        FROM {source}{where}
+        GROUP BY issuer_ticker, acquired_disposed
+    """
+    return _split_sides(repo.query(sql, params), ["issuer_ticker"])
+
+
+def companies_bs_in_period_by_reporter(
+    repo: InsiderRepository,
+    start,
+    end,
+    ticker=None,
+    source: str = "insider_transactions",
+    **filters,
+):
+    where, params = _where(
+        repo,
+        source,
+        start,
+        end,
+        "reporter IS NOT NULL",
+        "issuer_ticker IS NOT NULL",
+        ticker=ticker,
+        side=["A", "D"],
+        **filters,
+    )
+    sql = f"""
+        SELECT
+            reporter,
+            issuer_ticker,
+            acquired_disposed,
+            COALESCE(SUM(total_value), 0)::float8 AS total_value
+        FROM {source}{where}
+        GROUP BY reporter, issuer_ticker, acquired_disposed
+    """
+    return _split_sides(repo.query(sql, params), ["reporter", "issuer_ticker"])
+
+
+def distribution_by_codes(
+    repo: InsiderRepository,
+    start=None,
+    end=None,
+    source: str = "insider_daily_flow",
+    **filters,
+) -> pd.Series:
+    """Distribution of transaction codes by acquired/disposed."""
+    where, params = _where(
+        repo,
+        source,
+        start,
+        end,
+        "acquired_disposed IS NOT NULL",
+        "code IS NOT NULL",
+        **filters,
+    )
+    sql = f"""
+        SELECT
+            acquired_disposed,
+            code,
+            COALESCE(SUM(total_value), 0)::float8 AS total_value
+        FROM {source}{where}
+        GROUP BY acquired_disposed, code
+    """
+    df = repo.query(sql, params)
+    return df.set_index(["acquired_disposed", "code"])["total_value"].sort_values(ascending=False)
+
+
+def sector_stats_by_year(
+    repo: InsiderRepository,
+    start=None,
+    end=None,
+    **filters,
+) -> pd.Series:
+    """Yearly $ acquired per sector, indexed like the pandas Grouper(freq='Y') result."""
+    where, params = _where(
+        repo,
+        "insider_rollup",
+        start,
+        end,
+        "period_of_report IS NOT NULL",
+        "sector IS NOT NULL",
+        "sector <> ''",
+        side="A",
+        **filters,
+    )
+    sql = f"""
+        SELECT
+            EXTRACT(YEAR FROM period_of_report AT TIME ZONE 'UTC')::int AS year,
+            acquired_disposed,
+            sector,
+            COALESCE(SUM(total_value), 0)::float8 AS total_value
+        FROM insider_rollup{where}
+        GROUP BY 1, 2, 3
+    """
+    df = repo.query(sql, params)
+
+    # year-end labels, as pd.Grouper(freq='Y') produces
+    df["period_of_report"] = pd.to_datetime(
+        df.pop("year").astype(str) + "-12-31"
+    ).dt.tz_localize("UTC")
+    return (
+        df.set_index(["period_of_report", "acquired_disposed", "sector"])["total_value"]
+        .sort_index()
+    )
@@ -0,0 +1,90 @@
+"""
+Stored benchmark baselines shared by the bench.* suites.
+
+A baseline is a JSON file holding the run parameters (row counts, seed…),
+the machine it was recorded on and one number per case. check() compares
+a fresh run with it and reports cases that got worse by more than a
+tolerance; the suites exit 1 on any, so they can gate CI.
+"""
+import json
+import platform
+from datetime import datetime, UTC
+from pathlib import Path
+
+import pandas as pd
+
+
+def machine() -> dict:
+    return {"python": platform.python_version(), "pandas": pd.__version__, "platform": platform.platform()}
+
+
+def load_baseline(path: Path) -> dict | None:
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def save_baseline(path: Path, results: dict, metric: str, params: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "recorded_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "params": params,
+        "machine": machine(),
+        "cases": {name: {metric: round(r[metric], 6)} for name, r in results.items()},
+    }, indent=2) + "\n")
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    metric: str,
+    tolerance: float,
+    higher_is_better: bool = True,
+) -> pd.DataFrame:
+    """
+    Per case: baseline vs current `metric` and the relative change.
+    `regression` is True where the metric got worse by more than
+    `tolerance`. Cases missing from either side are left out.
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline["cases"].get(name)
+        if base is None or metric not in base:
+            continue
+        change = current[metric] / base[metric] - 1
+        worse = -change if higher_is_better else change
+        rows.append({
+            "case": name,
+            "baseline": base[metric],
+            "current": current[metric],
+            "change": change,
+            "regression": worse > tolerance,
+        })
+    return pd.DataFrame(rows, columns=["case", "baseline", "current", "change", "regression"])
+
+
+def check(
+    results: dict,
+    path: Path,
+    metric: str,
+    params: dict,
+    tolerance: float,
+    higher_is_better: bool = True,
+) -> list[str]:
+    """Print the comparison with the baseline at `path`; return regressed cases."""
+    baseline = load_baseline(path)
+    if baseline is None:
+        print(f"\nno baseline at {path}; record one with --update-baseline")
+        return []
+    if baseline.get("params") != params:
+        print(f"\nbaseline was recorded with {baseline.get('params')}; not comparing")
+        return []
+    if baseline.get("machine") != machine():
+        print(f"\nwarning: baseline recorded on {baseline.get('machine')}")
+
+    report = compare(results, baseline, metric, tolerance, higher_is_better)
+    print(f"\n{metric} vs baseline ({baseline['recorded_at']}, tolerance {tolerance:.0%}):")
+    print(report.to_string(index=False, formatters={"change": "{:+.1%}".format}))
+
+    regressed = list(report.loc[report["regression"], "case"])
+    if regressed:
+        print(f"\nREGRESSION: {', '.join(regressed)}")
+    return regressed
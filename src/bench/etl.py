@@ -0,0 +1,202 @@
+"""
+Benchmark: ETL hot paths on seeded synthetic filings, checked against a
+stored baseline.
+
+Each case is timed best-of-N on the same generated input (bench.synthetic)
+and reported as rows/s. With a baseline for the same --filings / --seed,
+any case whose throughput falls more than --tolerance below it is a
+regression and the command exits 1, so it can gate CI.
+
+    python -m bench.etl                       # run + compare
+    python -m bench.etl --update-baseline     # re-record on this machine
+    python -m bench.etl --database-url postgresql+psycopg2://...  # + loader
+
+Baselines are machine specific: record them on the machine that checks them,
+and widen --tolerance on shared runners where CPU time is noisy.
+The loader case writes into a throwaway schema and drops it afterwards.
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from bench.baseline import check, save_baseline
+from bench.synthetic import generate_filings
+from insider_trading.load.insider_loader import InsiderTransactionsLoader
+from insider_trading.transform.insider_transformer import InsiderTransactionsTransformer
+from insider_trading.transform.normalize_transactions import normalize_transactions
+from writers.final_writer import FinalWriter
+from writers.raw_archive import RawArchive
+
+BASELINE = Path(__file__).parent / "baselines" / "etl.json"
+TOLERANCE = 0.25
+MIN_TIME = 1.0
+MAX_REPEAT = 50
+
+
+# ----------------------------------------------------------------------
+# Cases
+# ----------------------------------------------------------------------
+def build_cases(filings: list[dict], workdir: Path, etl_db=None) -> list[tuple]:
+    """
+    (name, rows, setup, fn): setup() runs untimed before every repeat and
+    returns fn's arguments, so in-place steps always see fresh input.
+    """
+    transformer = InsiderTransactionsTransformer()
+    normalized = transformer.normalize(filings)
+    cleaned = transformer.clean(normalized.copy())
+    final = transformer.validate(cleaned.copy())
+
+    def fresh_dir(name):
+        def setup():
+            path = workdir / f"{name}-{uuid.uuid4().hex[:8]}"
+            path.mkdir(parents=True)
+            return (path,)
+        return setup
+
+    archive_dir = workdir / "archive-scan"
+    RawArchive(archive_dir).add(filings)
+
+    def final_save(path):
+        writer = FinalWriter(
+            path,
+            expected_schema=InsiderTransactionsTransformer.SCHEMA,
+            partition_by="period_of_report",
+        )
+        writer.save("insider_transactions", final)
+
+    def archive_add(path):
+        archive = RawArchive(path)
+        archive.add(filings)
+        archive.close()
+
+    def archive_scan():
+        archive = RawArchive(archive_dir)
+        for _ in archive.iter_range():
+            pass
+        archive.close()
+
+    cases = [
+        ("normalize", len(normalized), lambda: (filings,), normalize_transactions),
+        ("clean", len(normalized), lambda: (normalized.copy(),), transformer.clean),
+        ("validate", len(cleaned), lambda: (cleaned.copy(),), transformer.validate),
+        ("transform", len(normalized), lambda: (filings,), transformer.transform),
+        ("daily_flow", len(final), lambda: (final,), InsiderTransactionsLoader.daily_flow),
+        ("final_write", len(final), fresh_dir("final"), final_save),
+        ("raw_archive_add", len(filings), fresh_dir("archive"), archive_add),
+        ("raw_archive_scan", len(filings), lambda: (), archive_scan),
+    ]
+
+    if etl_db is not None:
+        loader = InsiderTransactionsLoader(etl_db)
+
+        def empty_tables():
+            with etl_db.engine.begin() as conn:
+                conn.exec_driver_sql("TRUNCATE insider_transactions, insider_daily_flow")
+            return (final,)
+
+        cases.append(("load", len(final), empty_tables, loader.load))
+    return cases
+
+
+def measure(setup, fn, repeat: int, min_time: float = MIN_TIME) -> float:
+    """
+    Best wall time over at least `repeat` calls; fast cases keep repeating
+    until `min_time` of timed work, so their best is not one noisy sample.
+    """
+    best, total, calls = float("inf"), 0.0, 0
+    while calls < repeat or (total < min_time and calls < MAX_REPEAT):
+        args = setup()
+        start = time.perf_counter()
+        fn(*args)
+        elapsed = time.perf_counter() - start
+        best, total, calls = min(best, elapsed), total + elapsed, calls + 1
+    return best
+
+
+@contextmanager
+def scratch_database(url: str):
+    """ETLDatabase bound to a fresh schema (init_db'd), dropped on exit."""
+    from sqlalchemy import create_engine, text
+
+    from db.db import init_db
+    from db.etl_db import ETLDatabase
+
+    schema = f"bench_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(url, future=True)
+    with admin.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+
+    engine = create_engine(url, future=True, connect_args={"options": f"-csearch_path={schema},public"})
+    try:
+        init_db(bind=engine)
+        etl_db = ETLDatabase()
+        etl_db.engine = engine
+        yield etl_db
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin.dispose()
+
+
+def run(
+    filings: int,
+    seed: int = 0,
+    repeat: int = 3,
+    database_url: str | None = None,
+    min_time: float = MIN_TIME,
+) -> dict:
+    data = generate_filings(filings, seed=seed)
+    workdir = Path(tempfile.mkdtemp(prefix="bench-etl-"))
+
+    try:
+        with (scratch_database(database_url) if database_url else _no_database()) as etl_db:
+            results = {}
+            for name, rows, setup, fn in build_cases(data, workdir, etl_db):
+                seconds = measure(setup, fn, repeat, min_time)
+                results[name] = {"rows": rows, "seconds": seconds, "rows_per_s": rows / seconds}
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+@contextmanager
+def _no_database():
+    yield None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ETL hot paths against a stored baseline.")
+    parser.add_argument("--filings", type=int, default=20_000, help="Synthetic filings to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repeats per case (best is kept)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed throughput drop (0.25 = 25%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Record this run as the baseline")
+    parser.add_argument("--database-url", help="Scratch Postgres for the loader case (schema is dropped after)")
+    args = parser.parse_args()
+
+    results = run(args.filings, args.seed, args.repeat, args.database_url)
+    table = pd.DataFrame.from_dict(results, orient="index")
+    print(f"filings={args.filings:,} seed={args.seed} repeat={args.repeat}")
+    print(table.to_string(float_format=lambda v: f"{v:,.3f}"))
+
+    params = {"filings": args.filings, "seed": args.seed}
+    if args.update_baseline:
+        save_baseline(args.baseline, results, "rows_per_s", params)
+        print(f"\nbaseline written → {args.baseline}")
+        return
+
+    if check(results, args.baseline, "rows_per_s", params, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
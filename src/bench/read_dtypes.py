@@ -0,0 +1,110 @@
+"""
+Benchmark: repository read dtypes, before vs after.
+
+"before" mimics what pd.read_sql returned for `SELECT *`: object columns
+of Python str and decimal.Decimal. "after" is the same data as the
+repository now returns it (float8 cast + apply_read_dtypes).
+
+Runs sector_stats_by_year and companies_bs_in_period on both and prints
+runtime, frame size and tracemalloc peak.
+
+    python -m bench.read_dtypes --rows 500000
+"""
+import argparse
+import time
+import tracemalloc
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from analytics.analysis import companies_bs_in_period, sector_stats_by_year
+from db.repository import apply_read_dtypes
+
+SECTORS = [
+    "Technology", "Healthcare", "Financial Services", "Energy", "Industrials",
+    "Consumer Cyclical", "Consumer Defensive", "Utilities", "Real Estate",
+    "Basic Materials", "Communication Services", "",
+]
+CODES = ["P", "S", "A", "F", "G", "D", "J"]
+
+
+def make_frame(rows: int, seed: int = 7) -> pd.DataFrame:
+    """Object-dtype frame shaped like an insider_rollup read."""
+    rng = np.random.default_rng(seed)
+
+    days = pd.date_range("2016-01-01", "2025-10-01", freq="D", tz="UTC")
+    tickers = np.array([f"T{i:04d}" for i in range(5000)], dtype=object)
+    reporters = np.array([f"Reporter {i}" for i in range(20000)], dtype=object)
+
+    values = np.round(rng.lognormal(mean=11, sigma=2, size=rows), 2)
+    sector = np.array(SECTORS, dtype=object)[rng.integers(0, len(SECTORS), rows)]
+    sector[rng.random(rows) < 0.05] = None
+
+    return pd.DataFrame({
+        "period_of_report": days[rng.integers(0, len(days), rows)],
+        "issuer_ticker": tickers[rng.integers(0, len(tickers), rows)],
+        "reporter": reporters[rng.integers(0, len(reporters), rows)],
+        "acquired_disposed": np.array(["A", "D"], dtype=object)[rng.integers(0, 2, rows)],
+        "code": np.array(CODES, dtype=object)[rng.integers(0, len(CODES), rows)],
+        "sector": sector,
+        "total_value": [Decimal(str(v)) for v in values],
+    })
+
+
+def _measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def run(rows: int) -> list[dict]:
+    before = make_frame(rows)
+
+    after = before.copy()
+    after["total_value"] = after["total_value"].astype("float64")
+    after = apply_read_dtypes(after)
+
+    cases = [
+        ("sector_stats_by_year", sector_stats_by_year, ()),
+        ("companies_bs_in_period", companies_bs_in_period, ("2016-01-01", "2025-10-01")),
+    ]
+
+    results = []
+    for label, df in (("before", before), ("after", after)):
+        frame_mb = df.memory_usage(deep=True).sum() / 1e6
+        for name, func, extra in cases:
+            elapsed, peak = _measure(func, df, *extra)
+            results.append({
+                "variant": label,
+                "function": name,
+                "seconds": elapsed,
+                "peak_mb": peak / 1e6,
+                "frame_mb": frame_mb,
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare analytics on object vs compact read dtypes.")
+    parser.add_argument("--rows", type=int, default=500_000, help="Synthetic row count")
+    args = parser.parse_args()
+
+    results = pd.DataFrame(run(args.rows))
+    print(f"rows={args.rows:,}")
+    print(results.to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+
+    pivot = results.pivot(index="function", columns="variant", values="seconds")
+    print("\nspeedup (before / after):")
+    print((pivot["before"] / pivot["after"]).to_string(float_format=lambda v: f"{v:,.1f}x"))
+
+
+if __name__ == "__main__":
+    main()
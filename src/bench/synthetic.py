@@ -0,0 +1,240 @@
+"""
+Seeded synthetic SEC insider-trading payloads (the `transactions` objects
+the insider-trading API returns), for benchmarks and scale tests.
+
+Generated filings look like the real feed:
+  - Form 4 and 4/A, filed 0-3 days after the period of report
+  - 1-N non-derivative rows per filing (long tail), optional derivative table
+  - footnotes, some announcing 10b5-1 plans
+  - awkward values: missing / zero / sub-cent / very large prices,
+    fractional shares, numbers sent as strings, "NONE" tickers,
+    amendments re-using an earlier filing's rows
+
+    from bench.synthetic import generate_filings
+    filings = generate_filings(10_000, seed=1)
+"""
+import random
+from datetime import datetime, timedelta, UTC
+
+CODES = ["P", "S", "A", "F", "G", "M", "D", "J", "C"]
+CODE_WEIGHTS = [0.08, 0.42, 0.16, 0.12, 0.05, 0.1, 0.03, 0.02, 0.02]
+TITLES = ["CEO", "CFO", "COO", "General Counsel", "SVP, Operations", "Chief Accounting Officer", None]
+FOOTNOTES = [
+    "The transaction was effected pursuant to a Rule 10b5-1 trading plan adopted on {d}.",
+    "The price reported is a weighted average price. These shares were sold in multiple "
+    "transactions at prices ranging from ${lo} to ${hi}, inclusive.",
+    "Represents shares withheld to satisfy tax withholding obligations upon vesting.",
+    "Shares held by a family trust of which the reporting person is trustee.",
+    "The option vests in four equal annual installments beginning on {d}.",
+]
+
+
+class SyntheticFilings:
+    """
+    Deterministic generator: the same (seed, parameters) always yields the
+    same filings, so benchmark inputs are identical across runs and machines.
+    Uses random.Random, which is several times faster than numpy for the
+    scalar draws made here.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        issuers: int = 2_000,
+        reporters: int = 10_000,
+        start: str = "2020-01-01",
+        days: int = 5 * 365,
+        derivative_share: float = 0.2,
+        amendment_share: float = 0.03,
+    ):
+        self.rng = random.Random(seed)
+        self.start = datetime.fromisoformat(start).replace(tzinfo=UTC)
+        self.days = days
+        self.derivative_share = derivative_share
+        self.amendment_share = amendment_share
+
+        rng = self.rng
+        self.issuers = [
+            {
+                "cik": str(1_000_000 + i),
+                "name": f"Synthetic Corp {i}",
+                "tradingSymbol": "NONE" if rng.random() < 0.005 else f"S{i:04d}",
+            }
+            for i in range(issuers)
+        ]
+        self.issuer_price = [round(rng.lognormvariate(3.2, 1.2), 2) for _ in range(issuers)]
+        self.reporters = [
+            {"cik": str(2_000_000 + i), "name": f"Reporter {i}"} for i in range(reporters)
+        ]
+        self._seq = 0
+        self._emitted: list[dict] = []
+
+    # ----------------------------------------------------------------------
+    # Values
+    # ----------------------------------------------------------------------
+    def _price(self, issuer: int):
+        rng = self.rng
+        roll = rng.random()
+        if roll < 0.03:
+            return None
+        if roll < 0.06:
+            return 0
+        if roll < 0.07:
+            return rng.choice([0.0001, 0.0035, 0.012])
+        if roll < 0.075:
+            return rng.choice([7_500.0, 125_000.0])
+        price = round(self.issuer_price[issuer] * rng.uniform(0.9, 1.1), 4)
+        # a few filers send numbers as strings
+        return str(price) if roll < 0.09 else price
+
+    def _shares(self):
+        rng = self.rng
+        shares = float(round(rng.lognormvariate(7.5, 1.8)))
+        if rng.random() < 0.05:
+            shares += round(rng.random(), 4)  # fractional DRIP shares
+        return max(shares, 1.0)
+
+    def _relationship(self) -> dict:
+        rng = self.rng
+        officer = rng.random() < 0.55
+        return {
+            "isDirector": rng.random() < 0.4,
+            "isOfficer": officer,
+            "officerTitle": rng.choice(TITLES) if officer else None,
+            "isTenPercentOwner": rng.random() < 0.05,
+            "isOther": False,
+        }
+
+    def _footnotes(self, period: datetime) -> list[dict]:
+        rng = self.rng
+        notes = []
+        for i in range(rng.choices((0, 1, 2, 3), (0.3, 0.36, 0.22, 0.12))[0]):
+            text = rng.choice(FOOTNOTES)
+            notes.append({
+                "id": f"F{i + 1}",
+                "text": text.format(
+                    d=(period - timedelta(days=rng.randrange(30, 400))).strftime("%B %d, %Y"),
+                    lo=round(rng.uniform(5, 50), 2),
+                    hi=round(rng.uniform(50, 90), 2),
+                ),
+            })
+        return notes
+
+    # ----------------------------------------------------------------------
+    # Tables
+    # ----------------------------------------------------------------------
+    def _non_derivative_rows(self, issuer: int, period: datetime, notes: list[dict]) -> list[dict]:
+        rng = self.rng
+        rows = []
+        owned = float(round(rng.lognormvariate(10, 1.5)))
+        # long tail: most filings have 1-3 rows, a few dozens (split executions)
+        n = 1
+        while n < 60 and rng.random() > 0.45:
+            n += 1
+        for _ in range(n):
+            code = rng.choices(CODES, CODE_WEIGHTS)[0]
+            acquired = "A" if code in ("P", "A", "M", "J", "C") else "D"
+            shares = self._shares()
+            owned = max(owned + (shares if acquired == "A" else -shares), 0.0)
+            tx_date = period - timedelta(days=rng.randrange(0, 3))
+            rows.append({
+                "securityTitle": "Common Stock",
+                "transactionDate": tx_date.strftime("%Y-%m-%d") if rng.random() > 0.02 else None,
+                "coding": {
+                    "formType": "4",
+                    "code": code,
+                    "equitySwapInvolved": False,
+                    **({"footnoteId": [notes[0]["id"]]} if notes else {}),
+                },
+                "amounts": {
+                    "shares": str(shares) if rng.random() < 0.01 else shares,
+                    "pricePerShare": self._price(issuer),
+                    "acquiredDisposedCode": acquired,
+                },
+                "postTransactionAmounts": {"sharesOwnedFollowingTransaction": owned},
+                "ownershipNature": {"directOrIndirectOwnership": "D" if rng.random() < 0.85 else "I"},
+            })
+        return rows
+
+    def _derivative_rows(self, issuer: int, period: datetime) -> list[dict]:
+        rng = self.rng
+        rows = []
+        for _ in range(rng.randrange(1, 4)):
+            shares = self._shares()
+            exercise = round(self.issuer_price[issuer] * rng.uniform(0.3, 1.0), 2)
+            rows.append({
+                "securityTitle": "Stock Option (Right to Buy)",
+                "conversionOrExercisePrice": exercise,
+                "transactionDate": period.strftime("%Y-%m-%d"),
+                "coding": {"formType": "4", "code": rng.choice(["M", "A", "G"]), "equitySwapInvolved": False},
+                "amounts": {
+                    "shares": shares,
+                    "pricePerShare": 0 if rng.random() < 0.6 else exercise,
+                    "acquiredDisposedCode": "D" if rng.random() < 0.7 else "A",
+                },
+                "exerciseDate": (period - timedelta(days=365)).strftime("%Y-%m-%d"),
+                "expirationDate": (period + timedelta(days=3650)).strftime("%Y-%m-%d"),
+                "underlyingSecurity": {"title": "Common Stock", "shares": shares},
+                "postTransactionAmounts": {"sharesOwnedFollowingTransaction": float(rng.randrange(0, 200_000))},
+                "ownershipNature": {"directOrIndirectOwnership": "D"},
+            })
+        return rows
+
+    # ----------------------------------------------------------------------
+    # Filings
+    # ----------------------------------------------------------------------
+    def _accession(self, reporter: int, filed: datetime) -> str:
+        self._seq += 1
+        return f"{reporter % 10**10:010d}-{filed.year % 100:02d}-{self._seq:06d}"
+
+    def filing(self) -> dict:
+        rng = self.rng
+
+        if self._emitted and rng.random() < self.amendment_share:
+            # 4/A: same rows as an earlier filing, filed later, new accession
+            original = self._emitted[rng.randrange(0, len(self._emitted))]
+            filed = datetime.fromisoformat(original["filedAt"]) + timedelta(days=rng.randrange(1, 30))
+            amended = {**original, "documentType": "4/A", "filedAt": filed.isoformat()}
+            amended["accessionNo"] = self._accession(int(original["reportingOwner"]["cik"]), filed)
+            return amended
+
+        issuer = rng.randrange(0, len(self.issuers))
+        reporter = rng.randrange(0, len(self.reporters))
+        period = self.start + timedelta(days=rng.randrange(0, self.days))
+        # local Eastern time with its offset, as the API reports filedAt
+        filed = period.replace(tzinfo=None) + timedelta(
+            days=rng.randrange(0, 4),
+            hours=rng.randrange(6, 22),
+            minutes=rng.randrange(0, 60),
+        )
+        filed_at = filed.isoformat() + "-05:00"
+
+        notes = self._footnotes(period)
+        filing = {
+            "accessionNo": self._accession(reporter, filed),
+            "filedAt": filed_at,
+            "periodOfReport": period.strftime("%Y-%m-%d"),
+            "documentType": "4",
+            "issuer": dict(self.issuers[issuer]),
+            "reportingOwner": {
+                **self.reporters[reporter],
+                "address": {"street1": "1 Main St", "city": "Springfield", "state": "CA", "zipCode": "90001"},
+                "relationship": self._relationship(),
+            },
+            "nonDerivativeTable": {"transactions": self._non_derivative_rows(issuer, period, notes)},
+            "footnotes": notes,
+        }
+        if rng.random() < self.derivative_share:
+            filing["derivativeTable"] = {"transactions": self._derivative_rows(issuer, period)}
+
+        if len(self._emitted) < 1_000:
+            self._emitted.append(filing)
+        return filing
+
+    def filings(self, n: int) -> list[dict]:
+        return [self.filing() for _ in range(n)]
+
+
+def generate_filings(n: int, seed: int = 0, **kwargs) -> list[dict]:
+    """`n` synthetic filings; same seed and kwargs → same output."""
+    return SyntheticFilings(seed=seed, **kwargs).filings(n)
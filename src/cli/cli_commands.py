@@ -2,18 +2,11 @@
 # Every command is defined once here.
 # No Click decorators, no parser logic.
 
-from cli.cli_handlers import (
-    handle_fetch_insider_tx,
-    handle_fetch_exchange_mapping,
-    handle_build_dataset,
-    handle_plot_amount_assets,
-    handle_plot_distribution_codes,
-    handle_plot_n_companies,
-    handle_plot_n_companies_reporter,
-    handle_plot_line_chart,
-    handle_plot_sector_stats,
-    handle_answer_question_with_sql,
-)
+import click
+
+# Handlers are named, not imported: cli_factory resolves them from
+# cli.cli_handlers on first use, so building the CLI (and --help) stays
+# free of pandas / matplotlib / SQLAlchemy imports.
 
 # Common options for plot commands
 COMMON_PLOT_OPTIONS = [
@@ -25,10 +18,25 @@ COMMON_PLOT_OPTIONS = [
     ("--show", {"is_flag": True, "help": "Show plot"}),
 ]
 
+# Unix socket the daemon listens on (default: CLI_SOCKET setting)
+SOCKET_OPTION = [
+    ("--socket", "socket_path", {"default": None, "help": "Socket path (default: $CLI_SOCKET or data/cli.sock)"}),
+]
+
+# Where the aggregation runs: Postgres GROUP BY (sql) or pandas over fetched rows
+BACKEND_OPTION = [
+    ("--backend", {
+        "type": click.Choice(["sql", "pandas"]),
+        "default": "sql",
+        "show_default": True,
+        "help": "Aggregate in the database or in pandas",
+    }),
+]
+
 COMMANDS = {
     # --------------- ETL COMMANDS ----------------
     "fetch_insider_tx": {
-        "handler": handle_fetch_insider_tx,
+        "handler": "handle_fetch_insider_tx",
         "help": "Force fetch insider trading transactions",
         "options": [
             ("--ticker", {"default": "*", "help": "Ticker or * for all"}),
@@ -38,51 +46,106 @@ COMMANDS = {
     },
 
     "fetch_exchange_mapping": {
-        "handler": handle_fetch_exchange_mapping,
+        "handler": "handle_fetch_exchange_mapping",
         "help": "Force fetch exchange mapping",
         "options": [],
     },
 
     "build-dataset": {
-        "handler": handle_build_dataset,
-        "help": "Run pipeline on an existing raw file",
+        "handler": "handle_build_dataset",
+        "help": "Run pipeline on an existing raw file or a date range of the raw archive",
         "options": [
             # NOTE: flag uses dash so Click maps it to raw_path
-            ("--raw-path", {"required": True, "help": "Path to raw insider tx JSON/NDJSON"}),
+            ("--raw-path", {"default": None, "help": "Path to raw insider tx JSON/NDJSON"}),
+            ("--start", {"default": None, "help": "Archive filings filed on/after YYYY-MM-DD"}),
+            ("--end", {"default": None, "help": "Archive filings filed on/before YYYY-MM-DD"}),
+            ("--force", {"is_flag": True, "default": False, "help": "Reprocess raw files the ledger has as loaded"}),
+        ],
+    },
+
+    "replay": {
+        "handler": "handle_replay",
+        "help": "Rebuild gold + DB rows for filings filed in a date range from the raw archive (no API calls)",
+        "options": [
+            ("--start", {"required": True, "help": "Filed on/after YYYY-MM-DD"}),
+            ("--end", {"required": True, "help": "Filed on/before YYYY-MM-DD"}),
+            ("--workers", {"default": 4, "type": int, "help": "Transform processes"}),
+        ],
+    },
+
+    "backfill": {
+        "handler": "handle_backfill",
+        "help": "Fetch + load a long date range from the API in month/week shards (resumable, multi-node)",
+        "options": [
+            ("--start", {"required": True, "help": "Filed on/after YYYY-MM-DD"}),
+            ("--end", {"required": True, "help": "Filed on/before YYYY-MM-DD"}),
+            ("--shard", {"type": click.Choice(["month", "week"]), "default": "month", "help": "Shard size"}),
+            ("--workers", {"default": 4, "type": int, "help": "Worker threads on this node"}),
+            ("--ticker", {"default": "*", "help": "Ticker or * for all"}),
+            ("--job", {"default": None, "help": "Queue job name (default: derived from query, range and shard)"}),
+            ("--status", {"is_flag": True, "default": False, "help": "Only print the job's progress"}),
+        ],
+    },
+
+    "poll": {
+        "handler": "handle_poll",
+        "help": "Keep polling the API for filings newer than the last loaded filedAt (micro-batches)",
+        "options": [
+            ("--interval", {"default": 60.0, "type": float, "help": "Seconds between polls"}),
+            ("--ticker", {"default": "*", "help": "Ticker or * for all"}),
+            ("--max-polls", {"default": None, "type": int, "help": "Stop after N polls (default: run until Ctrl-C)"}),
+        ],
+    },
+
+    "archive-raw": {
+        "handler": "handle_archive_raw",
+        "help": "Import raw insider tx JSON files into the deduplicated raw archive",
+        "options": [
+            ("--raw-path", {"required": True, "help": "File or directory under data/raw"}),
+        ],
+    },
+
+    "compact-gold": {
+        "handler": "handle_compact_gold",
+        "help": "Merge small files within each partition of a gold dataset",
+        "options": [
+            ("--name", {"default": "insider_transactions_final", "help": "Dataset under --directory"}),
+            ("--directory", {"default": "data/final", "help": "Gold layer root"}),
+            ("--small-file-mb", {"default": 32, "type": int, "help": "Files below this size get merged"}),
         ],
     },
 
     # ─────────── PLOT GROUP ───────────
     "plot.amount_assets_acquired_disposed": {
-        "handler": handle_plot_amount_assets,
+        "handler": "handle_plot_amount_assets",
         "help": "Plot amount of assets acquired/disposed",
-        "options": COMMON_PLOT_OPTIONS,
+        "options": COMMON_PLOT_OPTIONS + BACKEND_OPTION,
     },
 
     "plot.distribution_trans_codes": {
-        "handler": handle_plot_distribution_codes,
+        "handler": "handle_plot_distribution_codes",
         "help": "Plot distribution of transaction codes",
-        "options": COMMON_PLOT_OPTIONS,
+        "options": COMMON_PLOT_OPTIONS + BACKEND_OPTION,
     },
 
     "plot.n_most_companies_bs": {
-        "handler": handle_plot_n_companies,
+        "handler": "handle_plot_n_companies",
         "help": "Plot top N companies bought/sold",
         "options": COMMON_PLOT_OPTIONS + [
             ("--n", {"default": 15, "type": int, "help": "Number of companies"}),
-        ],
+        ] + BACKEND_OPTION,
     },
 
     "plot.n_most_companies_bs_by_reporter": {
-        "handler": handle_plot_n_companies_reporter,
+        "handler": "handle_plot_n_companies_reporter",
         "help": "Plot top N companies bought/sold by reporter",
         "options": COMMON_PLOT_OPTIONS + [
             ("--n", {"default": 15, "type": int}),
-        ],
+        ] + BACKEND_OPTION,
     },
 
     "plot.acquired_disposed_line_chart_ticker": {
-        "handler": handle_plot_line_chart,
+        "handler": "handle_plot_line_chart",
         "help": "Plot acquired/disposed line chart per ticker",
         # handler signature already has (ticker, start, end, save, outpath, show)
         # so COMMON_PLOT_OPTIONS is enough – no need to add a second --ticker
@@ -92,14 +155,27 @@ COMMANDS = {
     },
 
     "plot.sector_statistics": {
-        "handler": handle_plot_sector_stats,
+        "handler": "handle_plot_sector_stats",
         "help": "Plot sector statistics",
-        "options": COMMON_PLOT_OPTIONS,
+        "options": COMMON_PLOT_OPTIONS + BACKEND_OPTION,
+    },
+
+    "plot.report": {
+        "handler": "handle_plot_report",
+        "help": "Render every plot from one dataset load into a directory with an index.html",
+        "options": [
+            ("--ticker", {"default": None, "help": "Limit the by-reporter chart to one ticker"}),
+            ("--start", {"required": True, "help": "Start date YYYY-MM-DD"}),
+            ("--end", {"required": True, "help": "End date YYYY-MM-DD"}),
+            ("--n", {"default": 15, "type": int, "help": "Number of companies / insiders"}),
+            ("--outdir", {"default": "data/reports", "show_default": True, "help": "Directory for the PNGs and index.html"}),
+            ("--workers", {"default": None, "type": int, "help": "Render processes (default: one per chart, up to CPUs; 0 renders in-process)"}),
+        ],
     },
 
     # ─────────── SQL AI Agent ───────────
     "sql.ask": {
-       "handler": handle_answer_question_with_sql,
+       "handler": "handle_answer_question_with_sql",
        "help": "Generate, validate, optimize, and run a SQL query from a natural-language question",
        "options": [
            ("--question", {"required": True, "type": str, "help": "Natural-language SQL question"}),
@@ -109,4 +185,44 @@ COMMANDS = {
            ("--show-explain/--no-show-explain", {"default": False, "help": "Include EXPLAIN text in output"}),
        ],
    },
+
+    # ─────────── QUERY CACHE ───────────
+    "cache.stats": {
+        "handler": "handle_cache_stats",
+        "help": "Show repository query cache usage and hit ratio",
+        "options": [
+            ("--pretty/--no-pretty", {"default": True, "help": "Pretty-print JSON output"}),
+        ],
+    },
+
+    "cache.clear": {
+        "handler": "handle_cache_clear",
+        "help": "Drop every cached query result",
+        "options": [],
+    },
+
+    # ─────────── WARM SESSION ───────────
+    "daemon.start": {
+        "handler": "handle_daemon_start",
+        "help": "Keep a warm process serving CLI commands over a unix socket (foreground; Ctrl-C stops)",
+        "options": SOCKET_OPTION,
+    },
+
+    "daemon.status": {
+        "handler": "handle_daemon_status",
+        "help": "Show the running daemon's pid, uptime and command count",
+        "options": SOCKET_OPTION,
+    },
+
+    "daemon.stop": {
+        "handler": "handle_daemon_stop",
+        "help": "Stop the running daemon",
+        "options": SOCKET_OPTION,
+    },
+
+    "shell": {
+        "handler": "handle_shell",
+        "help": "Interactive session running commands in one warm process",
+        "options": [],
+    },
 }
@@ -1,6 +1,18 @@
+import importlib
+
 import click
 from cli.cli_commands import COMMANDS
 
+HANDLERS_MODULE = "cli.cli_handlers"
+
+
+def resolve_handler(handler):
+    """A handler given by name is looked up in HANDLERS_MODULE (imported on first call)."""
+    if callable(handler):
+        return handler
+    return getattr(importlib.import_module(HANDLERS_MODULE), handler)
+
+
 def register_command(root: click.Group, name: str, spec: dict):
     parts = name.split(".")
     top = parts[0]
@@ -11,7 +23,7 @@ def register_command(root: click.Group, name: str, spec: dict):
     options = spec.get("options", [])
 
     def click_callback(**kwargs):
-        return handler(**kwargs)
+        return resolve_handler(handler)(**kwargs)
 
     cmd = click.Command(
         name=parts[-1],
@@ -31,8 +43,32 @@ def register_command(root: click.Group, name: str, spec: dict):
         root.add_command(cmd)
 
 
+def _profile_memory(ctx: click.Context, _param, value: bool):
+    """--profile-memory: trace every metrics span, print the peaks on exit."""
+    if not value:
+        return value
+    from utils import memprofile
+    from utils.logger import Logger
+    from utils.metrics import current_run
+
+    memprofile.enable()
+    ctx.call_on_close(
+        lambda: Logger("MemoryProfile").info("\n" + memprofile.format_report(current_run()))
+    )
+    return value
+
+
 def build_cli() -> click.Group:
     cli = click.Group(help="Insider Trading Analysis CLI")
+    cli.params.append(click.Option(
+        ["--profile-memory"],
+        is_flag=True,
+        envvar="MEMORY_PROFILE",
+        expose_value=False,
+        is_eager=True,
+        callback=_profile_memory,
+        help="Record peak memory, RSS delta and top allocation sites per stage (slower)",
+    ))
     for name, spec in COMMANDS.items():
         register_command(cli, name, spec)
     return cli
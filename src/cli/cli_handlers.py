@@ -1,32 +1,15 @@
 # business logic
-import re
-import pandas as pd
-import yfinance as yf
-from typing import Optional
-import click
+#
+# Handlers import what they use when called: cli_factory loads this module
+# only when a command runs, and one command should not pay for pandas,
+# matplotlib, yfinance, openai or the pipeline unless it needs them.
 import json
 from pathlib import Path
-from dateutil.parser import parse
-
-from analytics.analysis import (companies_bs_in_period,
-                                companies_bs_in_period_by_reporter,
-                                distribution_by_codes, sector_stats_by_year,
-                                total_sec_acq_dis_day)
-from analytics.plots import (plot_amount_assets_acquired_disposed,
-                             plot_distribution_trans_codes, plot_line_chart,
-                             plot_n_most_companies_bs,
-                             plot_n_most_companies_bs_by_reporter,
-                             plot_sector_stats)
-from config.insider_trading_config import InsiderTradingConfig
-from config.settings import settings
-from db.etl_db import ETLDatabase
-from db.repository import InsiderRepository
-from db.sql_workflow import answer_question_with_sql
-from insider_trading.extract.sources.insider_api_source import InsiderApiSource
-from insider_trading.pipeline import InsiderTradingPipeline
+from typing import Optional
+
+import click
+
 from utils.logger import Logger
-from utils.utils import iterate_months
-from writers.raw_writer import RawWriter
 
 log = Logger(__name__)
 # ─────────────────────────
@@ -35,6 +18,10 @@ log = Logger(__name__)
 
 def handle_fetch_insider_tx(ticker: str, start: str, end: str):
     """force fetch insider trading transactions"""
+    from config.settings import settings
+    from insider_trading.extract.sources.insider_api_source import InsiderApiSource
+    from writers.raw_writer import RawWriter
+
     if "*" not in ticker:
         query = f"issuer.tradingSymbol:{ticker}"
     else:
@@ -47,11 +34,15 @@ def handle_fetch_insider_tx(ticker: str, start: str, end: str):
     log.info(f"[EXTRACT] Raw filing records = {len(raw)}")
 
     raw_writer = RawWriter(directory="data/raw")
-    raw_path = raw_writer.save(f"insider_transactions_{start}_{end}", raw)
-    log.info(f"[RAW] Saved → {raw_path}")
+    added, skipped = raw_writer.save_filings(raw)
+    log.info(f"[RAW] Archived → added={added}, already archived={skipped}")
 
 def handle_fetch_exchange_mapping():
     """force fetch exchange mapping"""
+    from config.settings import settings
+    from insider_trading.extract.sources.insider_api_source import InsiderApiSource
+    from writers.raw_writer import RawWriter
+
     src = InsiderApiSource(settings.base_url, settings.sec_api_key)
     log.info("[TRANSACTIONS] Running for exchange mapping")
     raw = list(src.fetch_exchange_mapping())
@@ -62,42 +53,136 @@ def handle_fetch_exchange_mapping():
     raw_path = raw_writer.save("exchange_mapping",raw)
     log.info(f"[RAW] Saved → {raw_path}")
 
-def handle_build_dataset(raw_path: str):
-    """force run pipeline on raw_path"""
-    config = settings 
-    config.test_mode_tx = True
-    config.test_mode_map = True
-    config.test_path_map = 'exchange_mapping.json'
+def handle_build_dataset(raw_path: str | None, start: str | None, end: str | None, force: bool):
+    """force run pipeline on raw_path, or on archived filings filed in [start, end]"""
+    from config.settings import settings
+    from db.etl_db import ETLDatabase
+    from db.file_ledger import ProcessedFileLedger
+    from insider_trading.pipeline import InsiderTradingPipeline
+    from insider_trading.tasks.raw_files_task import RawFilesTask
+
+    # per-invocation copy: the shared settings object stays untouched
+    config = settings.model_copy(update={
+        "test_mode_tx": True,
+        "test_mode_map": True,
+        "test_path_map": "exchange_mapping.json",
+    })
+    db = ETLDatabase()
+
+    if raw_path is None:
+        if not (start or end):
+            raise click.UsageError("Pass --raw-path or a --start/--end range of the raw archive")
+        pipeline = InsiderTradingPipeline(config, db)
+        pipeline.mapping_task.run(raw_path_override=config.test_path_map)
+
+        archive = pipeline.raw_writer.archive
+        for batch in archive.iter_batches(start, end):
+            pipeline.transactions_task.run(params=None, raw=batch)
+        return
+
+    raw_dir = Path("data/raw")
+    _path = raw_dir / raw_path
+    files = sorted(_path.glob("insider_transactions_*.json")) if _path.is_dir() else [_path]
+    load_mapping = True
+
+    def process(path: Path) -> tuple[int, int]:
+        nonlocal load_mapping
+        # mapping is loaded from its raw file along with the first file processed
+        file_config = config.model_copy(update={
+            "test_path_tx": str(path.relative_to(raw_dir)),
+            "test_mode_map": load_mapping,
+        })
+        dag_run = InsiderTradingPipeline(file_config, db).run()
+        load_mapping = False
+        loaded = dag_run.results.get("transactions.load")
+        return len(dag_run.results.get("transactions.extract") or []), 0 if loaded is None else len(loaded)
+
+    RawFilesTask(ProcessedFileLedger(db), process).run(files, force=force)
+
+def handle_replay(start: str, end: str, workers: int):
+    """re-transform archived filings filed in [start, end] and swap gold + DB rows"""
+    from config.settings import settings
+    from db.etl_db import ETLDatabase
+    from insider_trading.pipeline import InsiderTradingPipeline
+
+    pipeline = InsiderTradingPipeline(settings, ETLDatabase())
+    stats = pipeline.replay(start, end, workers=workers)
+    log.info(f"[REPLAY] {start} → {end}: {stats}")
+
+def handle_backfill(start: str, end: str, shard: str, workers: int, ticker: str, job: str | None, status: bool):
+    """fetch [start, end] from the API shard by shard; rerun (or run on more nodes) to resume"""
+    from config.settings import settings
+    from db.backfill_queue import BackfillQueue
+    from db.etl_db import ETLDatabase
+    from insider_trading.pipeline import InsiderTradingPipeline
+
+    query = f"issuer.tradingSymbol:{ticker}" if "*" not in ticker else "*:*"
+    job = job or InsiderTradingPipeline.backfill_job(query, start, end, shard)
     db = ETLDatabase()
+
+    if status:
+        click.echo(json.dumps(BackfillQueue(db).progress(job), indent=2))
+        return
+
+    progress = InsiderTradingPipeline(settings, db).backfill(start, end, unit=shard, workers=workers, query=query, job=job)
+    log.info(f"[BACKFILL] {job}: {progress}")
+
+def handle_poll(interval: float, ticker: str, max_polls: int | None):
+    """load new filings in micro-batches until interrupted; freshness goes to the metrics textfile"""
+    from config.settings import settings
+    from db.etl_db import ETLDatabase
+    from insider_trading.pipeline import InsiderTradingPipeline
+
+    query = f"issuer.tradingSymbol:{ticker}" if "*" not in ticker else "*:*"
+    InsiderTradingPipeline(settings, ETLDatabase()).poll(interval=interval, query=query, max_polls=max_polls)
+
+def handle_archive_raw(raw_path: str):
+    """import legacy raw JSON files into the deduplicated raw archive"""
+    from writers.raw_writer import RawWriter
+
+    raw_writer = RawWriter(directory="data/raw")
     _path = Path("data/raw/"+raw_path)
-    if _path.exists() and _path.is_dir():
-        files = _path.glob("insider_transactions_*.json")
-        f_names = sorted([f.name for f in files])
-        for name in f_names:
-            config.test_path_tx = name
-            InsiderTradingPipeline(config, db).run()
-            if config.test_mode_map: 
-                config.test_mode_map = False
-    else:
-        config.test_path_tx = raw_path
-        InsiderTradingPipeline(config, db).run()
-    return
+    files = sorted(_path.glob("insider_transactions_*.json")) if _path.is_dir() else [_path]
+
+    for f in files:
+        added, skipped = raw_writer.archive.import_json(f)
+        log.info(f"[RAW] {f.name}: added={added}, already archived={skipped}")
+    log.info(f"[RAW] Archive now holds {len(raw_writer.archive)} filings")
+
+def handle_compact_gold(name: str, directory: str, small_file_mb: int):
+    """merge small files in each partition of a partitioned gold dataset"""
+    from writers.final_writer import FinalWriter
+
+    writer = FinalWriter(directory=directory, expected_schema=[], partition_by="period_of_report")
+    stats = writer.compact(name, small_file_bytes=small_file_mb * 1024**2)
+    click.echo(json.dumps(stats))
 
 
 # ─────────────────────────
 # PLOT HANDLERS
 # ─────────────────────────
 
-def handle_plot_amount_assets(ticker, start, end, save, outpath, show):
-    db = InsiderRepository()
-    df = db.get_transactions(start, end)
+def handle_plot_amount_assets(ticker, start, end, save, outpath, show, backend):
+    from analytics import sql_analysis
+    from analytics.analysis import acquired_disposed_by_year, total_sec_acq_dis_day
+    from analytics.plots import plot_amount_assets_acquired_disposed
+    from db.repository import get_repository
+
+    db = get_repository()
 
     # BUSINESS LOGIC (analysis layer)
-    dataset = total_sec_acq_dis_day(df)
-    dataset.index = dataset.index.normalize()
-    acquired_yr = dataset.groupby(pd.Grouper(freq='Y'))['acquired'].sum()
-    disposed_yr = dataset.groupby(pd.Grouper(freq='Y'))['disposed'].sum()
-    acquired_disposed_yr = pd.merge(acquired_yr, disposed_yr, on='period_of_report', how='outer')
+    if backend == "sql":
+        dataset = sql_analysis.total_sec_acq_dis_day(db, start, end)
+    else:
+        # per-day sums are all this chart needs → read the summary table
+        df = db.get_daily_flow(
+            start,
+            end,
+            columns=["period_of_report", "acquired_disposed", "total_value"],
+            side=["A", "D"],
+        )
+        dataset = total_sec_acq_dis_day(df)
+    acquired_disposed_yr = acquired_disposed_by_year(dataset)
 
     # RENDERING (plotting layer)
     plot_amount_assets_acquired_disposed(
@@ -109,11 +194,19 @@ def handle_plot_amount_assets(ticker, start, end, save, outpath, show):
         end=end,
     )
 
-def handle_plot_distribution_codes(ticker, start, end, save, outpath, show):
-    db = InsiderRepository()
-    df = db.get_transactions(start, end)
+def handle_plot_distribution_codes(ticker, start, end, save, outpath, show, backend):
+    from analytics import sql_analysis
+    from analytics.analysis import distribution_by_codes
+    from analytics.plots import plot_distribution_trans_codes
+    from db.repository import get_repository
+
+    db = get_repository()
 
-    dataset = distribution_by_codes(df)
+    if backend == "sql":
+        dataset = sql_analysis.distribution_by_codes(db, start, end)
+    else:
+        df = db.get_daily_flow(start, end, columns=["acquired_disposed", "code", "total_value"])
+        dataset = distribution_by_codes(df)
 
     plot_distribution_trans_codes(
         dataset,
@@ -124,11 +217,24 @@ def handle_plot_distribution_codes(ticker, start, end, save, outpath, show):
         show=show,
     )
 
-def handle_plot_n_companies(ticker, start, end, n, save, outpath, show):
-    db = InsiderRepository()
-    df = db.get_transactions(start, end)
+def handle_plot_n_companies(ticker, start, end, n, save, outpath, show, backend):
+    from analytics import sql_analysis
+    from analytics.analysis import companies_bs_in_period
+    from analytics.plots import plot_n_most_companies_bs
+    from db.repository import get_repository
 
-    acquired, disposed = companies_bs_in_period(df, start, end)
+    db = get_repository()
+
+    if backend == "sql":
+        acquired, disposed = sql_analysis.companies_bs_in_period(db, start, end)
+    else:
+        df = db.get_daily_flow(
+            start,
+            end,
+            columns=["period_of_report", "issuer_ticker", "acquired_disposed", "total_value"],
+            side=["A", "D"],
+        )
+        acquired, disposed = companies_bs_in_period(df, start, end)
 
     plot_n_most_companies_bs(
         acquired=acquired,
@@ -141,10 +247,25 @@ def handle_plot_n_companies(ticker, start, end, n, save, outpath, show):
         end=end,
     )
 
-def handle_plot_n_companies_reporter(ticker, start, end, n, save, outpath, show):
-    db = InsiderRepository()
-    df = db.get_transactions(start, end)
-    acquired, disposed = companies_bs_in_period_by_reporter(df, start, end, ticker)
+def handle_plot_n_companies_reporter(ticker, start, end, n, save, outpath, show, backend):
+    from analytics import sql_analysis
+    from analytics.analysis import companies_bs_in_period_by_reporter
+    from analytics.plots import plot_n_most_companies_bs_by_reporter
+    from db.repository import get_repository
+
+    db = get_repository()
+
+    if backend == "sql":
+        acquired, disposed = sql_analysis.companies_bs_in_period_by_reporter(db, start, end, ticker)
+    else:
+        df = db.get_transactions(
+            start,
+            end,
+            columns=["period_of_report", "reporter", "issuer_ticker", "acquired_disposed", "total_value"],
+            ticker=ticker,
+            side=["A", "D"],
+        )
+        acquired, disposed = companies_bs_in_period_by_reporter(df, start, end, ticker)
 
     plot_n_most_companies_bs_by_reporter(
         acquired=acquired,
@@ -158,22 +279,31 @@ def handle_plot_n_companies_reporter(ticker, start, end, n, save, outpath, show)
     )
 
 def handle_plot_line_chart(ticker, reporter, start, end, save, outpath, show):
-    db = InsiderRepository()
-    df = db.get_transactions(start, end)
+    import pandas as pd
+    import yfinance as yf
+    from dateutil.parser import parse
+
+    from analytics.plots import plot_line_chart
+    from db.repository import get_repository
+    from utils.utils import name_tokens
+
+    db = get_repository()
+    # ticker, date range and a reporter-token prefilter all run in SQL
+    df = db.get_transactions(
+        start,
+        end,
+        columns=["period_of_report", "reporter", "acquired_disposed", "total_value"],
+        ticker=ticker,
+        reporter=reporter,
+    )
     #start_date = datetime.strptime(start, "%Y-%m-%d").date()
     start_date = parse(start).date()
     #end_date = datetime.strptime(end, "%Y-%m-%d").date()
     end_date = parse(end).date()
-    ticker_filter = (df["issuer_ticker"]==ticker) & \
-    (df["period_of_report"].dt.date >=start_date) & \
-    (df["period_of_report"].dt.date <=end_date)
-    def name_tokens(name: str) -> set[str]:
-        if not isinstance(name, str):
-            return set()
-        #removes punctuation, commas, dots, numbers
-        return set(re.findall(r"[a-z]+", name.casefold()))
+    ticker_filter = pd.Series(True, index=df.index)
 
     if reporter is not None:
+        # SQL ILIKE matches substrings; keep the exact whole-token check
         target_tokens = name_tokens(reporter)
         ticker_filter &= df["reporter"].apply(
             lambda x: target_tokens.issubset(name_tokens(x))
@@ -182,7 +312,7 @@ def handle_plot_line_chart(ticker, reporter, start, end, save, outpath, show):
         "total_value": "sum",
         "acquired_disposed": "first"
     })
-    
+
     # remove time format 2022-03-14 00:00:00+00:00 -> 2022-03-14
     ticker_acquired.index = ticker_acquired.index.tz_convert(None)
     ticker_acquired.index.names = ['Date']
@@ -203,10 +333,23 @@ def handle_plot_line_chart(ticker, reporter, start, end, save, outpath, show):
         end=end,
     )
 
-def handle_plot_sector_stats(ticker, start, end, save, outpath, show):
-    db = InsiderRepository()
-    df = db.get_rollup(start, end)
-    dataset = sector_stats_by_year(df)
+def handle_plot_sector_stats(ticker, start, end, save, outpath, show, backend):
+    from analytics import sql_analysis
+    from analytics.analysis import sector_stats_by_year
+    from analytics.plots import plot_sector_stats
+    from db.repository import get_repository
+
+    db = get_repository()
+
+    if backend == "sql":
+        dataset = sql_analysis.sector_stats_by_year(db, start, end)
+    else:
+        df = db.get_rollup(
+            start,
+            end,
+            columns=["sector", "total_value", "period_of_report", "acquired_disposed"],
+        )
+        dataset = sector_stats_by_year(df)
 
     plot_sector_stats(
         dataset,
@@ -217,6 +360,19 @@ def handle_plot_sector_stats(ticker, start, end, save, outpath, show):
         end=end,
     )
 
+def handle_plot_report(ticker, start, end, n, outdir, workers):
+    from analytics.report import PlotReport, timing_table
+    from db.repository import get_repository
+
+    report = PlotReport(get_repository(), start, end, n=n, ticker=ticker, workers=workers).run(outdir)
+
+    click.echo(timing_table(report))
+    click.echo(f"Report: {Path(outdir) / 'index.html'}")
+    failed = [row["chart"] for row in report["charts"] if "error" in row]
+    if failed:
+        raise click.ClickException(f"Charts failed to render: {', '.join(failed)}")
+
+
 
 def handle_answer_question_with_sql(
     question: str,
@@ -237,6 +393,8 @@ def handle_answer_question_with_sql(
     show_explain: bool
         If true, include EXPLAIN ANALYZE text in output (can be large).
     """
+    from db.sql_workflow import answer_question_with_sql
+
     result = answer_question_with_sql(question)
 
     # Trim what we print unless user asked for it
@@ -262,3 +420,72 @@ def handle_answer_question_with_sql(
         click.echo(f"Wrote output to: {output}")
     else:
         click.echo(text)
+
+
+# ─────────────────────────
+# WARM SESSION HANDLERS
+# ─────────────────────────
+
+def handle_daemon_start(socket_path: str | None):
+    """serve forwarded commands from this process until `daemon stop`"""
+    from db.config import get_settings
+
+    from cli.cli_factory import build_cli
+    from cli.daemon import CLIDaemon
+
+    CLIDaemon(build_cli(), socket_path or get_settings().cli_socket).serve()
+
+def _daemon_request(socket_path: str | None, op: str) -> None:
+    from db.config import get_settings
+
+    from cli import client
+
+    sock = client.connect(socket_path)
+    if sock is None:
+        raise click.ClickException(f"No daemon listening on {socket_path or get_settings().cli_socket}")
+    with sock:
+        for msg in client.send(sock, {"op": op}):
+            if "stream" in msg:
+                click.echo(msg["data"], nl=False)
+
+def handle_daemon_status(socket_path: str | None):
+    """print the running daemon's pid, uptime and command count"""
+    _daemon_request(socket_path, "ping")
+
+def handle_daemon_stop(socket_path: str | None):
+    """stop the running daemon after its current command"""
+    _daemon_request(socket_path, "stop")
+
+def handle_shell():
+    """interactive session that keeps imports, engine and query cache warm"""
+    from cli.cli_factory import build_cli
+    from cli.daemon import repl
+
+    repl(build_cli())
+
+# ─────────────────────────
+# QUERY CACHE HANDLERS
+# ─────────────────────────
+
+def handle_cache_stats(pretty: bool) -> None:
+    from db.cache import get_query_cache
+
+    cache = get_query_cache()
+    if cache is None:
+        click.echo("Query cache disabled (QUERY_CACHE_DIR is empty)")
+        return
+
+    payload = {**cache.stats(), "lifetime": cache.lifetime_stats()}
+    click.echo(json.dumps(payload, indent=2 if pretty else None))
+
+
+def handle_cache_clear() -> None:
+    from db.cache import get_query_cache
+
+    cache = get_query_cache()
+    if cache is None:
+        click.echo("Query cache disabled (QUERY_CACHE_DIR is empty)")
+        return
+
+    cache.clear()
+    click.echo(f"Cleared query cache at: {cache.directory}")
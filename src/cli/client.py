@@ -0,0 +1,82 @@
+# cli entry point: forwards to a running `insider_cli daemon start`, else runs in-process
+#
+# Kept to the standard library so a forwarded command does not pay for
+# importing pandas / matplotlib / SQLAlchemy; the daemon has them loaded.
+#
+# Wire format (one JSON object per line over the unix socket):
+#   client → {"argv": [...], "cwd": "..."}      or {"op": "ping" | "stop"}
+#   daemon → {"stream": "stdout" | "stderr", "data": "..."} ... {"exit": code}
+import json
+import os
+import socket
+import sys
+
+from db.config import get_settings
+from utils.memprofile import ENV_FLAG as MEMORY_PROFILE_ENV
+
+# commands that must run in this process, never in the daemon; poll and
+# backfill run until stopped, and Ctrl-C on a client would not reach them
+LOCAL_COMMANDS = {"daemon", "shell", "poll", "backfill"}
+
+# env switches read when a command starts; the daemon only has its own
+LOCAL_ENV = (MEMORY_PROFILE_ENV,)
+
+
+def connect(path: str | None = None) -> socket.socket | None:
+    """Socket to a live daemon, or None when none is listening at `path`."""
+    path = path or get_settings().cli_socket
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def send(sock: socket.socket, message: dict):
+    """Send one request; yield the daemon's reply messages until it closes."""
+    sock.sendall((json.dumps(message) + "\n").encode())
+    with sock.makefile("r", encoding="utf-8") as replies:
+        for line in replies:
+            yield json.loads(line)
+
+
+def forward(sock: socket.socket, argv: list[str]) -> int:
+    """Run argv in the daemon, relaying its output; returns the exit code."""
+    code = 1
+    for msg in send(sock, {"argv": argv, "cwd": os.getcwd()}):
+        if "stream" in msg:
+            out = sys.stdout if msg["stream"] == "stdout" else sys.stderr
+            out.write(msg["data"])
+            out.flush()
+        elif "exit" in msg:
+            code = msg["exit"]
+    return code
+
+
+def forwardable(argv: list[str]) -> bool:
+    """Whether argv may run in the daemon rather than in this process."""
+    # global options (e.g. --profile-memory) and env switches (MEMORY_PROFILE)
+    # change process state: run those locally
+    return bool(argv) and argv[0] not in LOCAL_COMMANDS and not argv[0].startswith("-") \
+        and os.getenv("CLI_NO_DAEMON") != "1" \
+        and not any(os.getenv(name) for name in LOCAL_ENV)
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    if forwardable(argv):
+        sock = connect()
+        if sock is not None:
+            with sock:
+                sys.exit(forward(sock, argv))
+
+    from cli.run_cli import cli
+    cli()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Warm CLI session: `insider_cli daemon start` and `insider_cli shell`.
+
+Both keep one process alive across commands, so the heavy imports, the
+SQLAlchemy engine (and its connection pool) and the repository query
+cache's in-memory tier — exchange mapping and recently read frames —
+are paid for once. The daemon serves commands forwarded by cli.client
+over a unix socket, one at a time, streaming their stdout / stderr and
+log lines back; see cli.client for the wire format.
+"""
+import contextlib
+import importlib
+import json
+import logging
+import os
+import shlex
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+
+import click
+
+from utils.logger import Logger
+
+
+# ----------------------------------------------------------------------
+# Running one command in-process
+# ----------------------------------------------------------------------
+def run_argv(cli: click.Group, argv: list[str]) -> int:
+    """Invoke the click app with `argv` like the shell would; returns the exit code."""
+    try:
+        result = cli.main(args=argv, prog_name="insider_cli", standalone_mode=False)
+    except click.exceptions.Exit as e:
+        return e.exit_code
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    # standalone_mode=False returns the exit code of --help / ctx.exit()
+    return result if isinstance(result, int) else 0
+
+
+class _SocketStream:
+    """File-like stdout / stderr that forwards writes to the client as messages."""
+
+    encoding = "utf-8"
+
+    def __init__(self, conn: socket.socket, name: str):
+        self.conn = conn
+        self.name = name
+
+    def write(self, data: str) -> int:
+        if not isinstance(data, str):
+            # click probes streams with write(b"") to detect binary ones
+            raise TypeError(f"write() argument must be str, not {type(data).__name__}")
+        if data:
+            self.conn.sendall((json.dumps({"stream": self.name, "data": data}) + "\n").encode())
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _stream_handlers():
+    loggers = [logging.getLogger()] + [
+        lg for lg in logging.Logger.manager.loggerDict.values() if isinstance(lg, logging.Logger)
+    ]
+    for lg in loggers:
+        for handler in lg.handlers:
+            if type(handler) is logging.StreamHandler:
+                yield handler
+
+
+@contextlib.contextmanager
+def redirected(stdout, stderr):
+    """
+    Point sys.stdout / sys.stderr and every logging StreamHandler at the
+    given streams. utils.logger handlers capture sys.stderr when created,
+    so ones created during the command are pointed back afterwards too.
+    """
+    real = sys.__stderr__
+    for handler in _stream_handlers():
+        handler.setStream(stderr)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            yield
+    finally:
+        for handler in _stream_handlers():
+            if handler.stream in (stderr, stdout):
+                handler.setStream(real)
+
+
+# ----------------------------------------------------------------------
+# Daemon
+# ----------------------------------------------------------------------
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        self.server.cli_daemon.handle(json.loads(line), self.connection)
+
+
+class CLIDaemon:
+    """
+    Serve forwarded CLI commands from one warm process.
+
+    Commands run one at a time (stdout redirection and the working
+    directory are process-wide) in the daemon's own working directory;
+    clients elsewhere are refused rather than having their relative
+    paths silently resolved against it.
+    """
+
+    def __init__(self, cli: click.Group, socket_path: str):
+        self.cli = cli
+        self.socket_path = socket_path
+        self.cwd = os.getcwd()
+        self.requests = 0
+        self._started = time.monotonic()
+        self._stopping = False
+        self.ready = threading.Event()  # set once the socket accepts commands
+        self.log = Logger(self.__class__.__name__)
+
+    # what handlers import on first use (see cli.cli_handlers)
+    PRELOAD = (
+        "cli.cli_handlers",
+        "analytics.analysis",
+        "analytics.sql_analysis",
+        "analytics.plots",
+        "analytics.report",
+        "db.repository",
+        "insider_trading.pipeline",
+    )
+
+    def warm(self) -> None:
+        """
+        Import the handlers' modules, open a pooled DB connection and pull
+        the exchange mapping into the query cache.
+        """
+        t0 = time.perf_counter()
+        for module in self.PRELOAD:
+            importlib.import_module(module)
+
+        from db.repository import get_repository
+        try:
+            get_repository().get_mapping()
+        except Exception as e:
+            self.log.warning(f"[DAEMON] DB warm-up skipped: {e!r}")
+            return
+        self.log.info(f"[DAEMON] Warm-up done in {time.perf_counter() - t0:.2f}s")
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "cwd": self.cwd,
+            "socket": self.socket_path,
+            "uptime_s": round(time.monotonic() - self._started, 1),
+            "requests": self.requests,
+        }
+
+    def handle(self, request: dict, conn: socket.socket) -> None:
+        def reply(**msg):
+            conn.sendall((json.dumps(msg) + "\n").encode())
+
+        op = request.get("op", "run")
+        if op == "ping":
+            reply(stream="stdout", data=json.dumps(self.status(), indent=2) + "\n")
+            return reply(exit=0)
+        if op == "stop":
+            self._stopping = True
+            reply(stream="stdout", data=f"daemon {os.getpid()} stopping\n")
+            return reply(exit=0)
+
+        if request.get("cwd") != self.cwd:
+            reply(stream="stderr", data=f"daemon serves {self.cwd}; run from there or start one here with --socket\n")
+            return reply(exit=2)
+
+        self.requests += 1
+        argv = request["argv"]
+        t0 = time.perf_counter()
+        stdout, stderr = _SocketStream(conn, "stdout"), _SocketStream(conn, "stderr")
+        try:
+            with redirected(stdout, stderr):
+                code = run_argv(self.cli, argv)
+        except OSError:
+            # client went away mid-command; nothing left to report to
+            self.log.warning(f"[DAEMON] Client disconnected during {shlex.join(argv)}")
+            return
+        reply(exit=code)
+        self.log.info(f"[DAEMON] {shlex.join(argv)} → exit {code} in {time.perf_counter() - t0:.2f}s")
+
+    def _bind(self) -> socketserver.UnixStreamServer:
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)  # stale socket from a daemon that died
+            else:
+                raise click.ClickException(f"A daemon is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+        old_umask = os.umask(0o177)  # socket readable by this user only
+        try:
+            server = socketserver.UnixStreamServer(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        server.cli_daemon = self
+        server.timeout = 0.5
+        return server
+
+    def serve(self, warm: bool = True) -> None:
+        server = self._bind()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: setattr(self, "_stopping", True))
+
+        # plots render off-screen; --show has no window to open in a daemon
+        import matplotlib
+        matplotlib.use("Agg")
+        if warm:
+            self.warm()
+
+        self.ready.set()
+        self.log.info(f"[DAEMON] pid {os.getpid()} listening on {self.socket_path} (cwd {self.cwd})")
+        try:
+            while not self._stopping:
+                server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+            self.log.info(f"[DAEMON] Stopped after {self.requests} commands")
+
+
+# ----------------------------------------------------------------------
+# REPL
+# ----------------------------------------------------------------------
+def repl(cli: click.Group) -> None:
+    """Read commands (without the `insider_cli` prefix) until EOF / exit."""
+    click.echo("insider_cli shell — commands as on the command line, `help`, `exit`")
+    while True:
+        try:
+            line = input("insider> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            click.echo()
+            return
+        if line in ("exit", "quit"):
+            return
+        if not line:
+            continue
+        if line == "help":
+            line = "--help"
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            click.echo(f"Error: {e}", err=True)
+            continue
+        if argv[0] in ("shell", "daemon"):
+            click.echo(f"Error: `{argv[0]}` is not available inside the shell", err=True)
+            continue
+        run_argv(cli, argv)
@@ -0,0 +1,149 @@
+# db/backfill_queue.py
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import text
+
+from utils.logger import Logger
+
+PLAN_SQL = """
+    INSERT INTO backfill_shards (job, query, start_date, end_date)
+    VALUES (:job, :query, :start_date, :end_date)
+    ON CONFLICT ON CONSTRAINT uq_backfill_shards_job_start DO NOTHING
+"""
+
+# SKIP LOCKED: concurrent claimers (threads or other nodes) each take a
+# different row instead of queueing on the same one. The claim commits
+# at once, so status — not the row lock — marks the shard as taken.
+CLAIM_SQL = """
+    UPDATE backfill_shards
+    SET status = 'running', worker = :worker, claimed_at = now(),
+        attempts = attempts + 1, error = NULL
+    WHERE id = (
+        SELECT id FROM backfill_shards
+        WHERE job = :job
+          AND (
+                status = 'pending'
+             OR (status = 'failed' AND attempts < :max_attempts)
+             OR (status = 'running' AND claimed_at < now() - make_interval(secs => :lease))
+          )
+        ORDER BY start_date
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, query, start_date, end_date, attempts, worker
+"""
+
+PROGRESS_SQL = """
+    SELECT
+        COUNT(*)                                            AS total,
+        COUNT(*) FILTER (WHERE status = 'done')             AS done,
+        COUNT(*) FILTER (WHERE status = 'running')          AS running,
+        COUNT(*) FILTER (WHERE status = 'failed')           AS failed,
+        COUNT(*) FILTER (WHERE status = 'failed' AND attempts >= :max_attempts) AS dead,
+        COALESCE(SUM(filings), 0)                           AS filings,
+        COALESCE(SUM(rows_loaded), 0)                       AS rows_loaded,
+        EXTRACT(EPOCH FROM AVG(finished_at - claimed_at) FILTER (WHERE status = 'done')) AS avg_shard_s
+    FROM backfill_shards
+    WHERE job = :job
+"""
+
+
+def plan_shards(start: str | date, end: str | date, unit: str = "month") -> list[tuple[date, date]]:
+    """
+    Inclusive [start, end] split into calendar months or ISO weeks
+    (Mon–Sun); the first and last shard are clamped to the range.
+    """
+    start, end = date.fromisoformat(str(start)), date.fromisoformat(str(end))
+    if unit == "month":
+        first, step = start.replace(day=1), relativedelta(months=1)
+    elif unit == "week":
+        first, step = start - timedelta(days=start.weekday()), timedelta(weeks=1)
+    else:
+        raise ValueError(f"[BackfillQueue] Unknown shard unit '{unit}' (month or week)")
+
+    shards = []
+    while first <= end:
+        nxt = first + step
+        shards.append((max(first, start), min(nxt - timedelta(days=1), end)))
+        first = nxt
+    return shards
+
+
+class BackfillQueue:
+    """
+    Work queue of backfill shards in `backfill_shards`.
+
+    plan() is idempotent per (job, start_date), so re-running a backfill
+    resumes it: done shards stay done, failed ones are retried up to
+    `max_attempts`, and running ones whose claim is older than `lease`
+    seconds (a worker that died) are handed out again. Live workers keep
+    their claim fresh with heartbeat().
+    """
+
+    def __init__(self, db, lease: int = 3600, max_attempts: int = 3):
+        self.db = db
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.log = Logger(self.__class__.__name__)
+
+    # ----------------------------------------------------------------------
+    def plan(self, job: str, query: str, shards: list[tuple[date, date]]) -> int:
+        """Record shards not yet in the queue; returns how many were added."""
+        rows = [{"job": job, "query": query, "start_date": s, "end_date": e} for s, e in shards]
+        if not rows:
+            return 0
+        with self.db.engine.begin() as conn:
+            added = sum(conn.execute(text(PLAN_SQL), row).rowcount for row in rows)
+        self.log.info(f"[BACKFILL] {job}: planned {len(rows)} shards, {added} new")
+        return added
+
+    def claim(self, job: str, worker: str) -> dict | None:
+        """Take the oldest claimable shard, or None when nothing is left to claim."""
+        with self.db.engine.begin() as conn:
+            row = conn.execute(text(CLAIM_SQL), {
+                "job": job,
+                "worker": worker,
+                "max_attempts": self.max_attempts,
+                "lease": self.lease,
+            }).mappings().first()
+        return dict(row) if row else None
+
+    def heartbeat(self, shard: dict) -> bool:
+        """Renew the claim on a running shard; False once another worker holds it."""
+        with self.db.engine.begin() as conn:
+            renewed = conn.execute(text("""
+                UPDATE backfill_shards
+                SET claimed_at = now()
+                WHERE id = :id AND worker = :worker AND status = 'running'
+            """), {"id": shard["id"], "worker": shard["worker"]}).rowcount
+        return renewed == 1
+
+    # a shard whose lease ran out may have been re-claimed: only the
+    # current holder's outcome is recorded
+    def complete(self, shard: dict, filings: int, rows_loaded: int) -> None:
+        with self.db.engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE backfill_shards
+                SET status = 'done', finished_at = now(), filings = :filings, rows_loaded = :rows
+                WHERE id = :id AND worker = :worker
+            """), {"id": shard["id"], "worker": shard["worker"], "filings": filings, "rows": rows_loaded})
+
+    def fail(self, shard: dict, error: str) -> None:
+        with self.db.engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE backfill_shards
+                SET status = 'failed', finished_at = now(), error = :error
+                WHERE id = :id AND worker = :worker
+            """), {"id": shard["id"], "worker": shard["worker"], "error": error[:2000]})
+
+    def progress(self, job: str) -> dict:
+        """Shard counts by status plus totals loaded, across every worker and node."""
+        with self.db.engine.connect() as conn:
+            row = conn.execute(text(PROGRESS_SQL), {"job": job, "max_attempts": self.max_attempts}).mappings().one()
+        progress = dict(row)
+        progress["pending"] = progress["total"] - progress["done"] - progress["running"] - progress["failed"]
+        # shards that will still be worked on (dead ones have used up their attempts)
+        progress["remaining"] = progress["total"] - progress["done"] - progress["dead"]
+        progress["avg_shard_s"] = float(progress["avg_shard_s"]) if progress["avg_shard_s"] is not None else None
+        return progress
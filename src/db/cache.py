@@ -0,0 +1,227 @@
+# db/cache.py
+import atexit
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from utils.logger import Logger
+from .config import get_settings
+
+
+class QueryCache:
+    """
+    Two-level result cache for InsiderRepository reads.
+
+    - memory: LRU of DataFrames, bounded by `max_memory_bytes`
+    - disk:   one Parquet file per key under `directory`,
+              bounded by `max_disk_bytes` (least recently used evicted first)
+
+    Keys hash (sql, params, watermark). The repository passes the newest
+    etl_state.last_updated as watermark, so any load makes every older
+    entry unreachable; those files simply age out through eviction.
+
+    Hit / miss counters are kept per process (`stats()`) and accumulated
+    across processes in `stats.json`, since each CLI command is its own run.
+    Lookups only count in memory; the counts are added to the file (under
+    an flock, atomically replaced) every `FLUSH_INTERVAL_S`, on close()
+    and at interpreter exit.
+    """
+
+    STATS_FILE = "stats.json"
+    STATS_LOCK = "stats.lock"
+    FLUSH_INTERVAL_S = 30.0
+
+    def __init__(
+        self,
+        directory: str | Path = "data/cache/queries",
+        max_memory_bytes: int = 256 * 1024**2,
+        max_disk_bytes: int = 1024**3,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.log = Logger(self.__class__.__name__)
+
+        self._memory: OrderedDict[str, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._memory_bytes = 0
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        # counts not yet added to stats.json
+        self._unflushed = dict.fromkeys(self._counters, 0)
+        self._flushed_at = time.monotonic()
+        atexit.register(self.flush)
+
+    # ---------------------------------------
+    # Keys
+    # ---------------------------------------
+    @staticmethod
+    def make_key(sql: str, params: dict | None, watermark) -> str:
+        payload = json.dumps([sql, params or {}, watermark], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    # ---------------------------------------
+    # Lookup / store
+    # ---------------------------------------
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Return a copy of the cached frame, or None on a miss."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self._count("memory_hits")
+            return self._memory[key][0].copy()
+
+        path = self._path(key)
+        if path.exists():
+            df = pd.read_parquet(path)
+            path.touch()  # mtime doubles as the disk LRU clock
+            self._remember(key, df)
+            self._count("disk_hits")
+            return df.copy()
+
+        self._count("misses")
+        return None
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        path = self._path(key)
+        # unique temp name: other processes may be writing the same key
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as tmp:
+            pass
+        try:
+            df.to_parquet(tmp.name, index=False)
+            os.replace(tmp.name, path)
+        except BaseException:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+
+        self._remember(key, df.copy())
+        self._evict_disk(keep=key)
+
+    def get_or_load(self, key: str, loader) -> pd.DataFrame:
+        df = self.get(key)
+        if df is None:
+            df = loader()
+            self.put(key, df)
+        return df
+
+    def clear(self) -> None:
+        self._memory.clear()
+        self._memory_bytes = 0
+        for path in self.directory.glob("*.parquet"):
+            path.unlink(missing_ok=True)
+        self._unflushed = dict.fromkeys(self._unflushed, 0)
+        (self.directory / self.STATS_FILE).unlink(missing_ok=True)
+
+    # ---------------------------------------
+    # Eviction
+    # ---------------------------------------
+    def _remember(self, key: str, df: pd.DataFrame) -> None:
+        nbytes = int(df.memory_usage(deep=True).sum())
+        if nbytes > self.max_memory_bytes:
+            return
+
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        self._memory[key] = (df, nbytes)
+        self._memory_bytes += nbytes
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+
+    def _evict_disk(self, keep: str) -> None:
+        files = [(p, p.stat()) for p in self.directory.glob("*.parquet")]
+        total = sum(st.st_size for _, st in files)
+
+        for path, st in sorted(files, key=lambda f: f[1].st_mtime):
+            if total <= self.max_disk_bytes:
+                break
+            if path.stem == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+            self._count("evictions")
+            self._memory.pop(path.stem, None)
+        self._memory_bytes = sum(n for _, n in self._memory.values())
+
+    # ---------------------------------------
+    # Stats
+    # ---------------------------------------
+    def _count(self, name: str) -> None:
+        self._counters[name] += 1
+        self._unflushed[name] += 1
+        if time.monotonic() - self._flushed_at >= self.FLUSH_INTERVAL_S:
+            self.flush()
+
+    def flush(self) -> None:
+        """Add the counts since the last flush to stats.json."""
+        self._flushed_at = time.monotonic()
+        if not any(self._unflushed.values()) or not self.directory.exists():
+            return
+
+        with (self.directory / self.STATS_LOCK).open("a") as lock:
+            # read-modify-write across processes
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            totals = self._read_stats_file()
+            for name, n in self._unflushed.items():
+                totals[name] = totals.get(name, 0) + n
+            with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as tmp:
+                json.dump(totals, tmp)
+            os.replace(tmp.name, self.directory / self.STATS_FILE)
+            fcntl.flock(lock, fcntl.LOCK_UN)
+        self._unflushed = dict.fromkeys(self._unflushed, 0)
+
+    def close(self) -> None:
+        self.flush()
+
+    def _read_stats_file(self) -> dict:
+        path = self.directory / self.STATS_FILE
+        try:
+            return json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @staticmethod
+    def _with_ratio(counters: dict) -> dict:
+        hits = counters.get("memory_hits", 0) + counters.get("disk_hits", 0)
+        lookups = hits + counters.get("misses", 0)
+        return {**counters, "hit_ratio": hits / lookups if lookups else 0.0}
+
+    def stats(self) -> dict:
+        """Counters for this process plus current memory / disk usage."""
+        return {
+            **self._with_ratio(self._counters),
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(list(self.directory.glob("*.parquet"))),
+            "disk_bytes": sum(p.stat().st_size for p in self.directory.glob("*.parquet")),
+        }
+
+    def lifetime_stats(self) -> dict:
+        """Counters accumulated across every process sharing `directory`."""
+        totals = self._read_stats_file()
+        for name, n in self._unflushed.items():
+            totals[name] = totals.get(name, 0) + n
+        return self._with_ratio(totals)
+
+
+@lru_cache(maxsize=1)
+def get_query_cache() -> QueryCache | None:
+    """Process-wide cache from DB settings; None when QUERY_CACHE_DIR is empty."""
+    settings = get_settings()
+    if not settings.query_cache_dir:
+        return None
+    return QueryCache(
+        directory=settings.query_cache_dir,
+        max_memory_bytes=settings.query_cache_memory_bytes,
+        max_disk_bytes=settings.query_cache_disk_bytes,
+    )
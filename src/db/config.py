@@ -11,6 +11,23 @@ class Settings:
     def __init__(self) -> None:
         self.database_url: str = os.getenv("DATABASE_URL", DEFAULT_DB_URL)
 
+        # repository result cache (empty dir disables it)
+        self.query_cache_dir: str = os.getenv("QUERY_CACHE_DIR", "data/cache/queries")
+        self.query_cache_memory_bytes: int = int(
+            os.getenv("QUERY_CACHE_MEMORY_BYTES", 256 * 1024**2)
+        )
+        self.query_cache_disk_bytes: int = int(os.getenv("QUERY_CACHE_DISK_BYTES", 1024**3))
+
+        # "postgres" or "duckdb" (reads the gold Parquet files in GOLD_DIR)
+        self.repository_backend: str = os.getenv("REPOSITORY_BACKEND", "postgres")
+        self.gold_dir: str = os.getenv("GOLD_DIR", "data/final")
+
+        # per-run JSON reports + Prometheus textfile (empty disables)
+        self.metrics_dir: str = os.getenv("METRICS_DIR", "data/metrics")
+
+        # unix socket of `insider_cli daemon start`; commands are forwarded to it while it runs
+        self.cli_socket: str = os.getenv("CLI_SOCKET", "data/cli.sock")
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -1,40 +1,71 @@
 # db/db.py
+from functools import lru_cache
+
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from .config import get_settings
 from .models import Base
 
-settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
-    future=True,
-    pool_pre_ping=True,
-)
+# The engine is built on first use, not at import: commands that never
+# touch the DB (--help, API fetches) skip the dialect / pool setup, and
+# DATABASE_URL is read when it is needed.
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    return create_engine(
+        get_settings().database_url,
+        future=True,
+        pool_pre_ping=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> sessionmaker:
+    return sessionmaker(
+        bind=get_engine(),
+        autoflush=False,
+        autocommit=False,
+        future=True,
+    )
+
 
-SessionLocal = sessionmaker(
-    bind=engine,
-    autoflush=False,
-    autocommit=False,
-    future=True,
-)
+def __getattr__(name: str):
+    # `from db.db import engine` / `SessionLocal` keep working, built on first access
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def init_db() -> None:
+def init_db(bind=None) -> None:
     """
     Create all tables and supporting ETL structures.
 
     Intended for local dev / initial setup.
     In production, prefer Alembic migrations.
+
+    bind: engine to initialise (defaults to the app engine).
     """
-    Base.metadata.create_all(bind=engine)
+    bind = bind or get_engine()
+
+    # trigram ops for the reporter name index
+    with bind.connect() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        conn.commit()
+
+    Base.metadata.create_all(bind=bind)
 
     create_state = """
     CREATE TABLE IF NOT EXISTS etl_state (
         table_name TEXT PRIMARY KEY,
-        last_updated TIMESTAMPTZ
+        last_updated TIMESTAMPTZ,
+        high_water TIMESTAMPTZ
     );
+    -- high_water: newest source timestamp loaded (e.g. max filed_at)
+    ALTER TABLE etl_state ADD COLUMN IF NOT EXISTS high_water TIMESTAMPTZ;
     """
 
     view_sql = """
@@ -54,7 +85,7 @@ def init_db() -> None:
     ON t.issuer_ticker = m.issuer_ticker;
     """
 
-    with engine.connect() as conn:
+    with bind.connect() as conn:
         conn.execute(text(create_state))
         conn.execute(text(view_sql))
         conn.commit()
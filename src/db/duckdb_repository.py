@@ -0,0 +1,214 @@
+# db/duckdb_repository.py
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from utils.logger import Logger
+from writers.final_writer import manifest_files
+from .cache import QueryCache
+from .repository import (
+    DAILY_FLOW_COLUMNS,
+    ROLLUP_COLUMNS,
+    TRANSACTION_COLUMNS,
+    InsiderRepository,
+    apply_read_dtypes,
+)
+
+# names FinalWriter.save() is called with by the ETL tasks
+TRANSACTIONS_DATASET = "insider_transactions_final"  # partitioned, with manifest
+TRANSACTIONS_GLOB = "insider_transactions_final*.parquet"  # older flat files
+MAPPING_GLOB = "exchange_mapping_final*.parquet"
+
+# psycopg2 pyformat → DuckDB named parameters
+_PYFORMAT = re.compile(r"%\((\w+)\)s")
+
+
+def _without_id(columns: list[str]) -> list[str]:
+    # surrogate keys only exist in Postgres
+    return [c for c in columns if c != "id"]
+
+
+class DuckDBRepository(InsiderRepository):
+    """
+    InsiderRepository over the gold Parquet layer (FinalWriter output)
+    with an embedded DuckDB instead of Postgres.
+
+    Exposes the same sources as views, so every get_* / iter_* method,
+    the rollup join and analytics.sql_analysis run unchanged:
+      - insider_transactions: flat transactions files plus the partitioned
+                              dataset, pruned per query via its manifest
+      - exchange_mapping:     newest mapping snapshot
+      - insider_daily_flow:   aggregated on the fly
+      - insider_rollup:       transactions LEFT JOIN mapping
+
+    DuckDB pushes the projected columns and WHERE predicates into the
+    Parquet scan, so only the needed columns / row groups are read.
+
+    OHLC prices are not part of the gold layer: those calls go to a
+    Postgres InsiderRepository, opened on first use.
+    """
+
+    SOURCE_COLUMNS = {
+        "insider_transactions": _without_id(TRANSACTION_COLUMNS),
+        "insider_daily_flow": _without_id(DAILY_FLOW_COLUMNS),
+        "insider_rollup": _without_id(ROLLUP_COLUMNS),
+    }
+
+    def __init__(self, directory: str | Path = "data/final", cache: QueryCache | None = None):
+        import duckdb  # optional dependency, only needed for this backend
+
+        self.directory = Path(directory)
+        self.cache = cache
+        self.engine = None
+        self._postgres: InsiderRepository | None = None
+        self.log = Logger(self.__class__.__name__)
+
+        self.con = duckdb.connect()
+        # period_of_report bounds / day truncation are UTC everywhere else
+        self.con.execute("SET TimeZone = 'UTC'")
+        self.refresh()
+
+    # ---------------------------------------
+    # Views over the gold files
+    # ---------------------------------------
+    def _gold_files(self, pattern: str) -> list[Path]:
+        return sorted(self.directory.glob(pattern), key=lambda p: p.stat().st_mtime)
+
+    def _transaction_files(self, start=None, end=None) -> list[Path]:
+        dataset = manifest_files(self.directory / TRANSACTIONS_DATASET, start, end)
+        return self._gold_files(TRANSACTIONS_GLOB) + dataset
+
+    @staticmethod
+    def _literal(path: Path) -> str:
+        return "'" + str(path).replace("'", "''") + "'"
+
+    def _files_sql(self, files: list[Path]) -> str:
+        listed = ", ".join(self._literal(p) for p in files)
+        return f"read_parquet([{listed}], union_by_name = true, hive_partitioning = false)"
+
+    def refresh(self) -> None:
+        """(Re)create the views over the current gold files."""
+        self._views_watermark = self._watermark()
+
+        self._all_files = self._transaction_files()
+        mappings = self._gold_files(MAPPING_GLOB)
+        for pattern, found in [(TRANSACTIONS_GLOB, self._all_files), (MAPPING_GLOB, mappings)]:
+            if not found:
+                raise FileNotFoundError(
+                    f"[DuckDBRepository] No gold files matching '{pattern}' in {self.directory}"
+                )
+
+        self._scoped_files = None
+        self._scope()
+        # each mapping file is a full snapshot → only the newest counts
+        self.con.execute(f"""
+            CREATE OR REPLACE VIEW exchange_mapping AS
+            SELECT * FROM read_parquet({self._literal(mappings[-1])})
+        """)
+        self.con.execute("""
+            CREATE OR REPLACE VIEW insider_daily_flow AS
+            SELECT
+                issuer_ticker,
+                date_trunc('day', period_of_report) AS period_of_report,
+                acquired_disposed,
+                code,
+                COALESCE(SUM(total_value), 0) AS total_value,
+                COALESCE(SUM(shares), 0) AS shares,
+                COUNT(*) AS n_transactions
+            FROM insider_transactions
+            WHERE period_of_report IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+        """)
+        self.con.execute("""
+            CREATE OR REPLACE VIEW insider_rollup AS
+            SELECT
+                t.*,
+                m.name AS ticker_name,
+                m.exchange,
+                m.is_delisted,
+                m.category,
+                m.sector,
+                m.industry,
+                m.sic_sector,
+                m.sic_industry
+            FROM insider_transactions t
+            LEFT JOIN exchange_mapping m
+            ON t.issuer_ticker = m.issuer_ticker
+        """)
+
+    def _scope(self, params: dict | None = None) -> None:
+        """
+        Point insider_transactions at the files a query's start / end can
+        touch. The other views reference it by name and follow along.
+        """
+        params = params or {}
+        files = self._transaction_files(params.get("start"), params.get("end"))
+
+        if files == self._scoped_files:
+            return
+        self._scoped_files = files
+
+        if files:
+            source = f"SELECT * FROM {self._files_sql(files)}"
+        else:
+            # nothing in range: keep the columns, return no rows
+            source = f"SELECT * FROM {self._files_sql(self._all_files[:1])} LIMIT 0"
+        self.con.execute(f"CREATE OR REPLACE VIEW insider_transactions AS {source}")
+
+    # ---------------------------------------
+    # Backend hooks
+    # ---------------------------------------
+    @staticmethod
+    def _to_duckdb(sql: str) -> str:
+        return _PYFORMAT.sub(r"$\1", sql)
+
+    @staticmethod
+    def _to_ns(df: pd.DataFrame) -> pd.DataFrame:
+        # DuckDB returns microsecond timestamps; Postgres reads come back as ns
+        for col in df.select_dtypes(include=["datetimetz"]).columns:
+            df[col] = df[col].astype("datetime64[ns, UTC]")
+        return df
+
+    def _refresh_if_changed(self) -> None:
+        if self._watermark() != self._views_watermark:
+            self.refresh()
+
+    def _fetch(self, sql: str, params: dict | None = None) -> pd.DataFrame:
+        self._refresh_if_changed()
+        self._scope(params)
+        df = self.con.execute(self._to_duckdb(sql), params or {}).df()
+        return apply_read_dtypes(self._to_ns(df))
+
+    def _read_chunks(self, sql: str, params: dict, chunksize: int):
+        self._refresh_if_changed()
+        self._scope(params)
+        # own cursor, so other reads don't invalidate the open result
+        with self.con.cursor() as cur:
+            reader = cur.execute(self._to_duckdb(sql), params or {}).to_arrow_reader(chunksize)
+            for batch in reader:
+                yield apply_read_dtypes(self._to_ns(batch.to_pandas()))
+
+    def _watermark(self):
+        # newest gold file plus file count: changes whenever the ETL writes
+        # or compacts (partition files live in subdirectories)
+        files = list(self.directory.rglob("*.parquet"))
+        return ["duckdb", len(files), max((p.stat().st_mtime_ns for p in files), default=0)]
+
+    # ---------------------------------------
+    # Not in the gold layer → Postgres
+    # ---------------------------------------
+    @property
+    def postgres(self) -> InsiderRepository:
+        if self._postgres is None:
+            self._postgres = InsiderRepository(cache=self.cache)
+        return self._postgres
+
+    def get_ohlc(self, ticker, start=None, end=None):
+        return self.postgres.get_ohlc(ticker, start, end)
+
+    def ohlc_exists_in_range(self, ticker: str, start: str, end: str) -> bool:
+        return self.postgres.ohlc_exists_in_range(ticker, start, end)
+
+    def insert_ohlc_dataframe(self, df: pd.DataFrame):
+        return self.postgres.insert_ohlc_dataframe(df)
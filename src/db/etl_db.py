@@ -1,11 +1,32 @@
 # db/etl_db.py
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
 
-from sqlalchemy import text
+from sqlalchemy import insert, text
 from sqlalchemy.orm import Session
 
 from utils.logger import Logger
-from .db import engine
+from .db import get_engine
+from .models import InsiderTransaction
+
+# insider_transactions → insider_daily_flow aggregate, optionally narrowed
+# by an extra AND-ed predicate (used for partial recomputes)
+DAILY_FLOW_INSERT = """
+    INSERT INTO insider_daily_flow (
+        issuer_ticker, period_of_report, acquired_disposed, code,
+        total_value, shares, n_transactions
+    )
+    SELECT
+        issuer_ticker,
+        date_trunc('day', period_of_report, 'UTC'),
+        acquired_disposed,
+        code,
+        COALESCE(SUM(total_value), 0),
+        COALESCE(SUM(shares), 0),
+        COUNT(*)
+    FROM insider_transactions
+    WHERE period_of_report IS NOT NULL{where}
+    GROUP BY 1, 2, 3, 4
+"""
 
 
 class ETLDatabase:
@@ -15,12 +36,16 @@ class ETLDatabase:
     Provides:
       - last_updated(table_name)
       - set_last_updated(table_name)
+      - high_water(key) / set_high_water(key, ts)
+      - unmarked_transactions_high_water()
       - upsert(model, rows, key)
       - insert_many(model, rows)
+      - rebuild_daily_flow()
+      - replace_transactions(df, start, end, accessions)
     """
 
     def __init__(self):
-        self.engine = engine
+        self.engine = get_engine()
         self.log = Logger(self.__class__.__name__)
 
     # -----------------------------------------------------------
@@ -61,6 +86,50 @@ class ETLDatabase:
 
         self.log.info(f"[ETL_STATE] Updated last_updated for '{table_name}' → {ts}")
 
+    def high_water(self, key: str):
+        """Newest source timestamp loaded under `key` (None if never set)."""
+        sql = text("SELECT high_water FROM etl_state WHERE table_name = :t")
+
+        with self._session() as session:
+            row = session.execute(sql, {"t": key}).fetchone()
+            return row[0] if row else None
+
+    def unmarked_transactions_high_water(self):
+        """
+        Newest filed_at loaded by a deployment that predates per-query
+        high-water marks (falling back to its last run), or None once any
+        insider_transactions[...] mark exists.
+        """
+        sql = text(r"""
+            SELECT COALESCE(
+                (SELECT max(filed_at) FROM insider_transactions),
+                (SELECT last_updated FROM etl_state WHERE table_name = 'insider_transactions')
+            )
+            WHERE NOT EXISTS (
+                SELECT 1 FROM etl_state
+                WHERE table_name LIKE 'insider\_transactions[%' AND high_water IS NOT NULL
+            )
+        """)
+
+        with self._session() as session:
+            row = session.execute(sql).fetchone()
+            return row[0] if row else None
+
+    def set_high_water(self, key: str, ts: datetime):
+        """Advance the high-water mark of `key` to `ts`; it never moves back."""
+        sql = text("""
+            INSERT INTO etl_state (table_name, last_updated, high_water)
+            VALUES (:t, :now, :ts)
+            ON CONFLICT (table_name)
+            DO UPDATE SET high_water = GREATEST(etl_state.high_water, EXCLUDED.high_water)
+        """)
+
+        with self._session() as session:
+            session.execute(sql, {"t": key, "now": datetime.now(UTC), "ts": ts})
+            session.commit()
+
+        self.log.info(f"[ETL_STATE] High-water mark for '{key}' → {ts}")
+
     # -----------------------------------------------------------
     # Generic UPSERT
     # -----------------------------------------------------------
@@ -106,3 +175,83 @@ class ETLDatabase:
         with self._session() as session:
             session.bulk_save_objects(objects)
             session.commit()
+
+    # -----------------------------------------------------------
+    # Summary tables
+    # -----------------------------------------------------------
+    def rebuild_daily_flow(self):
+        """
+        Recompute insider_daily_flow from insider_transactions.
+
+        The loader maintains the table incrementally; this is the
+        full resync for backfills or after manual edits.
+        """
+        sql = text(DAILY_FLOW_INSERT.format(where=""))
+
+        with self._session() as session:
+            session.execute(text("TRUNCATE insider_daily_flow"))
+            result = session.execute(sql)
+            session.commit()
+
+        self.log.info(f"[DAILY_FLOW] Rebuilt insider_daily_flow → {result.rowcount} rows")
+        self.set_last_updated("insider_daily_flow")
+
+    # -----------------------------------------------------------
+    # Replays
+    # -----------------------------------------------------------
+    def replace_transactions(self, df, start, end, accessions) -> dict:
+        """
+        Swap the insider_transactions rows of `accessions` filed in
+        [start, end) for `df` and recompute the insider_daily_flow days
+        either side touches.
+
+        Rows of other filings in the range (loaded but never archived) are
+        left alone. Runs as one transaction: readers see the old rows until
+        the commit, then the new ones.
+        """
+        rows = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+        new_days = {
+            ts.floor("D").to_pydatetime()
+            for ts in df["period_of_report"].dropna()
+        }
+
+        with self._session() as session:
+            result = session.execute(
+                text("""
+                    DELETE FROM insider_transactions
+                    WHERE filed_at >= :start AND filed_at < :end
+                      AND accession_no = ANY(:accessions)
+                    RETURNING date_trunc('day', period_of_report, 'UTC')
+                """),
+                {"start": start, "end": end, "accessions": sorted(accessions)},
+            )
+            returned = result.fetchall()
+            old_days = {r[0] for r in returned if r[0] is not None}
+            deleted = len(returned)
+
+            if rows:
+                session.execute(insert(InsiderTransaction), rows)
+
+            days = sorted(old_days | new_days)
+            if days:
+                params = {"days": days, "lo": days[0], "hi": days[-1] + timedelta(days=1)}
+                # bounds let the period_of_report index narrow the scan first
+                session.execute(
+                    text("DELETE FROM insider_daily_flow WHERE period_of_report = ANY(:days)"),
+                    params,
+                )
+                session.execute(
+                    text(DAILY_FLOW_INSERT.format(where="""
+                        AND period_of_report >= :lo AND period_of_report < :hi
+                        AND date_trunc('day', period_of_report, 'UTC') = ANY(:days)
+                    """)),
+                    params,
+                )
+            session.commit()
+
+        self.set_last_updated("insider_transactions")
+        self.set_last_updated("insider_daily_flow")
+
+        stats = {"deleted": deleted, "inserted": len(rows), "flow_days": len(days)}
+        self.log.info(f"[REPLACE] insider_transactions filed {start} → {end}: {stats}")
+        return stats
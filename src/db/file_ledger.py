@@ -0,0 +1,116 @@
+# db/file_ledger.py
+import hashlib
+from datetime import datetime, UTC
+from pathlib import Path
+
+from sqlalchemy import text
+
+COLUMNS = "sha256, name, path, size_bytes, mtime_ns, status, filings, rows_loaded, error, processed_at"
+
+GET_SQL = f"""
+    SELECT {COLUMNS}
+    FROM processed_raw_files
+    WHERE sha256 = :sha256
+"""
+
+GET_BY_STAT_SQL = f"""
+    SELECT {COLUMNS}
+    FROM processed_raw_files
+    WHERE path = :path AND size_bytes = :size_bytes AND mtime_ns = :mtime_ns
+    ORDER BY processed_at DESC
+    LIMIT 1
+"""
+
+RECORD_SQL = """
+    INSERT INTO processed_raw_files
+        (sha256, name, path, size_bytes, mtime_ns, status, filings, rows_loaded, error, processed_at)
+    VALUES (:sha256, :name, :path, :size_bytes, :mtime_ns, :status, :filings, :rows_loaded, :error, :processed_at)
+    ON CONFLICT (sha256) DO UPDATE SET
+        name = EXCLUDED.name,
+        path = EXCLUDED.path,
+        size_bytes = EXCLUDED.size_bytes,
+        mtime_ns = EXCLUDED.mtime_ns,
+        status = EXCLUDED.status,
+        filings = EXCLUDED.filings,
+        rows_loaded = EXCLUDED.rows_loaded,
+        error = EXCLUDED.error,
+        processed_at = EXCLUDED.processed_at
+"""
+
+SET_STAT_SQL = """
+    UPDATE processed_raw_files
+    SET path = :path, mtime_ns = :mtime_ns
+    WHERE sha256 = :sha256
+"""
+
+
+def file_sha256(path: str | Path, chunk_size: int = 1024**2) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProcessedFileLedger:
+    """
+    Raw files already run through the pipeline, in `processed_raw_files`.
+
+    Keyed by content hash: a primary-key lookup tells whether a file was
+    loaded, whatever it is called now, and an edited file is new. Each
+    entry also keeps the path / size / mtime_ns it was last seen with, so
+    a file that has not changed since is found without reading it.
+    """
+
+    LOADED = "loaded"
+    FAILED = "failed"
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, sha256: str) -> dict | None:
+        with self.db.engine.connect() as conn:
+            row = conn.execute(text(GET_SQL), {"sha256": sha256}).mappings().first()
+        return dict(row) if row else None
+
+    def get_by_stat(self, path: str, size_bytes: int, mtime_ns: int) -> dict | None:
+        """Entry of the file last seen at `path` with this size and mtime."""
+        params = {"path": path, "size_bytes": size_bytes, "mtime_ns": mtime_ns}
+        with self.db.engine.connect() as conn:
+            row = conn.execute(text(GET_BY_STAT_SQL), params).mappings().first()
+        return dict(row) if row else None
+
+    def set_stat(self, sha256: str, path: str, mtime_ns: int) -> None:
+        """Point an entry at the copy of the file seen at `path`."""
+        with self.db.engine.begin() as conn:
+            conn.execute(text(SET_STAT_SQL), {"sha256": sha256, "path": path, "mtime_ns": mtime_ns})
+
+    def is_loaded(self, sha256: str) -> bool:
+        entry = self.get(sha256)
+        return entry is not None and entry["status"] == self.LOADED
+
+    def record(
+        self,
+        sha256: str,
+        name: str,
+        size_bytes: int,
+        status: str,
+        filings: int | None = None,
+        rows_loaded: int | None = None,
+        error: str | None = None,
+        path: str | None = None,
+        mtime_ns: int | None = None,
+    ) -> None:
+        with self.db.engine.begin() as conn:
+            conn.execute(text(RECORD_SQL), {
+                "sha256": sha256,
+                "name": name,
+                "path": path,
+                "size_bytes": size_bytes,
+                "mtime_ns": mtime_ns,
+                "status": status,
+                "filings": filings,
+                "rows_loaded": rows_loaded,
+                "error": error[:2000] if error else None,
+                "processed_at": datetime.now(UTC),
+            })
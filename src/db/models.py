@@ -8,6 +8,7 @@ from sqlalchemy import (
     Numeric,
     BigInteger,
     DateTime,
+    Index,
     UniqueConstraint,
 )
 from sqlalchemy.orm import declarative_base
@@ -57,15 +58,46 @@ class InsiderTransaction(Base):
     #     ),
     # )
 
+    # Indexes follow InsiderRepository access patterns (see migration c7e2f1a9d804):
+    #   - ticker + period range        → composite, covers the plot columns
+    #   - period range only            → covering, index-only scans for plots
+    #   - cik / reporter_cik + period  → composite
+    #   - reporter name ILIKE tokens   → trigram GIN (needs pg_trgm)
+    #   - filed_at (append-ordered)    → BRIN
+    #   - accession_no = ANY(...)      → btree, pre-transform skip (migration e41b9c2d7a6f)
+    __table_args__ = (
+        Index(
+            "ix_insider_transactions_ticker_period",
+            "issuer_ticker",
+            "period_of_report",
+            postgresql_include=["acquired_disposed", "code", "reporter", "total_value"],
+        ),
+        Index(
+            "ix_insider_transactions_period_cover",
+            "period_of_report",
+            postgresql_include=["issuer_ticker", "acquired_disposed", "code", "reporter", "total_value"],
+        ),
+        Index("ix_insider_transactions_cik_period", "issuer_cik", "period_of_report"),
+        Index("ix_insider_transactions_reporter_cik_period", "reporter_cik", "period_of_report"),
+        Index(
+            "ix_insider_transactions_reporter_trgm",
+            "reporter",
+            postgresql_using="gin",
+            postgresql_ops={"reporter": "gin_trgm_ops"},
+        ),
+        Index("ix_insider_transactions_filed_at_brin", "filed_at", postgresql_using="brin"),
+        Index("ix_insider_transactions_accession_no", "accession_no"),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
 
     accession_no= Column(String)
-    filed_at = Column(DateTime(timezone=True), index=True)
-    period_of_report = Column(DateTime(timezone=True), index=True)
+    filed_at = Column(DateTime(timezone=True))
+    period_of_report = Column(DateTime(timezone=True))
     document_type = Column(String)
 
-    issuer_ticker = Column(String, index=True)
-    issuer_cik = Column(String, index=True)
+    issuer_ticker = Column(String)
+    issuer_cik = Column(String)
     issuer_name = Column(String)
 
     reporter = Column(String)
@@ -98,13 +130,14 @@ class ExchangeMapping(Base):
     __tablename__ = "exchange_mapping"
 
     __table_args__ = (
+        # also serves the insider_rollup join on issuer_ticker
         UniqueConstraint("issuer_ticker", name="uq_exchange_mapping_issuer_ticker"),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
     name = Column(String)
-    issuer_ticker = Column(String, index=True)
+    issuer_ticker = Column(String)
     cik = Column(String, index=True)
     exchange = Column(String)
     is_delisted = Column(Boolean)
@@ -115,3 +148,104 @@ class ExchangeMapping(Base):
 
     sic_sector = Column(String)
     sic_industry = Column(String)
+
+
+# -----------------------------
+# Daily Ticker Flow (summary)
+# -----------------------------
+class InsiderDailyFlow(Base):
+    """
+    Pre-aggregated insider flow keyed by (ticker, day, side, code).
+    Maintained incrementally by InsiderTransactionsLoader.
+
+    Column names mirror insider_transactions so analytics functions
+    work on either frame. period_of_report is truncated to the day.
+    """
+    __tablename__ = "insider_daily_flow"
+
+    __table_args__ = (
+        UniqueConstraint(
+            "issuer_ticker",
+            "period_of_report",
+            "acquired_disposed",
+            "code",
+            name="uq_insider_daily_flow_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    issuer_ticker = Column(String)
+    period_of_report = Column(DateTime(timezone=True), index=True)
+    acquired_disposed = Column(String)
+    code = Column(String)
+
+    total_value = Column(Numeric)
+    shares = Column(Numeric)
+    n_transactions = Column(Integer)
+
+
+# -----------------------------
+# Backfill work queue
+# -----------------------------
+class BackfillShard(Base):
+    """
+    One date window of a backfill job (see db.backfill_queue).
+
+    status: pending → running → done | failed. Workers on any node claim
+    rows with FOR UPDATE SKIP LOCKED; a running shard whose claim is older
+    than the lease is treated as abandoned and handed out again.
+    """
+    __tablename__ = "backfill_shards"
+
+    __table_args__ = (
+        UniqueConstraint("job", "start_date", name="uq_backfill_shards_job_start"),
+        Index("ix_backfill_shards_job_status", "job", "status", "start_date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    job = Column(String, nullable=False)
+    query = Column(String, nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+
+    status = Column(String, nullable=False, default="pending", server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    worker = Column(String)
+    claimed_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    filings = Column(Integer)
+    rows_loaded = Column(Integer)
+    error = Column(String)
+
+
+# -----------------------------
+# Raw file ledger
+# -----------------------------
+class ProcessedRawFile(Base):
+    """
+    One raw JSON file that went through build-dataset (see db.file_ledger),
+    keyed by content hash so a renamed copy counts as the same file.
+    (path, size_bytes, mtime_ns) finds unchanged files without hashing.
+    """
+    __tablename__ = "processed_raw_files"
+
+    __table_args__ = (
+        Index("ix_processed_raw_files_stat", "path", "size_bytes", "mtime_ns"),
+    )
+
+    sha256 = Column(String(64), primary_key=True)
+
+    name = Column(String, nullable=False)
+    path = Column(String)
+    size_bytes = Column(BigInteger)
+    mtime_ns = Column(BigInteger)
+    status = Column(String, nullable=False)  # loaded | failed
+
+    filings = Column(Integer)
+    rows_loaded = Column(Integer)
+    error = Column(String)
+    processed_at = Column(DateTime(timezone=True), nullable=False)
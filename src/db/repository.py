@@ -1,11 +1,184 @@
 # db/repository.py
-from sqlalchemy import text
+from collections.abc import Sequence
+
+from sqlalchemy import Boolean, Numeric, String, text
 from sqlalchemy.orm import Session
+import numpy as np
 import pandas as pd
 
 from utils.logger import Logger
-from .db import engine
-from .models import OHLC
+from utils.utils import name_tokens
+from .cache import QueryCache, get_query_cache
+from .config import get_settings
+from .db import get_engine
+from .models import OHLC, Base, InsiderDailyFlow, InsiderTransaction
+
+TRANSACTION_COLUMNS = [c.name for c in InsiderTransaction.__table__.columns]
+DAILY_FLOW_COLUMNS = [c.name for c in InsiderDailyFlow.__table__.columns]
+
+# exchange_mapping columns the insider_rollup VIEW adds on top of t.*
+ROLLUP_COLUMNS = TRANSACTION_COLUMNS + [
+    "ticker_name",
+    "exchange",
+    "is_delisted",
+    "category",
+    "sector",
+    "industry",
+    "sic_sector",
+    "sic_industry",
+]
+
+# ---------------------------------------
+# Read dtypes
+# ---------------------------------------
+# Arrow-backed strings with NaN as missing value (pandas' future default
+# "str"), so comparisons stay plain numpy bool masks in analytics.
+STRING_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+
+
+def _dtype_for(sa_type):
+    if isinstance(sa_type, Numeric):
+        return "float64"
+    if isinstance(sa_type, Boolean):
+        return "boolean"
+    if isinstance(sa_type, String):
+        return STRING_DTYPE
+    return None
+
+
+# column name → pandas dtype, derived from every model table
+READ_DTYPES = {
+    col.name: _dtype_for(col.type)
+    for table in Base.metadata.sorted_tables
+    for col in table.columns
+    if _dtype_for(col.type) is not None
+}
+# insider_rollup renames exchange_mapping.name
+READ_DTYPES["ticker_name"] = STRING_DTYPE
+
+# Numeric columns are cast server-side so they arrive as floats, not Decimal
+FLOAT_COLUMNS = {name for name, dtype in READ_DTYPES.items() if dtype == "float64"}
+
+
+def apply_read_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a freshly read frame to compact dtypes (see READ_DTYPES)."""
+    dtypes = {c: READ_DTYPES[c] for c in df.columns if c in READ_DTYPES}
+    return df.astype(dtypes) if dtypes else df
+
+
+# newest load across tables: part of every cache key
+WATERMARK_SQL = "SELECT MAX(last_updated) FROM etl_state"
+
+OHLC_EXISTS_SQL = """
+    SELECT 1
+    FROM ohlc_prices
+    WHERE ticker = :ticker
+      AND date >= :start
+      AND date <= :end
+    LIMIT 1
+"""
+
+# rows per DataFrame chunk for the iter_* streaming reads
+DEFAULT_CHUNKSIZE = 50_000
+
+# filter keyword → column it compiles against
+FILTER_COLUMNS = {
+    "ticker": "issuer_ticker",
+    "cik": "issuer_cik",
+    "code": "code",
+    "side": "acquired_disposed",
+}
+
+
+def build_filters(
+    source: str,
+    available: list[str],
+    start=None,
+    end=None,
+    reporter: str | None = None,
+    **filters,
+) -> tuple[list[str], dict]:
+    """
+    Compile WHERE clauses (AND-ed by the caller) and their bind params.
+
+    - start / end: inclusive period_of_report bounds
+    - reporter: every name token must appear (ILIKE prefilter)
+    - ticker / cik / code / side: scalar → `=`, sequence → `= ANY(...)`
+
+    Values are always bound as parameters (psycopg2 pyformat).
+    """
+    clauses = []
+    params = {}
+
+    if start:
+        clauses.append("period_of_report >= %(start)s")
+        params["start"] = start
+    if end:
+        clauses.append("period_of_report <= %(end)s")
+        params["end"] = end
+
+    for key, value in filters.items():
+        if key not in FILTER_COLUMNS:
+            raise TypeError(f"[InsiderRepository] Unknown filter '{key}'")
+        if value is None:
+            continue
+        col = FILTER_COLUMNS[key]
+        if col not in available:
+            raise ValueError(f"[InsiderRepository] {source} has no column '{col}' to filter on")
+
+        if isinstance(value, Sequence) and not isinstance(value, str):
+            clauses.append(f'"{col}" = ANY(%({key})s)')
+            params[key] = list(value)
+        else:
+            clauses.append(f'"{col}" = %({key})s')
+            params[key] = value
+
+    if reporter:
+        if "reporter" not in available:
+            raise ValueError(f"[InsiderRepository] {source} has no column 'reporter' to filter on")
+        for i, token in enumerate(sorted(name_tokens(reporter))):
+            clauses.append(f"reporter ILIKE %(reporter_{i})s")
+            params[f"reporter_{i}"] = f"%{token}%"
+
+    return clauses, params
+
+
+def _build_select(
+    source: str,
+    available: list[str],
+    columns: list[str] | None = None,
+    start=None,
+    end=None,
+    reporter: str | None = None,
+    **filters,
+) -> tuple[str, dict]:
+    """
+    Compile a projected, filtered SELECT against `source`.
+
+    - columns: subset of `available` to return (None → all)
+    - filters: see build_filters
+
+    Column names are checked against `available` and quoted. Numeric
+    columns are cast to float8 so the driver never builds Decimal objects.
+    """
+    columns = list(columns) if columns else list(available)
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise ValueError(f"[InsiderRepository] Unknown columns for {source}: {unknown}")
+
+    clauses, params = build_filters(source, available, start, end, reporter, **filters)
+
+    select_list = ", ".join(
+        f'"{c}"::float8 AS "{c}"' if c in FLOAT_COLUMNS else f'"{c}"'
+        for c in columns
+    )
+    sql = f"SELECT {select_list} FROM {source}"
+
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+
+    sql += " ORDER BY period_of_report"
+    return sql, params
 
 
 class InsiderRepository:
@@ -14,37 +187,151 @@ class InsiderRepository:
     All DB reads should go through this class.
 
     Returns pandas DataFrames with consistent snake_case columns.
+
+    Read methods take `columns=[...]` to project and optional
+    ticker / cik / reporter / code / side filters that run in SQL.
+
+    iter_* variants stream the same queries through a server-side
+    cursor and yield DataFrame chunks of `chunksize` rows.
+
+    Frames use compact dtypes: Arrow-backed strings, float64 numerics
+    and nullable booleans (see READ_DTYPES).
+
+    With a `cache` (see db.cache.QueryCache), get_* reads of ETL-managed
+    tables are served from it while etl_state has not moved on.
     """
 
-    def __init__(self):
-        self.engine = engine
+    # columns each source exposes (backends may expose fewer)
+    SOURCE_COLUMNS = {
+        "insider_transactions": TRANSACTION_COLUMNS,
+        "insider_daily_flow": DAILY_FLOW_COLUMNS,
+        "insider_rollup": ROLLUP_COLUMNS,
+    }
+
+    def __init__(self, cache: QueryCache | None = None):
+        self.engine = get_engine()
+        self.cache = cache
         self.log = Logger(self.__class__.__name__)
 
+    # ---------------------------------------
+    # Streaming helper
+    # ---------------------------------------
+    def _read_chunks(self, sql: str, params: dict, chunksize: int):
+        """
+        Yield DataFrames of at most `chunksize` rows.
+
+        stream_results makes psycopg2 use a named (server-side) cursor,
+        so only one chunk is buffered client-side at a time.
+        """
+        with self.engine.connect().execution_options(
+            stream_results=True,
+            max_row_buffer=chunksize,
+        ) as conn:
+            for chunk in pd.read_sql(sql, conn, params=params, chunksize=chunksize):
+                yield apply_read_dtypes(chunk)
+
+    def _fetch(self, sql: str, params: dict | None = None) -> pd.DataFrame:
+        return apply_read_dtypes(pd.read_sql(sql, self.engine, params=params))
+
+    def _read(self, sql: str, params: dict | None = None, cached: bool = True) -> pd.DataFrame:
+        if self.cache is None or not cached:
+            return self._fetch(sql, params)
+
+        key = self.cache.make_key(sql, params, self._watermark())
+        df = self.cache.get_or_load(key, lambda: self._fetch(sql, params))
+        # Parquet round-trips Arrow strings as object
+        return apply_read_dtypes(df)
+
+    def query(self, sql: str, params: dict | None = None) -> pd.DataFrame:
+        """
+        Run an ad-hoc read-only SELECT (e.g. analytics.sql_analysis
+        aggregates) through the same dtype and cache path as get_*.
+        """
+        return self._read(sql, params)
+
+    def _watermark(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text(WATERMARK_SQL)).scalar()
+
     # ---------------------------------------
     # Raw Insider Transactions
     # ---------------------------------------
-    def get_transactions(self, start=None, end=None):
-        sql = "SELECT * FROM insider_transactions"
-        filters = []
+    def get_transactions(
+        self,
+        start=None,
+        end=None,
+        columns=None,
+        ticker=None,
+        cik=None,
+        reporter=None,
+        code=None,
+        side=None,
+    ):
+        sql, params = _build_select(
+            "insider_transactions",
+            self.SOURCE_COLUMNS["insider_transactions"],
+            columns,
+            start,
+            end,
+            reporter=reporter,
+            ticker=ticker,
+            cik=cik,
+            code=code,
+            side=side,
+        )
+        return self._read(sql, params)
 
-        if start:
-            filters.append("period_of_report >= %(start)s")
-        if end:
-            filters.append("period_of_report <= %(end)s")
+    def iter_transactions(self, start=None, end=None, chunksize=DEFAULT_CHUNKSIZE, **kwargs):
+        """Streaming get_transactions: yields DataFrame chunks."""
+        sql, params = _build_select(
+            "insider_transactions",
+            self.SOURCE_COLUMNS["insider_transactions"],
+            start=start,
+            end=end,
+            **kwargs,
+        )
+        return self._read_chunks(sql, params, chunksize)
 
-        if filters:
-            sql += " WHERE " + " AND ".join(filters)
+    # ---------------------------------------
+    # Pre-aggregated Daily Flow
+    # ---------------------------------------
+    def get_daily_flow(self, start=None, end=None, columns=None, ticker=None, code=None, side=None):
+        """
+        Query the `insider_daily_flow` summary table:
+        one row per (issuer_ticker, day, acquired_disposed, code).
 
-        sql += " ORDER BY period_of_report"
+        Columns match insider_transactions, so total_sec_acq_dis_day,
+        companies_bs_in_period and distribution_by_codes accept it as-is.
+        """
+        sql, params = _build_select(
+            "insider_daily_flow",
+            self.SOURCE_COLUMNS["insider_daily_flow"],
+            columns,
+            start,
+            end,
+            ticker=ticker,
+            code=code,
+            side=side,
+        )
+        return self._read(sql, params)
 
-        return pd.read_sql(sql, self.engine, params={"start": start, "end": end})
+    def iter_daily_flow(self, start=None, end=None, chunksize=DEFAULT_CHUNKSIZE, **kwargs):
+        """Streaming get_daily_flow: yields DataFrame chunks."""
+        sql, params = _build_select(
+            "insider_daily_flow",
+            self.SOURCE_COLUMNS["insider_daily_flow"],
+            start=start,
+            end=end,
+            **kwargs,
+        )
+        return self._read_chunks(sql, params, chunksize)
 
     # ---------------------------------------
     # Exchange Mapping Metadata
     # ---------------------------------------
     def get_mapping(self):
         sql = "SELECT * FROM exchange_mapping ORDER BY issuer_ticker"
-        return pd.read_sql(sql, self.engine)
+        return self._read(sql)
 
     # ---------------------------------------
     # Standalone OHLC Prices Table
@@ -61,32 +348,52 @@ class InsiderRepository:
             params["end"] = end
 
         sql += " ORDER BY date"
-        return pd.read_sql(sql, self.engine, params=params)
+        # ohlc_prices is filled outside the ETL, so etl_state can't version it
+        return self._read(sql, params, cached=False)
 
     # ---------------------------------------
     # Merged Insider Rollup View
     # ---------------------------------------
-    def get_rollup(self, start=None, end=None):
+    def get_rollup(
+        self,
+        start=None,
+        end=None,
+        columns=None,
+        ticker=None,
+        cik=None,
+        reporter=None,
+        code=None,
+        side=None,
+    ):
         """
         Query the SQL VIEW `insider_rollup` that merges:
         - insider_transactions
         - exchange_mapping
         """
+        sql, params = _build_select(
+            "insider_rollup",
+            self.SOURCE_COLUMNS["insider_rollup"],
+            columns,
+            start,
+            end,
+            reporter=reporter,
+            ticker=ticker,
+            cik=cik,
+            code=code,
+            side=side,
+        )
+        return self._read(sql, params)
 
-        sql = "SELECT * FROM insider_rollup"
-        filters = []
-
-        if start:
-            filters.append("period_of_report >= %(start)s")
-        if end:
-            filters.append("period_of_report <= %(end)s")
-
-        if filters:
-            sql += " WHERE " + " AND ".join(filters)
-
-        sql += " ORDER BY period_of_report"
-
-        return pd.read_sql(sql, self.engine, params={"start": start, "end": end})
+    def iter_rollup(self, start=None, end=None, chunksize=DEFAULT_CHUNKSIZE, **kwargs):
+        """Streaming get_rollup: yields DataFrame chunks."""
+        sql, params = _build_select(
+            "insider_rollup",
+            self.SOURCE_COLUMNS["insider_rollup"],
+            start=start,
+            end=end,
+            **kwargs,
+        )
+        return self._read_chunks(sql, params, chunksize)
 
     # ---------------------------------------
     # OHLC helpers
@@ -95,14 +402,7 @@ class InsiderRepository:
         """
         Returns True if OHLC data exists for this ticker between start and end dates.
         """
-        sql = text("""
-            SELECT 1
-            FROM ohlc_prices
-            WHERE ticker = :ticker
-              AND date >= :start
-              AND date <= :end
-            LIMIT 1
-        """)
+        sql = text(OHLC_EXISTS_SQL)
         params = {"ticker": ticker, "start": start, "end": end}
 
         with self.engine.connect() as conn:
@@ -154,3 +454,22 @@ class InsiderRepository:
             session.commit()
 
         self.log.info(f"[OHLC] Inserted {len(records)} rows into ohlc_prices.")
+
+
+def get_repository() -> InsiderRepository:
+    """
+    Repository for the configured REPOSITORY_BACKEND, sharing the
+    process-wide query cache.
+    """
+    settings = get_settings()
+    cache = get_query_cache()
+
+    if settings.repository_backend == "duckdb":
+        from .duckdb_repository import DuckDBRepository
+
+        return DuckDBRepository(settings.gold_dir, cache=cache)
+    if settings.repository_backend != "postgres":
+        raise ValueError(
+            f"[InsiderRepository] Unknown REPOSITORY_BACKEND '{settings.repository_backend}'"
+        )
+    return InsiderRepository(cache=cache)
@@ -65,6 +65,16 @@ def build_schema_context_text() -> str:
             - sic_sector (text)
             - sic_industry (text)
 
+            TABLE: insider_daily_flow (pre-aggregated per ticker/day/side/code)
+            - id (integer, primary key)
+            - issuer_ticker (text)
+            - period_of_report (timestamptz, truncated to day)
+            - acquired_disposed (text)
+            - code (text)
+            - total_value (numeric, sum)
+            - shares (numeric, sum)
+            - n_transactions (integer)
+
             VIEW: insider_rollup
             - insider_transactions.*
             - ticker_name
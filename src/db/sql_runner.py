@@ -1,7 +1,7 @@
 
 from sqlalchemy import text
 from typing import Any
-from .db import engine
+from .db import get_engine
 from .sql_agent import assert_read_only_single_statement
 
 
@@ -9,7 +9,7 @@ def explain_analyze(sql: str, timeout_ms: int = 5000) -> str:
     assert_read_only_single_statement(sql)
     explain_sql = f"EXPLAIN (ANALYZE, BUFFERS, VERBOSE) {sql}"
 
-    with engine.begin() as conn:
+    with get_engine().begin() as conn:
         conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
         rows = conn.execute(text(explain_sql)).fetchall()
 
@@ -19,7 +19,7 @@ def explain_analyze(sql: str, timeout_ms: int = 5000) -> str:
 def run_query(sql: str, timeout_ms: int = 5000) -> list[dict[str, Any]]:
     assert_read_only_single_statement(sql)
 
-    with engine.begin() as conn:
+    with get_engine().begin() as conn:
         conn.execute(text(f"SET LOCAL statement_timeout = {timeout_ms}"))
         result = conn.execute(text(sql))
         cols = list(result.keys())
@@ -1,6 +1,6 @@
+from datetime import datetime
 from typing import Dict, Any, Iterable
 import time
-import pandas as pd
 
 from ..adapters.sec_api_adapter import SecApiAdapter
 from ..adapters.http_adapter import HttpAdapter
@@ -61,11 +61,31 @@ class InsiderApiSource:
                 time.sleep(sleep_seconds)
             yield {}
 
-     
-    def fetch_exchange_mapping(self, exchanges=( "nasdaq", "nyse" )) -> pd.DataFrame:
+
+    def fetch_insider_transactions_since(
+        self,
+        query_string: str,
+        since,
+        size: int = DEFAULT_PAGE_SIZE,
+        sleep_seconds: float = 0.2,
+    ) -> Iterable[Dict[str, Any]]:
+        """
+        Streams filings matching query_string with filedAt >= since, newest first.
+        Paging stops at the first older filing, so a poll with nothing new costs one page.
+        """
+        if not isinstance(since, datetime):
+            since = datetime.fromisoformat(str(since))
+        for t in self.fetch_insider_transactions(
+            query_string, since.date().isoformat(), "*", size, sleep_seconds, sort_desc=True
+        ):
+            if not t or datetime.fromisoformat(t["filedAt"]) < since:
+                return
+            yield t
+
+    def fetch_exchange_mapping(self, exchanges=( "nasdaq", "nyse" )) -> list[dict]:
         """
         Fetch company metadata (ticker, sector, industry, exchange) from SEC-API Mapping endpoints.
-        Returns a DataFrame with columns: issuerTicker, cik, exchange, sector, industry, category, name
+        Returns the raw records (dicts) with keys: issuerTicker, cik, exchange, sector, industry, category, name
         """
         MAPPING_ENDPOINT = "mapping/exchange/{exchange}?token={key}"
         records = []
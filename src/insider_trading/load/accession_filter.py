@@ -0,0 +1,47 @@
+from sqlalchemy import text
+
+from utils.logger import Logger
+
+LOADED_ACCESSIONS_SQL = """
+    SELECT DISTINCT accession_no
+    FROM insider_transactions
+    WHERE accession_no = ANY(:keys)
+"""
+
+
+class AccessionFilter:
+    """
+    Drops raw filings whose accessionNo is already in insider_transactions,
+    so overlapping fetch windows skip normalize / transform / load.
+
+    Each batch costs one `accession_no = ANY(:keys)` lookup on the
+    accession index. Other processes (backfill workers, the poll loop)
+    load concurrently, so nothing is cached between batches.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.log = Logger(self.__class__.__name__)
+
+    # ----------------------------------------------------------------------
+    def loaded(self, accession_nos: list[str]) -> set[str]:
+        """Subset of `accession_nos` already in insider_transactions."""
+        candidates = list(set(accession_nos))
+        if not candidates:
+            return set()
+
+        with self.db.engine.connect() as conn:
+            rows = conn.execute(text(LOADED_ACCESSIONS_SQL), {"keys": candidates})
+            return {r[0] for r in rows}
+
+    # ----------------------------------------------------------------------
+    def drop_loaded(self, raw: list[dict]) -> list[dict]:
+        """Filings from `raw` not loaded yet (those without accessionNo are kept)."""
+        keys = [f.get("accessionNo") for f in raw]
+        known = self.loaded([k for k in keys if isinstance(k, str) and k])
+        if not known:
+            return raw
+
+        kept = [f for f, k in zip(raw, keys) if k not in known]
+        self.log.info(f"[SKIP] {len(raw) - len(kept)} of {len(raw)} filings already loaded")
+        return kept
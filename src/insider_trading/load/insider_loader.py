@@ -1,8 +1,8 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from utils.logger import Logger
-from db.db import engine
-from db.models import InsiderTransaction
+from db.models import InsiderDailyFlow, InsiderTransaction
 import pandas as pd
 
 
@@ -13,9 +13,12 @@ class InsiderTransactionsLoader:
     - Insert-only (historical records)
     - Duplicate protection via business key:
         (issuer_ticker, period_of_report, shares, price_per_share)
+    - Keeps the insider_daily_flow summary table in step with each insert
+    - Bumps etl_state so cached repository reads are invalidated
     """
 
     DEDUPE_KEY = ["issuer_ticker", "period_of_report", "shares", "price_per_share"]
+    FLOW_KEY = ["issuer_ticker", "period_of_report", "acquired_disposed", "code"]
 
     def __init__(self, db):
         self.db = db
@@ -39,6 +42,52 @@ class InsiderTransactionsLoader:
         stmt = select(InsiderTransaction).filter(*filters).limit(1)
         return session.execute(stmt).first() is not None
 
+    # ----------------------------------------------------------------------
+    @classmethod
+    def daily_flow(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate transactions to the insider_daily_flow grain:
+        (issuer_ticker, day, acquired_disposed, code) → sums + count.
+        Null keys are kept as their own group (matches NULLS NOT DISTINCT).
+        """
+        flow = df[cls.FLOW_KEY + ["total_value", "shares"]].copy()
+        flow["period_of_report"] = flow["period_of_report"].dt.floor("D")
+
+        flow = (
+            flow.groupby(cls.FLOW_KEY, dropna=False)
+            .agg(
+                total_value=("total_value", "sum"),
+                shares=("shares", "sum"),
+                n_transactions=("total_value", "size"),
+            )
+            .reset_index()
+        )
+
+        # NaN group keys → None so they bind as SQL NULL
+        return flow.astype(object).where(flow.notna(), None)
+
+    # ----------------------------------------------------------------------
+    def _upsert_daily_flow(self, session: Session, df: pd.DataFrame) -> int:
+        """
+        Add this batch's aggregates onto insider_daily_flow.
+        Runs inside the caller's session so flow and raw rows commit together.
+        """
+        rows = self.daily_flow(df).to_dict(orient="records")
+        if not rows:
+            return 0
+
+        stmt = insert(InsiderDailyFlow)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_insider_daily_flow_key",
+            set_={
+                "total_value": InsiderDailyFlow.total_value + stmt.excluded.total_value,
+                "shares": InsiderDailyFlow.shares + stmt.excluded.shares,
+                "n_transactions": InsiderDailyFlow.n_transactions + stmt.excluded.n_transactions,
+            },
+        )
+        session.execute(stmt, rows)
+        return len(rows)
+
     # ----------------------------------------------------------------------
     def load(self, df: pd.DataFrame):
         """
@@ -53,7 +102,7 @@ class InsiderTransactionsLoader:
         inserted = 0
         skipped = 0
 
-        with Session(engine, future=True) as session:
+        with Session(self.db.engine, future=True) as session:
             for _, row in df.iterrows():
 
                 #if self._exists(session, row):
@@ -88,8 +137,13 @@ class InsiderTransactionsLoader:
                 session.add(obj)
                 inserted += 1
 
+            flow_rows = self._upsert_daily_flow(session, df)
             session.commit()
 
+        # staleness checks and repository cache keys both read this
+        self.db.set_last_updated("insider_transactions")
+
         self.log.info(
-            f"[LOAD] Insider transactions: inserted={inserted}, skipped={skipped}"
+            f"[LOAD] Insider transactions: inserted={inserted}, skipped={skipped}, "
+            f"daily_flow_rows={flow_rows}"
         )
@@ -1,7 +1,12 @@
 from datetime import datetime, timedelta, UTC
 
+import pyarrow as pa
+
 from insider_trading.tasks.exchange_mapping_task import ExchangeMappingTask
 from insider_trading.tasks.insider_transactions_task import InsiderTransactionsTask
+from insider_trading.tasks.replay_task import ReplayTask
+from insider_trading.tasks.backfill_task import BackfillTask
+from insider_trading.tasks.poll_task import PollTask
 
 from insider_trading.extract.sources.insider_api_source import InsiderApiSource
 from insider_trading.transform.mapping_transformer import MappingTransformer
@@ -9,12 +14,18 @@ from insider_trading.transform.insider_transformer import InsiderTransactionsTra
 
 from insider_trading.load.mapping_loader import ExchangeMappingLoader
 from insider_trading.load.insider_loader import InsiderTransactionsLoader
+from insider_trading.load.accession_filter import AccessionFilter
 
 from writers.raw_writer import RawWriter
 from writers.staging_writer import StagingWriter
 from writers.final_writer import FinalWriter
 
+from db.backfill_queue import BackfillQueue, plan_shards
+from db.config import get_settings
+from orchestrator.dag import DAG, DAGRun
+from utils import memprofile
 from utils.logger import Logger
+from utils.metrics import start_run
 
 
 class InsiderTradingPipeline:
@@ -26,6 +37,10 @@ class InsiderTradingPipeline:
 
     MAPPING_REFRESH_DAYS = 30
     TRANSACTION_REFRESH_DAYS = 7
+    # re-fetch this far behind the high-water mark; late-indexed filings are
+    # picked up and the accession skip drops the ones already loaded
+    TRANSACTION_OVERLAP = timedelta(days=1)
+    GLOBAL_QUERY = "*:*"
 
     def __init__(self, config, db):
         self.log = Logger(self.__class__.__name__)
@@ -73,6 +88,21 @@ class InsiderTradingPipeline:
             "shares_owned_following",
             "is_10b5_1",
         ]
+
+        # strict gold types (FinalWriter checks them with one Arrow cast per column)
+        FINAL_TYPES_TRANSACTIONS = pa.schema([
+            ("filed_at", pa.timestamp("ns", tz="UTC")),
+            ("period_of_report", pa.timestamp("ns", tz="UTC")),
+            ("transaction_date", pa.timestamp("ns", tz="UTC")),
+            ("issuer_ticker", pa.string()),
+            ("reporter", pa.string()),
+            ("code", pa.string()),
+            ("acquired_disposed", pa.string()),
+            ("shares", pa.float64()),
+            ("price_per_share", pa.float64()),
+            ("total_value", pa.float64()),
+            ("shares_owned_following", pa.float64()),
+        ])
         # ------------------------------------------------------------
         # Writers (Bronze → Silver → Gold)
         # ------------------------------------------------------------
@@ -86,11 +116,13 @@ class InsiderTradingPipeline:
             keep_history=True,
         )
 
+        # partitioned by year/month so date-range reads can prune files
         self.final_writer_transactions = FinalWriter(
             directory="data/final",
             expected_schema=FINAL_SCHEMA_TRANSACTIONS,
-            enforce_types={},  # optional strictness
+            enforce_types=FINAL_TYPES_TRANSACTIONS,
             keep_history=True,
+            partition_by="period_of_report",
         )
 
         # ------------------------------------------------------------
@@ -123,6 +155,7 @@ class InsiderTradingPipeline:
             raw_writer=self.raw_writer,
             staging_writer=self.staging_writer,
             final_writer=self.final_writer_transactions,
+            accession_filter=AccessionFilter(db),
         )
 
     # ================================================================
@@ -132,68 +165,270 @@ class InsiderTradingPipeline:
         last = self.db.last_updated("exchange_mapping")
         return not last or (datetime.now(UTC) - last).days >= self.MAPPING_REFRESH_DAYS
 
-    def transactions_are_stale(self):
-        last = self.db.last_updated("insider_transactions")
+    def transactions_are_stale(self, query: str = GLOBAL_QUERY):
+        # the query's own row: the loader bumps "insider_transactions" on
+        # every load, ticker-scoped ones included
+        last = self.db.last_updated(self.watermark_key(query))
         return not last or (datetime.now(UTC) - last).days >= self.TRANSACTION_REFRESH_DAYS
 
 
     # ================================================================
     #    ------------------ range computation ----------------------
     # ================================================================
-    def _compute_transactions_window(self) -> tuple[str, str]:
+    @staticmethod
+    def watermark_key(query: str) -> str:
+        """etl_state row holding the filed_at high-water mark and last run of `query`."""
+        return f"insider_transactions[{query}]"
+
+    def _high_water(self, query: str = GLOBAL_QUERY):
+        """
+        Newest filed_at loaded for `query` (None if never loaded). A narrower
+        query also honours the global mark, since the all-filings query
+        already loaded everything it matches.
+        """
+        marks = [self._global_high_water()]
+        if query != self.GLOBAL_QUERY:
+            marks.append(self.db.high_water(self.watermark_key(query)))
+        marks = [m for m in marks if m]
+        return max(marks) if marks else None
+
+    def _global_high_water(self):
+        """
+        The all-filings mark. A deployment upgraded from run-time tracking
+        has rows but no mark yet: seed it from what is already loaded, so
+        the first window covers the whole gap since the last run instead
+        of TRANSACTION_REFRESH_DAYS.
+        """
+        key = self.watermark_key(self.GLOBAL_QUERY)
+        mark = self.db.high_water(key)
+        if mark is None:
+            mark = self.db.unmarked_transactions_high_water()
+            if mark is not None:
+                self.log.info(f"[TRANSACTIONS] No high-water mark yet → seeded from loaded rows at {mark}")
+                self.db.set_high_water(key, mark)
+        return mark
+
+    def _compute_transactions_window(self, query: str = GLOBAL_QUERY) -> tuple[str, str]:
         """
         Decide which [start_date, end_date] to pass to SEC API.
 
-        - if no last_updated: fetch last N days (TRANSACTION_REFRESH_DAYS)
-        - if last_updated exists: start = last_updated+1, end=today
+        - no high-water mark: fetch last N days (TRANSACTION_REFRESH_DAYS)
+        - otherwise: start = day of (max filed_at loaded - TRANSACTION_OVERLAP), end = today
         """
         today = datetime.now(UTC).date()
-        last = self.db.last_updated("insider_transactions")
+        mark = self._high_water(query)
 
-        if not last:
+        if not mark:
             # First-time run → take last N days
             start = (today - timedelta(days=self.TRANSACTION_REFRESH_DAYS)).isoformat()
             end = today.isoformat()
             return start, end
 
-        # Normal incremental refresh: from day after last_updated to today
-        start = (last.date() + timedelta(days=1)).isoformat()
+        # Incremental refresh: re-read the overlap behind the newest filing loaded
+        start = (mark - self.TRANSACTION_OVERLAP).astimezone(UTC).date().isoformat()
         end = today.isoformat()
         return start, end
 
+    def _advance_watermark(self, query: str, loaded) -> None:
+        """Move the query's high-water mark to the newest filed_at actually loaded."""
+        if loaded is None or loaded.empty:
+            self.log.info("[TRANSACTIONS] Nothing loaded → high-water mark unchanged")
+            return
+        self.db.set_high_water(self.watermark_key(query), loaded["filed_at"].max().to_pydatetime())
+
+    # ================================================================
+    #                     REPLAY FROM RAW ARCHIVE
+    # ================================================================
+    def replay(self, start: str, end: str, workers: int = 4) -> dict:
+        """Rebuild gold + DB transactions filed in [start, end] from the raw archive."""
+        task = ReplayTask(
+            archive=self.raw_writer.archive,
+            transformer=self.transactions_transformer,
+            final_writer=self.final_writer_transactions,
+            db=self.db,
+            workers=workers,
+        )
+        return task.run(start, end)
+
+    def _unstaged_transactions_task(self) -> InsiderTransactionsTask:
+        """transactions_task without per-step staging Parquet files."""
+        return InsiderTransactionsTask(
+            source=self.transactions_source,
+            transformer=self.transactions_transformer,
+            loader=self.transactions_loader,
+            raw_writer=self.raw_writer,
+            staging_writer=None,
+            final_writer=self.final_writer_transactions,
+            accession_filter=self.transactions_task.accession_filter,
+        )
+
+    # ================================================================
+    #                      SHARDED API BACKFILL
+    # ================================================================
+    @staticmethod
+    def backfill_job(query: str, start: str, end: str, unit: str) -> str:
+        return f"backfill[{query}]:{start}..{end}/{unit}"
+
+    def backfill(
+        self,
+        start: str,
+        end: str,
+        unit: str = "month",
+        workers: int = 4,
+        query: str = GLOBAL_QUERY,
+        job: str | None = None,
+    ) -> dict:
+        """
+        Fetch and load filings in [start, end] from the API, one month or
+        week shard at a time, through the backfill_shards work queue.
+        Re-running the same job (or running it on more nodes) picks up the
+        shards nobody has finished. High-water marks are left alone.
+        """
+        job = job or self.backfill_job(query, start, end, unit)
+        queue = BackfillQueue(self.db)
+        queue.plan(job, query, plan_shards(start, end, unit))
+
+        # no staging artifacts: their per-second file names collide across workers
+        task = self._unstaged_transactions_task()
+        self.raw_writer.archive  # open the archive before workers share it
+
+        metrics = start_run("backfill")
+        metrics.extra.update({"job": job, "workers": workers})
+        try:
+            progress = BackfillTask(queue, task, job, workers=workers).run()
+            metrics.extra["status"] = "ok" if progress["done"] == progress["total"] else "incomplete"
+        except Exception:
+            metrics.extra["status"] = "failed"
+            raise
+        finally:
+            self._emit_metrics(metrics)
+        return progress
+
+    # ================================================================
+    #                      MICRO-BATCH POLLING
+    # ================================================================
+    def poll(self, interval: float = 60, query: str = GLOBAL_QUERY, max_polls: int | None = None) -> int:
+        """
+        Load filings within minutes of filedAt: every `interval` seconds
+        fetch only what was filed since the query's high-water mark.
+        The metrics report / textfile is rewritten after every batch with
+        the filedAt → committed lag (freshness). Returns filings committed.
+        """
+        metrics = start_run("poll")
+        metrics.extra.update({"query": query, "interval_s": interval})
+
+        task = PollTask(
+            # a staging file set per minute is noise; gold files can be merged with compact-gold
+            self._unstaged_transactions_task(),
+            query=query,
+            since=lambda: self._high_water(query),
+            on_loaded=lambda loaded: self._advance_watermark(query, loaded),
+            on_batch=lambda: self._emit_metrics(metrics, quiet=True),
+            interval=interval,
+        )
+        try:
+            return task.run(max_polls=max_polls)
+        finally:
+            self._emit_metrics(metrics)
+
     # ================================================================
     #                           RUN PIPELINE
     # ================================================================
-    def run(self, query: str = "*:*"):
-        self.log.info("=== InsiderTradingPipeline START ===")
+    def build_dag(self, query: str = GLOBAL_QUERY, max_workers: int = 4) -> DAG:
+        """
+        Stage graph for one pipeline run (stale / test-mode parts only):
+
+            mapping.extract → mapping.transform → mapping.final → mapping.load
+                                                                      ↓ (rollup join)
+            transactions.extract → transactions.transform → transactions.final → transactions.load
+
+        The two extract / transform / final chains run concurrently.
+        """
+        dag = DAG("insider_trading", max_workers=max_workers)
+        mapping, transactions = self.mapping_task, self.transactions_task
 
         # 1) Mapping (no params)
+        run_mapping = True
+        raw_path_map = None
         if self.config.test_mode_map:
-            self.mapping_task.run(raw_path_override=self.config.test_path_map)
+            raw_path_map = self.config.test_path_map
+        elif self.mapping_is_stale():
+            self.log.info("[MAPPING] Stale → refreshing")
         else:
-            if self.mapping_is_stale():
-                self.log.info("[MAPPING] Stale → refreshing")
-                self.mapping_task.run()
-            else:
-                self.log.info("[MAPPING] Fresh → skipping")
+            self.log.info("[MAPPING] Fresh → skipping")
+            run_mapping = False
+
+        if run_mapping:
+            dag.add("mapping.extract", lambda: mapping.extract(raw_path_override=raw_path_map))
+            dag.add("mapping.transform", mapping.transform, inputs=["mapping.extract"])
+            dag.add("mapping.final", mapping.write_final, inputs=["mapping.transform"])
+            dag.add("mapping.load", mapping.load, inputs=["mapping.transform"], after=["mapping.final"])
 
         # 2) Insider transactions
         if self.config.test_mode_tx:
-            self.transactions_task.run(params=None, raw_path_override=self.config.test_path_tx)
+            raw_path_tx = self.config.test_path_tx
+            extract = lambda: transactions.extract(raw_path_override=raw_path_tx)  # noqa: E731
+            load = transactions.load
+        elif self.transactions_are_stale(query):
+            start, end = self._compute_transactions_window(query)
+            params = {
+                "query_string": query,
+                "start_date": start,
+                "end_date": end,
+            }
+            self.log.info(
+                f"[TRANSACTIONS] Running for window: {start} → {end} (query={query})"
+            )
+            extract = lambda: transactions.extract(params)  # noqa: E731
+
+            def load(df_final):
+                loaded = transactions.load(df_final)
+                self._advance_watermark(query, loaded)
+                self.db.set_last_updated(self.watermark_key(query))
+                return loaded
         else:
-            if self.transactions_are_stale():
-                start, end = self._compute_transactions_window()
-
-                params = {
-                    "query_string": query,
-                    "start_date": start,
-                    "end_date": end,
-                }
-                self.log.info(
-                    f"[TRANSACTIONS] Running for window: {start} → {end} (query={query})"
-                )
-                self.transactions_task.run(params)
-            else:
-                self.log.info("[TRANSACTIONS] Fresh → skipping")
-
-        self.log.info("=== InsiderTradingPipeline COMPLETE ===")
\ No newline at end of file
+            self.log.info("[TRANSACTIONS] Fresh → skipping")
+            return dag
+
+        dag.add("transactions.extract", extract)
+        dag.add("transactions.transform", transactions.transform, inputs=["transactions.extract"])
+        dag.add("transactions.final", transactions.write_final, inputs=["transactions.transform"])
+        dag.add(
+            "transactions.load",
+            load,
+            inputs=["transactions.transform"],
+            # insider_rollup joins mapping → load it first
+            after=["transactions.final"] + (["mapping.load"] if run_mapping else []),
+        )
+        return dag
+
+    def run(self, query: str = GLOBAL_QUERY, max_workers: int = 4) -> DAGRun:
+        self.log.info("=== InsiderTradingPipeline START ===")
+        metrics = start_run("insider_trading")
+        metrics.extra["query"] = query
+
+        if memprofile.enabled() and max_workers > 1:
+            # tracemalloc is process-wide; one stage at a time keeps peaks attributable
+            self.log.info("[MEMORY] Profiling on → running stages one at a time")
+            max_workers = 1
+
+        try:
+            dag_run = self.build_dag(query, max_workers=max_workers).run()
+            metrics.extra["status"] = "ok"
+            metrics.extra["critical_path"] = dag_run.critical_path
+        except Exception:
+            metrics.extra["status"] = "failed"
+            raise
+        finally:
+            self._emit_metrics(metrics)
+
+        self.log.info("=== InsiderTradingPipeline COMPLETE ===")
+        return dag_run
+
+    def _emit_metrics(self, metrics, quiet: bool = False) -> None:
+        metrics_dir = get_settings().metrics_dir
+        if not metrics_dir:
+            return
+        json_path, prom_path = metrics.emit(metrics_dir)
+        if not quiet:
+            self.log.info(f"[METRICS] Run report → {json_path}, textfile → {prom_path}")
@@ -0,0 +1,196 @@
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+from utils.logger import Logger
+from utils.metrics import span
+
+
+def estimate_eta(progress: dict, done_here: int, elapsed: float, workers: int) -> float | None:
+    """
+    Seconds until the job's remaining shards are done.
+
+    Uses the job-wide completion rate since this process started (so
+    workers on other nodes count), falling back to the mean shard time
+    spread over our workers before anything has finished here.
+    """
+    remaining = progress["remaining"]
+    if remaining <= 0:
+        return 0.0
+    if done_here > 0 and elapsed > 0:
+        return remaining / (done_here / elapsed)
+    if progress["avg_shard_s"]:
+        return remaining * progress["avg_shard_s"] / max(workers, 1)
+    return None
+
+
+def _duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "?"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+class ShardLost(RuntimeError):
+    """The shard's lease ran out and another worker claimed it."""
+
+
+class BackfillTask:
+    """
+    Drain one backfill job from the work queue:
+        claim shard → Extract → Transform → Final → Load → mark done
+
+    `workers` threads claim shards until none are left (API extracts and
+    DB loads dominate, so threads overlap well). Several processes or
+    nodes can run the same job at once: BackfillQueue hands each shard
+    to one claimer, and a killed run resumes where it stopped.
+
+    While a shard runs, a heartbeat renews its claim every
+    `heartbeat_every` seconds (a quarter of the lease by default). If the
+    claim was lost anyway (e.g. the DB was unreachable for a whole lease),
+    the shard is abandoned before its gold write / load. The gold write
+    swaps the shard's filings, so a retry after a failed load does not
+    append them twice.
+    """
+
+    PROGRESS_EVERY = 30  # seconds between progress lines
+
+    def __init__(
+        self,
+        queue,
+        task,
+        job: str,
+        workers: int = 4,
+        progress_every: float = PROGRESS_EVERY,
+        heartbeat_every: float | None = None,
+    ):
+        self.queue = queue
+        self.task = task
+        self.job = job
+        self.workers = workers
+        self.progress_every = progress_every
+        self.heartbeat_every = heartbeat_every or queue.lease / 4
+
+        self._stop = threading.Event()
+        self._done_here = 0
+        self._count_lock = threading.Lock()
+        self.log = Logger(self.__class__.__name__)
+
+    # ----------------------------------------------------------
+    # Worker
+    # ----------------------------------------------------------
+    def process(self, shard: dict, lost: threading.Event | None = None) -> tuple[int, int]:
+        """Run one shard through the task stages; returns (filings, rows loaded)."""
+        params = {
+            "query_string": shard["query"],
+            "start_date": shard["start_date"].isoformat(),
+            "end_date": shard["end_date"].isoformat(),
+        }
+
+        def check_claim():
+            if lost is not None and lost.is_set():
+                raise ShardLost(f"shard {shard['id']} was claimed by another worker")
+
+        raw = self.task.extract(params)
+        df_final = self.task.transform(raw)
+
+        check_claim()
+        # filedAt dates are US/Eastern: pad the UTC window a day each side;
+        # only this shard's accessions are swapped inside it
+        lo = pd.Timestamp(shard["start_date"], tz="UTC") - timedelta(days=1)
+        hi = pd.Timestamp(shard["end_date"], tz="UTC") + timedelta(days=2)
+        accessions = {f.get("accessionNo") for f in raw} - {None}
+        self.task.replace_final(df_final, lo, hi, accessions)
+
+        check_claim()
+        loaded = self.task.load(df_final)
+        return len(raw), 0 if loaded is None else len(loaded)
+
+    def _heartbeat(self, shard: dict, lost: threading.Event, finished: threading.Event) -> None:
+        while not finished.wait(self.heartbeat_every):
+            try:
+                if not self.queue.heartbeat(shard):
+                    lost.set()
+                    return
+            except Exception as e:
+                # keep trying: the lease only runs out after `lease` seconds
+                self.log.warning(f"[BACKFILL] Heartbeat for shard {shard['id']} failed: {e!r}")
+
+    def _work(self, name: str) -> None:
+        while not self._stop.is_set():
+            shard = self.queue.claim(self.job, name)
+            if shard is None:
+                return
+
+            window = f"{shard['start_date']} → {shard['end_date']}"
+            lost, finished = threading.Event(), threading.Event()
+            beat = threading.Thread(target=self._heartbeat, args=(shard, lost, finished), daemon=True)
+            beat.start()
+            try:
+                with span("backfill.shard"):
+                    filings, rows = self.process(shard, lost)
+            except ShardLost:
+                self.log.warning(f"[BACKFILL] {name}: lost the claim on shard {window} → abandoned")
+                continue
+            except Exception as e:
+                self.log.error(f"[BACKFILL] {name}: shard {window} failed (attempt {shard['attempts']}): {e!r}")
+                self.queue.fail(shard, repr(e))
+                continue
+            finally:
+                finished.set()
+                beat.join()
+
+            self.queue.complete(shard, filings, rows)
+            with self._count_lock:
+                self._done_here += 1
+            self.log.info(f"[BACKFILL] {name}: shard {window} done → filings={filings}, rows={rows}")
+
+    # ----------------------------------------------------------
+    # Progress
+    # ----------------------------------------------------------
+    def report(self, progress: dict, elapsed: float) -> str:
+        eta = estimate_eta(progress, self._done_here, elapsed, self.workers)
+        pct = 100 * progress["done"] / progress["total"] if progress["total"] else 100.0
+        return (
+            f"[BACKFILL] {self.job}: {progress['done']}/{progress['total']} shards ({pct:.0f}%), "
+            f"{progress['running']} running, {progress['pending']} pending, {progress['failed']} failed; "
+            f"filings={progress['filings']:,} rows={progress['rows_loaded']:,}; ETA {_duration(eta)}"
+        )
+
+    # ----------------------------------------------------------
+    # Main Task Runner
+    # ----------------------------------------------------------
+    def run(self) -> dict:
+        """Work until no shard is claimable; returns the job's final progress."""
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(target=self._work, args=(f"{prefix}:{i}",), name=f"backfill-{i}")
+            for i in range(self.workers)
+        ]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+
+        try:
+            while any(t.is_alive() for t in threads):
+                deadline = time.monotonic() + self.progress_every
+                for t in threads:
+                    t.join(timeout=max(deadline - time.monotonic(), 0))
+                if any(t.is_alive() for t in threads):
+                    self.log.info(self.report(self.queue.progress(self.job), time.perf_counter() - t0))
+        except KeyboardInterrupt:
+            self.log.info("[BACKFILL] Interrupted → finishing in-flight shards, rerun to resume")
+            self._stop.set()
+            for t in threads:
+                t.join()
+
+        progress = self.queue.progress(self.job)
+        self.log.info(self.report(progress, time.perf_counter() - t0))
+        if progress["dead"]:
+            self.log.error(f"[BACKFILL] {progress['dead']} shard(s) failed {self.queue.max_attempts} times; see backfill_shards.error")
+        return progress
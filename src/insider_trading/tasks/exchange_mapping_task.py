@@ -1,4 +1,5 @@
 from utils.logger import Logger
+from utils.metrics import span
 
 
 class ExchangeMappingTask:
@@ -28,61 +29,82 @@ class ExchangeMappingTask:
         self.log = Logger(self.__class__.__name__)
 
     # ----------------------------------------------------------
-    # Main Task Runner
+    # Stages (run() chains them; DAG schedulers call them directly)
     # ----------------------------------------------------------
-    def run(self, params: dict | None = None, raw_path_override: str = None):
+    def extract(self, raw_path_override: str = None) -> list[dict]:
         """
-        Run the exchange  ETL.
-
-        Two modes:
-        1. Normal API mode → params provided
-        2. Test mode → raw_path_override provided (skip API)
-
+        1. EXTRACT (raw JSON from SEC API)
         """
-        self.log.info("=== ExchangeMappingTask START ===")
-        # ------------------------------------------------------
-        # 1. EXTRACT (raw JSON from SEC API)
-        # ------------------------------------------------------
         # ------------------------------------------------------
         # TEST MODE: use provided raw JSON path
         # ------------------------------------------------------
         if raw_path_override:
             self.log.info(f"[TEST MODE] Loading raw exchange data from {raw_path_override}")
-            raw = self.raw_writer.load_json(raw_path_override)
-        else:
-            # ------------------------------------------------------
-            # NORMAL MODE: fetch from API
-            # ------------------------------------------------------
+            return self.raw_writer.load_json(raw_path_override)
+
+        # ------------------------------------------------------
+        # NORMAL MODE: fetch from API
+        # ------------------------------------------------------
+        with span("mapping.extract") as s:
             raw = self.source.fetch_exchange_mapping()
             # Convert generator to list
             # task layer is responsible for buffering before writing raw files.
             raw = list(raw)
-            self.log.info(f"[EXTRACT] raw mapping records = {len(raw)}")
+            s.rows_out = len(raw)
+        self.log.info(f"[EXTRACT] raw mapping records = {len(raw)}")
 
+        with span("mapping.raw_write", rows_in=len(raw)):
             raw_path = self.raw_writer.save("exchange_mapping", raw)
-            self.log.info(f"[RAW] Saved to {raw_path}")
+        self.log.info(f"[RAW] Saved to {raw_path}")
+        return raw
 
-        # ------------------------------------------------------
-        # 2. TRANSFORM (normalize → clean → dedupe → validate)
-        #    This also writes intermediate staging artifacts
-        # ------------------------------------------------------
-        df_final = self.transformer.transform(
-            raw,
-            staging_writer=self.staging_writer,   # writes normalized / cleaned / deduped
-        )
+    def transform(self, raw: list[dict]):
+        """
+        2. TRANSFORM (normalize → clean → dedupe → validate)
+           This also writes intermediate staging artifacts
+        """
+        with span("mapping.transform", rows_in=len(raw)) as s:
+            df_final = self.transformer.transform(
+                raw,
+                staging_writer=self.staging_writer,   # writes normalized / cleaned / deduped
+            )
+            s.rows_out = len(df_final)
         self.log.info(f"[TRANSFORM] Final row count = {len(df_final)}")
+        return df_final
 
-        # ------------------------------------------------------
-        # 3. STRICT FINAL WRITE (Gold)
-        #    Validates schema + types before writing Parquet.
-        # ------------------------------------------------------
-        final_path = self.final_writer.save("exchange_mapping_final", df_final)
+    def write_final(self, df_final) -> None:
+        """
+        3. STRICT FINAL WRITE (Gold)
+           Validates schema + types before writing Parquet.
+        """
+        with span("mapping.final", rows_in=len(df_final)):
+            final_path = self.final_writer.save("exchange_mapping_final", df_final)
         self.log.info(f"[FINAL] Gold-layer Parquet saved to {final_path}")
 
-        # ------------------------------------------------------
-        # 4. LOAD → DB (append-only / slow-changing)
-        # ------------------------------------------------------
-        self.loader.load(df_final)
+    def load(self, df_final) -> None:
+        """
+        4. LOAD → DB (append-only / slow-changing)
+        """
+        with span("mapping.load", rows_in=len(df_final)):
+            self.loader.load(df_final)
         self.log.info("[LOAD] Successfully loaded into database")
 
+    # ----------------------------------------------------------
+    # Main Task Runner
+    # ----------------------------------------------------------
+    def run(self, params: dict | None = None, raw_path_override: str = None):
+        """
+        Run the exchange  ETL.
+
+        Two modes:
+        1. Normal API mode → params provided
+        2. Test mode → raw_path_override provided (skip API)
+
+        """
+        self.log.info("=== ExchangeMappingTask START ===")
+
+        df_final = self.transform(self.extract(raw_path_override))
+        self.write_final(df_final)
+        self.load(df_final)
+
         self.log.info("=== ExchangeMappingTask COMPLETE ===")
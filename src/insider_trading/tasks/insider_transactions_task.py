@@ -1,4 +1,5 @@
 from utils.logger import Logger
+from utils.metrics import span
 
 
 class InsiderTransactionsTask:
@@ -16,6 +17,7 @@ class InsiderTransactionsTask:
         raw_writer,
         staging_writer,
         final_writer,
+        accession_filter=None,
     ):
         self.source = source
         self.transformer = transformer
@@ -24,33 +26,24 @@ class InsiderTransactionsTask:
         self.raw_writer = raw_writer
         self.staging_writer = staging_writer
         self.final_writer = final_writer
+        # optional: skip filings already in the DB before transforming them
+        self.accession_filter = accession_filter
 
         self.log = Logger(self.__class__.__name__)
     
     # ----------------------------------------------------------
-    # Main Task Runner
+    # Stages (run() chains them; DAG schedulers call them directly)
     # ----------------------------------------------------------
-    def run(self, params: dict, raw_path_override: str = None):
+    def extract(self, params: dict | None = None, raw_path_override: str = None, raw: list[dict] = None) -> list[dict]:
         """
-        Run the Insider Transactions ETL.
-
-        Two modes:
-        1. Normal API mode → params provided
-        2. Test mode → raw_path_override provided (skip API)
-
-        params should include:
-            query_string: str (issuer.tradingSymbol:AMZN)
-            start_date: str (YYYY-MM-DD)
-            end_date: str   (YYYY-MM-DD)
+        1. EXTRACT → raw filings, minus those already loaded.
         """
-        self.log.info("=== InsiderTransactionsTask START ===")
-        # ------------------------------------------------------
-        # 1. EXTRACT (raw JSON from SEC API)
         # ------------------------------------------------------
+        # ARCHIVE / TEST MODE: raw filings or a raw JSON path provided
         # ------------------------------------------------------
-        # TEST MODE: use provided raw JSON path
-        # ------------------------------------------------------
-        if raw_path_override:
+        if raw is not None:
+            self.log.info(f"[ARCHIVE MODE] Using {len(raw)} archived filings")
+        elif raw_path_override:
             self.log.info(f"[TEST MODE] Loading raw insider data from {raw_path_override}")
             raw = self.raw_writer.load_json(raw_path_override)
         else:
@@ -58,37 +51,110 @@ class InsiderTransactionsTask:
             # NORMAL MODE: fetch from API
             # ------------------------------------------------------
             query_string = params["query_string"]
-            start_date = params["start_date"]
-            end_date= params["end_date"]
 
-            raw = self.source.fetch_insider_transactions(query_string, start_date, end_date)
-            # Convert generator to list
-            # task layer is responsible for buffering before writing raw files.
-            raw = list(raw)
+            with span("transactions.extract") as s:
+                if params.get("since") is not None:
+                    # poll mode: only filings newer than `since`
+                    raw = self.source.fetch_insider_transactions_since(query_string, params["since"])
+                else:
+                    raw = self.source.fetch_insider_transactions(
+                        query_string, params["start_date"], params["end_date"]
+                    )
+                # Convert generator to list
+                # task layer is responsible for buffering before writing raw files.
+                raw = list(raw)
+                s.rows_out = len(raw)
             self.log.info(f"[EXTRACT] Raw filing records = {len(raw)}")
 
-            raw_path = self.raw_writer.save(f"insider_transactions_{start_date}_{end_date}", raw)
-            self.log.info(f"[RAW] Saved → {raw_path}")
+            with span("transactions.raw_write", rows_in=len(raw)) as s:
+                added, skipped = self.raw_writer.save_filings(raw)
+                s.rows_out = added
+            self.log.info(f"[RAW] Archived → added={added}, already archived={skipped}")
 
-        # ------------------------------------------------------
-        # 2. TRANSFORM (normalize → clean → dedupe → validate)
-        #    This also writes intermediate staging artifacts
-        # ------------------------------------------------------
-        df_final = self.transformer.transform(raw, staging_writer=self.staging_writer)
+        if self.accession_filter:
+            with span("transactions.skip_loaded", rows_in=len(raw)) as s:
+                raw = self.accession_filter.drop_loaded(raw)
+                s.rows_out = len(raw)
+        return raw
+
+    def transform(self, raw: list[dict]):
+        """
+        2. TRANSFORM (normalize → clean → dedupe → validate)
+           This also writes intermediate staging artifacts.
+        Returns None when there is nothing to transform.
+        """
+        if not raw:
+            self.log.info("[SKIP] Every filing is already loaded → nothing to do")
+            return None
+
+        with span("transactions.transform", rows_in=len(raw)) as s:
+            df_final = self.transformer.transform(raw, staging_writer=self.staging_writer)
+            s.rows_out = len(df_final)
         self.log.info(f"[TRANSFORM] Final row count = {len(df_final)}")
+        return df_final
 
-        # ------------------------------------------------------
-        # 3. STRICT FINAL WRITE (Gold)
-        #    Validates schema + types before writing Parquet.
-        # ------------------------------------------------------
-        if self.final_writer:
-            final_path = self.final_writer.save("insider_transactions_final", df_final)
+    def write_final(self, df_final) -> None:
+        """
+        3. STRICT FINAL WRITE (Gold)
+           Validates schema + types before writing Parquet.
+        """
+        if self.final_writer and df_final is not None:
+            with span("transactions.final", rows_in=len(df_final)):
+                final_path = self.final_writer.save("insider_transactions_final", df_final)
             self.log.info(f"[FINAL] Gold-layer Parquet saved to {final_path}")
 
-        # ----------------------------
-        # 4. LOAD → DB (append-only / slow-changing)
-        # ----------------------------
-        self.loader.load(df_final)
+    def replace_final(self, df_final, start, end, accessions) -> None:
+        """
+        3b. Re-runnable FINAL WRITE for a filed_at window (backfill shards):
+            swaps the gold rows of `accessions` filed in [start, end) for
+            df_final, so a retried window is not appended twice.
+        """
+        if self.final_writer and df_final is not None:
+            with span("transactions.final", rows_in=len(df_final)):
+                version = self.final_writer.replace(
+                    "insider_transactions_final", df_final, "filed_at", start, end,
+                    key="accession_no", keys=accessions,
+                )
+            self.log.info(f"[FINAL] Gold-layer rows for {start} → {end} swapped → version {version}")
+
+    def load(self, df_final):
+        """
+        4. LOAD → DB (append-only / slow-changing). Returns what was loaded.
+        """
+        if df_final is None:
+            return None
+
+        with span("transactions.load", rows_in=len(df_final)):
+            self.loader.load(df_final)
         self.log.info("[LOAD] Successfully loaded into database")
+        return df_final
+
+    # ----------------------------------------------------------
+    # Main Task Runner
+    # ----------------------------------------------------------
+    def run(self, params: dict, raw_path_override: str = None, raw: list[dict] = None):
+        """
+        Run the Insider Transactions ETL.
+
+        Three modes:
+        1. Normal API mode → params provided
+        2. Test mode → raw_path_override provided (skip API)
+        3. Archive mode → raw filings provided (e.g. from RawArchive, skip API)
+
+        params should include:
+            query_string: str (issuer.tradingSymbol:AMZN)
+            start_date: str (YYYY-MM-DD)
+            end_date: str   (YYYY-MM-DD)
+        or, instead of the dates:
+            since: datetime (fetch filings with filedAt >= since)
+
+        Returns the loaded DataFrame (None if every filing was skipped).
+        """
+        self.log.info("=== InsiderTransactionsTask START ===")
+
+        df_final = self.transform(self.extract(params, raw_path_override, raw))
+        self.write_final(df_final)
+        loaded = self.load(df_final)
 
         self.log.info("=== InsiderTransactionsTask COMPLETE ===")
+        return loaded
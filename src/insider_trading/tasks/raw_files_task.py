@@ -0,0 +1,102 @@
+import json
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+
+from db.file_ledger import ProcessedFileLedger, file_sha256
+from utils.logger import Logger
+
+
+class RawFilesTask:
+    """
+    Run raw JSON files through the pipeline once each:
+        stat lookup → (hash → ledger lookup) → skip | process → record in ledger
+
+    A file whose path, size and mtime match a loaded ledger entry is
+    skipped without being read; only new or changed files are hashed.
+
+    `process(path)` loads one file and returns (filings, rows loaded).
+    Files the ledger already has as loaded are skipped unless `force`.
+    Every run writes a manifest of what it loaded, skipped or failed to
+    `<manifest_dir>/build_dataset_<ts>.json`. Processing stops at the
+    first failure (after recording it), like a plain pipeline run.
+    """
+
+    def __init__(self, ledger: ProcessedFileLedger, process, manifest_dir: str | Path = "data/manifests"):
+        self.ledger = ledger
+        self.process = process
+        self.manifest_dir = Path(manifest_dir)
+        self.log = Logger(self.__class__.__name__)
+
+    def _run_file(self, path: Path, force: bool) -> dict:
+        st = path.stat()
+        resolved = str(path.resolve())
+        entry = {"file": str(path), "size_bytes": st.st_size}
+
+        if not force:
+            known = self.ledger.get_by_stat(resolved, st.st_size, st.st_mtime_ns)
+            if known and known["status"] == ProcessedFileLedger.LOADED:
+                self.log.info(f"[LEDGER] {path.name}: unchanged since loaded → skipping (--force to reprocess)")
+                return entry | {"sha256": known["sha256"], "status": "skipped"}
+
+        entry["sha256"] = file_sha256(path)
+        stat = {"path": resolved, "mtime_ns": st.st_mtime_ns}
+
+        if not force and self.ledger.is_loaded(entry["sha256"]):
+            # e.g. a renamed or touched copy: no need to hash it next time
+            self.ledger.set_stat(entry["sha256"], **stat)
+            self.log.info(f"[LEDGER] {path.name}: already loaded → skipping (--force to reprocess)")
+            return entry | {"status": "skipped"}
+
+        t0 = time.perf_counter()
+        try:
+            filings, rows = self.process(path)
+        except Exception as e:
+            self.ledger.record(
+                entry["sha256"], path.name, entry["size_bytes"], ProcessedFileLedger.FAILED, error=repr(e), **stat
+            )
+            return entry | {"status": ProcessedFileLedger.FAILED, "error": repr(e), "wall_s": time.perf_counter() - t0}
+
+        self.ledger.record(
+            entry["sha256"], path.name, entry["size_bytes"], ProcessedFileLedger.LOADED, filings, rows, **stat
+        )
+        self.log.info(f"[LEDGER] {path.name}: loaded → filings={filings}, rows={rows}")
+        return entry | {
+            "status": ProcessedFileLedger.LOADED,
+            "filings": filings,
+            "rows_loaded": rows,
+            "wall_s": time.perf_counter() - t0,
+        }
+
+    def run(self, files: list[Path], force: bool = False) -> dict:
+        started_at = datetime.now(UTC)
+        entries = []
+        for path in files:
+            entries.append(self._run_file(Path(path), force))
+            if entries[-1]["status"] == ProcessedFileLedger.FAILED:
+                break
+
+        manifest = {
+            "run": "build_dataset",
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now(UTC).isoformat(),
+            "force": force,
+            "files": entries,
+            "totals": {
+                status: sum(e["status"] == status for e in entries)
+                for status in ("loaded", "skipped", "failed")
+            } | {
+                "not_reached": len(files) - len(entries),
+                "filings": sum(e.get("filings") or 0 for e in entries),
+                "rows_loaded": sum(e.get("rows_loaded") or 0 for e in entries),
+            },
+        }
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        path = self.manifest_dir / f"build_dataset_{started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        path.write_text(json.dumps(manifest, indent=2))
+        self.log.info(f"[MANIFEST] {manifest['totals']} → {path}")
+
+        failed = [e for e in entries if e["status"] == ProcessedFileLedger.FAILED]
+        if failed:
+            raise RuntimeError(f"[RawFilesTask] {failed[0]['file']} failed: {failed[0]['error']}")
+        return manifest
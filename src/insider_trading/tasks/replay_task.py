@@ -0,0 +1,104 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import pandas as pd
+
+from utils.logger import Logger
+
+
+def _transform(transformer, batch: list[dict]) -> pd.DataFrame:
+    # module level so worker processes can unpickle it
+    return transformer.transform(batch)
+
+
+class ReplayTask:
+    """
+    Re-run the transform over archived raw filings, no API calls:
+        RawArchive → Transform (parallel) → Gold (new version) → DB swap
+
+    Used after changing business rules (e.g. the validate() filters) to
+    rebuild the rows of every archived filing filed in [start, end]. Both
+    the gold dataset and insider_transactions are swapped for those
+    filings as a unit, so readers never see a mix of old and new rules.
+    Filings in the range that never reached the archive keep their rows.
+    """
+
+    DATASET = "insider_transactions_final"
+
+    def __init__(self, archive, transformer, final_writer, db, workers: int = 4):
+        self.archive = archive
+        self.transformer = transformer
+        self.final_writer = final_writer
+        self.db = db
+        self.workers = workers
+
+        self.log = Logger(self.__class__.__name__)
+
+    # ----------------------------------------------------------
+    # Transform
+    # ----------------------------------------------------------
+    def _transform_batches(self, batches) -> list[pd.DataFrame]:
+        if self.workers <= 1:
+            return [_transform(self.transformer, b) for b in batches]
+
+        # keep a bounded number of batches in flight so the archive is
+        # streamed rather than read into memory up front
+        frames, pending = [], []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for batch in batches:
+                pending.append(pool.submit(_transform, self.transformer, batch))
+                if len(pending) >= 2 * self.workers:
+                    frames.append(pending.pop(0).result())
+            frames.extend(f.result() for f in pending)
+        return frames
+
+    def _empty(self) -> pd.DataFrame:
+        # nothing survived the rules: still swap, with correctly typed columns
+        df = pd.DataFrame(columns=self.transformer.SCHEMA)
+        for col in ["filed_at", "period_of_report", "transaction_date"]:
+            df[col] = pd.to_datetime(df[col], utc=True)
+        return df
+
+    # ----------------------------------------------------------
+    # Main Task Runner
+    # ----------------------------------------------------------
+    def run(self, start: str, end: str, batch_size: int = 10_000) -> dict:
+        """
+        Replay filings filed from `start` to `end` (YYYY-MM-DD, inclusive, UTC).
+        """
+        self.log.info(f"=== ReplayTask START ({start} → {end}, workers={self.workers}) ===")
+
+        lo = pd.Timestamp(start, tz="UTC")
+        hi = pd.Timestamp(end, tz="UTC") + timedelta(days=1)
+
+        # every archived filing is swapped, including ones whose rows the
+        # new rules drop entirely
+        accessions = set()
+
+        def batches():
+            for batch in self.archive.iter_batches(start, end, batch_size=batch_size):
+                accessions.update(self.archive.key(filing) for filing in batch)
+                yield batch
+
+        frames = [f for f in self._transform_batches(batches()) if not f.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else self._empty()
+        # the archive indexes on the same UTC filed date; keep the swap exact
+        df = df[(df["filed_at"] >= lo) & (df["filed_at"] < hi)]
+        self.log.info(f"[TRANSFORM] Replayed {len(accessions)} filings → {len(df)} rows")
+
+        # DB first: if it fails, gold is untouched and both keep the old
+        # rules. Both swaps are idempotent, so a gold failure after the
+        # commit is repaired by replaying the range again.
+        stats = self.db.replace_transactions(df, lo.to_pydatetime(), hi.to_pydatetime(), accessions)
+        try:
+            version = self.final_writer.replace(
+                self.DATASET, df, "filed_at", lo, hi, key="accession_no", keys=accessions
+            )
+        except Exception:
+            self.log.error(f"[FINAL] DB replaced but {self.DATASET} was not → replay {start} → {end} again")
+            raise
+        self.log.info(f"[FINAL] {self.DATASET} now at version {version}")
+        stats["gold_version"] = version
+
+        self.log.info(f"=== ReplayTask COMPLETE {stats} ===")
+        return stats
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from utils.metrics import measured
 from .normalize_transactions import normalize_transactions
 
 class InsiderTransactionsTransformer:
@@ -126,19 +127,19 @@ class InsiderTransactionsTransformer:
     def transform(self, raw: list[dict], staging_writer=None) -> pd.DataFrame:
         """Full ETL transform step with optional staging outputs."""
 
-        df = self.normalize(raw)
+        df = measured("normalize", self.normalize, raw)
         if staging_writer:
             staging_writer.save("insider_normalized", df)
 
-        df = self.clean(df)
+        df = measured("clean", self.clean, df)
         if staging_writer:
             staging_writer.save("insider_cleaned", df)
 
-        df = self.dedupe(df)
+        df = measured("dedupe", self.dedupe, df)
         if staging_writer:
             staging_writer.save("insider_deduped", df)
 
-        df = self.validate(df)
+        df = measured("validate", self.validate, df)
         if staging_writer:
             staging_writer.save("insider_validated", df)
 
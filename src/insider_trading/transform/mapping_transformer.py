@@ -1,5 +1,7 @@
 import pandas as pd
 
+from utils.metrics import measured
+
 class MappingTransformer:
     """Normalizes exchange mapping raw JSON into DB-ready rows."""
     # Final DB schema
@@ -80,22 +82,22 @@ class MappingTransformer:
         """
 
         # Normalize -----------------------------------------------
-        df = self.normalize(raw)
+        df = measured("normalize", self.normalize, raw)
         if staging_writer:
             staging_writer.save("exchange_mapping_normalized", df)
 
         # Clean ----------------------------------------------------
-        df = self.clean(df)
+        df = measured("clean", self.clean, df)
         if staging_writer:
             staging_writer.save("exchange_mapping_cleaned", df)
 
         # Dedupe ---------------------------------------------------
-        df = self.dedupe(df)
+        df = measured("dedupe", self.dedupe, df)
         if staging_writer:
             staging_writer.save("exchange_mapping_deduped", df)
 
         # Validate -------------------------------------------------
-        df = self.validate(df)
+        df = measured("validate", self.validate, df)
         if staging_writer:
             staging_writer.save("exchange_mapping_validated", df)
 
@@ -0,0 +1,164 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable
+
+from utils.logger import Logger
+
+
+class DAGRun:
+    """
+    Outcome of DAG.run():
+      - results:       task name → return value
+      - timings:       task name → (start, end) seconds since the run began
+      - critical_path: longest chain of dependent tasks by wall time
+      - wall:          total run wall time
+    """
+
+    def __init__(self, results: dict, timings: dict, critical_path: list[str], wall: float):
+        self.results = results
+        self.timings = timings
+        self.critical_path = critical_path
+        self.wall = wall
+
+    def task_wall(self, name: str) -> float:
+        start, end = self.timings[name]
+        return end - start
+
+    @property
+    def critical_wall(self) -> float:
+        return sum(self.task_wall(n) for n in self.critical_path)
+
+    def report(self) -> str:
+        lines = [f"{'task':<32} {'start':>8} {'wall':>8}"]
+        for name, (start, end) in sorted(self.timings.items(), key=lambda kv: kv[1][0]):
+            mark = " *" if name in self.critical_path else ""
+            lines.append(f"{name:<32} {start:>7.2f}s {end - start:>7.2f}s{mark}")
+        lines.append(
+            f"total {self.wall:.2f}s; critical path ({self.critical_wall:.2f}s, *): "
+            + " → ".join(self.critical_path)
+        )
+        return "\n".join(lines)
+
+
+class DAG:
+    """
+    Minimal task graph executor.
+
+    Tasks declare
+      - inputs: upstream tasks whose results are passed positionally to `fn`
+      - after:  upstream tasks that must finish first, results not needed
+    and run on a thread pool as soon as their upstreams are done, so
+    independent stages (e.g. API extracts, pandas transforms) overlap.
+
+    If a task raises, nothing new is started; running tasks finish, then
+    the first error is re-raised.
+    """
+
+    def __init__(self, name: str = "dag", max_workers: int = 4):
+        self.name = name
+        self.max_workers = max_workers
+        self.tasks: dict[str, tuple[Callable, tuple[str, ...], tuple[str, ...]]] = {}
+        self.log = Logger(self.__class__.__name__)
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Iterable[str] = (),
+        after: Iterable[str] = (),
+    ) -> "DAG":
+        if name in self.tasks:
+            raise ValueError(f"[DAG] Duplicate task '{name}'")
+        self.tasks[name] = (fn, tuple(inputs), tuple(after))
+        return self
+
+    def deps(self, name: str) -> tuple[str, ...]:
+        _, inputs, after = self.tasks[name]
+        return inputs + tuple(a for a in after if a not in inputs)
+
+    # ----------------------------------------------------------------------
+    # Graph checks
+    # ----------------------------------------------------------------------
+    def topological_order(self) -> list[str]:
+        for name in self.tasks:
+            missing = [d for d in self.deps(name) if d not in self.tasks]
+            if missing:
+                raise ValueError(f"[DAG] Task '{name}' depends on unknown task(s) {missing}")
+
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"[DAG] Cycle: {' → '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.deps(name):
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.tasks:
+            visit(name, [])
+        return order
+
+    def critical_path(self, durations: dict[str, float]) -> list[str]:
+        """Chain of dependent tasks with the largest summed duration."""
+        best: dict[str, tuple[float, list[str]]] = {}
+        for name in self.topological_order():
+            upstream = max(
+                (best[d] for d in self.deps(name)),
+                key=lambda b: b[0],
+                default=(0.0, []),
+            )
+            best[name] = (upstream[0] + durations.get(name, 0.0), upstream[1] + [name])
+        return max(best.values(), key=lambda b: b[0], default=(0.0, []))[1]
+
+    # ----------------------------------------------------------------------
+    # Execution
+    # ----------------------------------------------------------------------
+    def run(self) -> DAGRun:
+        self.topological_order()  # validate before starting anything
+
+        results, timings = {}, {}
+        pending = set(self.tasks)
+        running = {}
+        error = None
+        t0 = time.perf_counter()
+
+        def call(name):
+            fn, inputs, _ = self.tasks[name]
+            start = time.perf_counter() - t0
+            try:
+                return fn(*(results[i] for i in inputs))
+            finally:
+                timings[name] = (start, time.perf_counter() - t0)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name) as pool:
+            while pending or running:
+                if error is None:
+                    ready = [n for n in pending if all(d in results for d in self.deps(n))]
+                    for name in sorted(ready):
+                        pending.discard(name)
+                        running[pool.submit(call, name)] = name
+                        self.log.info(f"[DAG] {self.name}: start {name}")
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        self.log.error(f"[DAG] {self.name}: {name} failed: {future.exception()!r}")
+                        error = error or future.exception()
+                    else:
+                        results[name] = future.result()
+
+        if error is not None:
+            raise error
+
+        durations = {n: end - start for n, (start, end) in timings.items()}
+        dag_run = DAGRun(results, timings, self.critical_path(durations), time.perf_counter() - t0)
+        self.log.info(f"[DAG] {self.name} complete\n{dag_run.report()}")
+        return dag_run
@@ -10,11 +10,16 @@ class OrchestratorPipeline:
         self.insider_pipeline = InsiderTradingPipeline(InsiderTradingConfig(), ETLDatabase())
         #self.ohlc_pipeline = OhlcPipeline(config=self.ohlc_config)
 
-    def run(self):
+    def run(self, max_workers: int = 4):
         self.log.info("Starting Orchestrator...")
-        self.insider_pipeline.run()
+        # stages run as a DAG: independent extract / transform work overlaps
+        dag_run = self.insider_pipeline.run(max_workers=max_workers)
         #self.ohlc_pipeline.run()
-        self.log.info("All pipelines completed.")
+        self.log.info(
+            f"All pipelines completed in {dag_run.wall:.2f}s "
+            f"(critical path: {' → '.join(dag_run.critical_path)})"
+        )
+        return dag_run
 
 if __name__ == "__main__":
     pipeline = OrchestratorPipeline()
@@ -0,0 +1,142 @@
+import os
+import resource
+import tracemalloc
+from contextvars import ContextVar
+
+# Opt-in memory profiling for utils.metrics spans.
+#
+# Enabled with enable() (CLI --profile-memory / MEMORY_PROFILE=1). While
+# off, spans only test `metrics._memory is None`, so there is no cost.
+# While on, every span records
+#   - mem_peak_bytes:  tracemalloc peak above the span's starting level
+#   - rss_delta_bytes: resident set size change across the span
+#   - allocation sites whose live size grew during the span
+# tracemalloc is process-wide, so run pipeline stages one at a time
+# (the pipeline does this while profiling) for clean attribution.
+
+ENV_FLAG = "MEMORY_PROFILE"
+TRACE_FRAMES = 1
+SITES_PER_SPAN = 10
+
+_open: ContextVar["_Frame | None"] = ContextVar("memprofile_open", default=None)
+
+
+def env_enabled() -> bool:
+    return os.getenv(ENV_FLAG, "").lower() in ("1", "true", "yes")
+
+
+def rss_bytes() -> int:
+    """Current RSS (Linux /proc), else the peak RSS getrusage reports."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss: KiB on Linux, bytes on macOS; close enough as a fallback
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class _Frame:
+    """Memory state of one open span."""
+
+    def __init__(self, parent: "_Frame | None"):
+        self.parent = parent
+        # tracemalloc keeps one peak; children reset it, so the parent's
+        # high-water mark so far is folded in first and the child hands
+        # its absolute peak back up through child_peak when it exits
+        self.child_peak = 0
+        if parent is not None:
+            parent.child_peak = max(parent.child_peak, tracemalloc.get_traced_memory()[1])
+        # snapshot first, so its own memory sits below start_traced
+        self.snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        self.start_traced, _ = tracemalloc.get_traced_memory()
+        self.start_rss = rss_bytes()
+        tracemalloc.reset_peak()
+
+
+class MemoryProfiler:
+    def __init__(self, sites_per_span: int = SITES_PER_SPAN):
+        self.sites_per_span = sites_per_span
+        self.started_here = not tracemalloc.is_tracing()
+        if self.started_here:
+            tracemalloc.start(TRACE_FRAMES)
+
+    def enter(self):
+        frame = _Frame(_open.get())
+        return frame, _open.set(frame)
+
+    def exit(self, entered, span) -> None:
+        frame, token = entered
+        _open.reset(token)
+
+        _, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, frame.child_peak)
+        span.mem_peak = max(peak - frame.start_traced, 0)
+        span.rss_delta = rss_bytes() - frame.start_rss
+
+        after = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        span.sites = [
+            (str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+            for stat in after.compare_to(frame.snapshot, "lineno")[: self.sites_per_span]
+            if stat.size_diff > 0
+        ]
+
+        if frame.parent is not None:
+            frame.parent.child_peak = max(frame.parent.child_peak, peak)
+
+    def stop(self) -> None:
+        if self.started_here and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def enable(sites_per_span: int = SITES_PER_SPAN) -> MemoryProfiler:
+    """Turn on memory profiling for all subsequent spans."""
+    from utils import metrics
+
+    if metrics._memory is None:
+        metrics._memory = MemoryProfiler(sites_per_span)
+    return metrics._memory
+
+
+def disable() -> None:
+    from utils import metrics
+
+    if metrics._memory is not None:
+        metrics._memory.stop()
+        metrics._memory = None
+
+
+def enabled() -> bool:
+    from utils import metrics
+
+    return metrics._memory is not None
+
+
+def format_report(run, top: int = 15) -> str:
+    """Stages ranked by peak, then the largest allocation sites."""
+    report = run.report()
+    stages = [
+        (name, s) for name, s in report["stages"].items() if s.get("mem_peak_bytes") is not None
+    ]
+    stages.sort(key=lambda kv: kv[1]["mem_peak_bytes"], reverse=True)
+
+    mib = 1024**2
+    lines = [f"{'stage':<44} {'peak MiB':>10} {'RSS Δ MiB':>10}"]
+    for name, s in stages[:top]:
+        lines.append(f"{name:<44} {s['mem_peak_bytes'] / mib:>10.1f} {s['rss_delta_bytes'] / mib:>10.1f}")
+
+    lines.append("")
+    lines.append(f"{'top allocation sites':<60} {'MiB':>8} {'blocks':>8}  stage")
+    for site in report.get("memory_top_sites", [])[:top]:
+        lines.append(
+            f"{site['site']:<60} {site['size_diff_bytes'] / mib:>8.1f} "
+            f"{site['count_diff']:>8}  {site['stage']}"
+        )
+    return "\n".join(lines)
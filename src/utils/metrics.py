@@ -0,0 +1,244 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, UTC
+from pathlib import Path
+
+# Lightweight per-run stage metrics.
+#
+#   with span("transactions.transform", rows_in=len(raw)) as s:
+#       df = ...
+#       s.rows_out = len(df)
+#
+# Spans opened inside another span (same thread) are named
+# "<parent>.<name>", so shared code (transformers, writers) reports under
+# whichever task called it. Repeated names are summed in the report.
+
+_parent: ContextVar[str | None] = ContextVar("metrics_parent", default=None)
+
+# utils.memprofile.MemoryProfiler while memory profiling is on
+_memory = None
+
+
+class Span:
+    def __init__(self, name: str, rows_in: int | None = None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out: int | None = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        # memory profiling only
+        self.mem_peak: int | None = None
+        self.rss_delta: int | None = None
+        self.sites: list[tuple[str, int, int]] = []
+
+
+class RunMetrics:
+    """
+    Spans recorded during one pipeline run, emitted as a JSON report and
+    a Prometheus textfile (node_exporter textfile collector format).
+    """
+
+    PROM_PREFIX = "insider_etl"
+
+    def __init__(self, name: str = "run"):
+        self.name = name
+        self.started_at = datetime.now(UTC)
+        self._t0 = time.perf_counter()
+        self._stages: dict[str, dict] = {}
+        self._sites: dict[tuple[str, str], list[int]] = {}
+        self.extra: dict = {}
+        # filedAt → committed lag of the latest micro-batch (poll mode)
+        self.freshness: dict | None = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, rows_in: int | None = None):
+        parent = _parent.get()
+        s = Span(f"{parent}.{name}" if parent else name, rows_in)
+        token = _parent.set(s.name)
+
+        memory = _memory
+        entered = memory.enter() if memory is not None else None
+
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+        try:
+            yield s
+        finally:
+            # thread CPU: stages run concurrently on DAG worker threads
+            s.wall = time.perf_counter() - wall0
+            s.cpu = time.thread_time() - cpu0
+            if entered is not None:
+                memory.exit(entered, s)
+            _parent.reset(token)
+            self._record(s)
+
+    def _record(self, s: Span) -> None:
+        # aggregated on the fly, so memory stays per stage name, not per call
+        with self._lock:
+            stage = self._stages.setdefault(
+                s.name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows_in": None, "rows_out": None}
+            )
+            stage["calls"] += 1
+            stage["wall_s"] += s.wall
+            stage["cpu_s"] += s.cpu
+            for key, value in (("rows_in", s.rows_in), ("rows_out", s.rows_out)):
+                if value is not None:
+                    stage[key] = (stage[key] or 0) + value
+
+            if s.mem_peak is not None:
+                stage["mem_peak_bytes"] = max(stage.get("mem_peak_bytes", 0), s.mem_peak)
+                stage["rss_delta_bytes"] = stage.get("rss_delta_bytes", 0) + s.rss_delta
+                for site, size, count in s.sites:
+                    totals = self._sites.setdefault((s.name, site), [0, 0])
+                    totals[0] += size
+                    totals[1] += count
+
+    def record_freshness(self, lags_s: list[float], newest_filed_at: datetime | None) -> None:
+        """
+        Seconds from filedAt to DB commit for the filings of one batch.
+        Filing counts accumulate; lag quantiles describe the latest
+        non-empty batch. newest_filed_at is the loaded high-water mark.
+        """
+        with self._lock:
+            fresh = self.freshness or {"filings": 0, "batches": 0}
+            fresh["batches"] += 1
+            fresh["polled_at"] = datetime.now(UTC).timestamp()
+            if newest_filed_at is not None:
+                fresh["newest_filed_at"] = newest_filed_at.timestamp()
+            if lags_s:
+                lags = sorted(lags_s)
+                fresh["filings"] += len(lags)
+                fresh["lag_s"] = {
+                    q: lags[min(int(q * len(lags)), len(lags) - 1)] for q in (0.5, 0.95)
+                } | {1.0: lags[-1]}
+            self.freshness = fresh
+
+    # ----------------------------------------------------------------------
+    # Report
+    # ----------------------------------------------------------------------
+    def stages(self) -> dict[str, dict]:
+        with self._lock:
+            stages = {name: dict(values) for name, values in self._stages.items()}
+
+        for stage in stages.values():
+            rows = stage["rows_out"] if stage["rows_out"] is not None else stage["rows_in"]
+            stage["rows_per_s"] = rows / stage["wall_s"] if rows and stage["wall_s"] > 0 else None
+        return stages
+
+    def top_sites(self, n: int = 25) -> list[dict]:
+        """Allocation sites that grew the most during a span, largest first."""
+        with self._lock:
+            sites = sorted(self._sites.items(), key=lambda kv: kv[1][0], reverse=True)[:n]
+        return [
+            {"stage": stage, "site": site, "size_diff_bytes": size, "count_diff": count}
+            for (stage, site), (size, count) in sites
+        ]
+
+    def report(self) -> dict:
+        report = {
+            "run": self.name,
+            "started_at": self.started_at.isoformat(),
+            "wall_s": time.perf_counter() - self._t0,
+            "stages": self.stages(),
+            **self.extra,
+        }
+        if self._sites:
+            report["memory_top_sites"] = self.top_sites()
+        if self.freshness is not None:
+            report["freshness"] = self.freshness
+        return report
+
+    def prometheus(self) -> str:
+        report = self.report()
+        p = self.PROM_PREFIX
+        lines = []
+
+        def gauge(metric, help_text, samples):
+            lines.append(f"# HELP {p}_{metric} {help_text}")
+            lines.append(f"# TYPE {p}_{metric} gauge")
+            lines.extend(f"{p}_{metric}{labels} {value}" for labels, value in samples)
+
+        run = f'{{run="{self.name}"}}'
+        gauge("run_wall_seconds", "Wall time of the last run.", [(run, report["wall_s"])])
+        gauge("run_timestamp_seconds", "Start of the last run (unix time).",
+              [(run, self.started_at.timestamp())])
+
+        for key, metric, help_text in [
+            ("wall_s", "stage_wall_seconds", "Wall time per stage in the last run."),
+            ("cpu_s", "stage_cpu_seconds", "Thread CPU time per stage in the last run."),
+            ("rows_in", "stage_rows_in", "Rows entering each stage in the last run."),
+            ("rows_out", "stage_rows_out", "Rows leaving each stage in the last run."),
+            ("rows_per_s", "stage_rows_per_second", "Stage throughput in the last run."),
+            ("mem_peak_bytes", "stage_mem_peak_bytes", "Traced memory peak per stage (profiling runs)."),
+            ("rss_delta_bytes", "stage_rss_delta_bytes", "RSS change per stage (profiling runs)."),
+        ]:
+            samples = [
+                (f'{{run="{self.name}",stage="{stage}"}}', values[key])
+                for stage, values in sorted(report["stages"].items())
+                if values.get(key) is not None
+            ]
+            if samples:
+                gauge(metric, help_text, samples)
+
+        fresh = report.get("freshness")
+        if fresh:
+            gauge("freshness_filings_total", "Filings committed by this poll run.", [(run, fresh["filings"])])
+            gauge("freshness_poll_timestamp_seconds", "End of the last poll (unix time).", [(run, fresh["polled_at"])])
+            if "newest_filed_at" in fresh:
+                gauge("freshness_newest_filed_at_seconds", "Newest filedAt committed (unix time).",
+                      [(run, fresh["newest_filed_at"])])
+            if "lag_s" in fresh:
+                gauge("freshness_lag_seconds", "filedAt → committed lag in the last non-empty batch.",
+                      [(f'{{run="{self.name}",quantile="{q}"}}', v) for q, v in fresh["lag_s"].items()])
+        return "\n".join(lines) + "\n"
+
+    def emit(self, directory: str | Path) -> tuple[Path, Path]:
+        """
+        Write <directory>/<run>_<ts>.json and <directory>/<run>.prom.
+        The textfile is replaced atomically so collectors never read it half-written.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        ts = self.started_at.strftime("%Y%m%d_%H%M%S")
+        json_path = directory / f"{self.name}_{ts}.json"
+        json_path.write_text(json.dumps(self.report(), indent=2, default=str))
+
+        prom_path = directory / f"{self.name}.prom"
+        tmp = prom_path.with_name(prom_path.name + ".tmp")
+        tmp.write_text(self.prometheus())
+        os.replace(tmp, prom_path)
+        return json_path, prom_path
+
+
+# ----------------------------------------------------------------------
+# Current run
+# ----------------------------------------------------------------------
+_current = RunMetrics()
+
+
+def start_run(name: str) -> RunMetrics:
+    """Begin collecting a fresh run; module-level span() records into it."""
+    global _current
+    _current = RunMetrics(name)
+    return _current
+
+
+def current_run() -> RunMetrics:
+    return _current
+
+
+def span(name: str, rows_in: int | None = None):
+    return _current.span(name, rows_in)
+
+
+def measured(name: str, fn, data):
+    """fn(data) inside span(name), with rows in / out taken from len()."""
+    with span(name, rows_in=len(data)) as s:
+        out = fn(data)
+        s.rows_out = len(out)
+    return out
@@ -1,3 +1,4 @@
+import re
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
@@ -22,3 +23,11 @@ def iterate_months(start_date: str, end_date: str):
 
         # Move to first day of next month
         current = next_month
+
+
+def name_tokens(name: str) -> set[str]:
+    """Lower-case alphabetic tokens of a person/company name ("Musk, Elon" → {"musk", "elon"})."""
+    if not isinstance(name, str):
+        return set()
+    # removes punctuation, commas, dots, numbers
+    return set(re.findall(r"[a-z]+", name.casefold()))
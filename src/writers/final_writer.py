@@ -1,9 +1,26 @@
+import fcntl
+import json
+import os
+import threading
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, UTC
 from typing import Dict, Any
 
+import numpy as np
 import pandas as pd
-from pandas.api.types import is_datetime64_any_dtype, is_datetime64tz_dtype
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.api.types import is_datetime64_any_dtype
+
+from utils.logger import Logger
+
+MANIFEST_FILE = "_manifest.json"
+# flock'd around manifest read-modify-writes; saves may come from other processes
+LOCK_FILE = "_manifest.lock"
+# Hive's name for a NULL partition value (DuckDB / Arrow read it back as NULL)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
 
 
 class FinalWriter:
@@ -11,22 +28,46 @@ class FinalWriter:
     Strict 'Gold' layer writer.
 
     Validates DataFrame columns + types, then writes Parquet.
+
+    `enforce_types` declares column types as a pa.Schema, or as a dict of
+    Arrow types / Python types (str, float, int, bool) / "datetime64[ns, UTC]".
+
+    Two layouts:
+      - flat (default): one `<name>[_<ts>].parquet` per save
+      - partitioned (`partition_by=<datetime column>`): a hive-style dataset
+        `<name>/year=YYYY/month=MM/part-*.parquet` plus `<name>/_manifest.json`
+        listing every live file with its row count and min/max timestamp.
+        The manifest is replaced atomically, so readers that go through it
+        (see manifest_files) never see a half-written save or compaction.
     """
 
     def __init__(
         self,
         directory: str | Path,
         expected_schema: list[str],
-        enforce_types: Dict[str, Any] | None = None,
+        enforce_types: Dict[str, Any] | pa.Schema | None = None,
         keep_history: bool = True,
+        partition_by: str | None = None,
+        row_group_size: int = 128_000,
+        compression: str = "zstd",
     ):
         self.directory = Path(directory)
         self.directory.mkdir(parents=True, exist_ok=True)
 
         self.expected_schema = expected_schema
         self.enforce_types = enforce_types or {}
+        self.arrow_schema = to_arrow_schema(enforce_types)
         self.keep_history = keep_history
 
+        self.partition_by = partition_by
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.log = Logger(self.__class__.__name__)
+        # manifest updates are read-modify-write; saves may come from worker
+        # threads (RLock) and other processes (flock, see _locked)
+        self._manifest_lock = threading.RLock()
+        self._flocks: dict[Path, Any] = {}
+
     # ----------------------------------------------------------------------------
     # Public API
     # ----------------------------------------------------------------------------
@@ -38,6 +79,9 @@ class FinalWriter:
         # Reorder columns to canonical schema
         df = df[self.expected_schema]
 
+        if self.partition_by:
+            return self._save_partitioned(name, df)
+
         # Generate filename
         if self.keep_history:
             ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
@@ -47,9 +91,215 @@ class FinalWriter:
 
         path = self.directory / filename
 
-        df.to_parquet(path, index=False)
+        pq.write_table(
+            self._to_table(df),
+            path,
+            row_group_size=self.row_group_size,
+            compression=self.compression,
+        )
         return path
 
+    def compact(self, name: str, small_file_bytes: int = 32 * 1024**2) -> dict:
+        """
+        Merge the small files of each partition of dataset `name` into one.
+
+        New files are written first, then the manifest is swapped, then the
+        replaced files are deleted, so manifest readers stay consistent.
+        """
+        if not self.partition_by:
+            raise ValueError("[FinalWriter] compact() needs a partitioned writer (partition_by)")
+
+        dataset = self.directory / name
+        with self._locked(dataset):
+            return self._compact(name, dataset, small_file_bytes)
+
+    def _compact(self, name: str, dataset: Path, small_file_bytes: int) -> dict:
+        manifest = read_manifest(dataset)
+
+        by_partition: dict[str, list[dict]] = {}
+        for entry in manifest["files"]:
+            if entry["bytes"] < small_file_bytes:
+                by_partition.setdefault(str(Path(entry["path"]).parent), []).append(entry)
+
+        ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+        added, removed = [], []
+
+        for partition, entries in sorted(by_partition.items()):
+            if len(entries) < 2:
+                continue
+
+            df = pd.concat(
+                [pd.read_parquet(dataset / e["path"]) for e in entries],
+                ignore_index=True,
+            ).sort_values(self.partition_by, kind="stable")
+
+            rel = Path(partition) / f"part-{ts}-{uuid.uuid4().hex[:8]}-compacted.parquet"
+            added.append(self._write_file(dataset, rel, df))
+            removed.extend(entries)
+
+        if added:
+            self._update_manifest(dataset, add=added, remove=removed)
+            for entry in removed:
+                (dataset / entry["path"]).unlink(missing_ok=True)
+
+        stats = {"partitions": len(added), "files_merged": len(removed), "files_written": len(added)}
+        self.log.info(f"[COMPACT] {name}: {stats}")
+        return stats
+
+    def replace(self, name: str, df: pd.DataFrame, column: str, start, end, key=None, keys=None) -> int:
+        """
+        Swap the rows of dataset `name` whose `column` lies in [start, end)
+        for `df`, as one new manifest version (returned). With `key`, only
+        rows whose `key` column is in `keys` are swapped out.
+
+        Only files holding such rows are rewritten (minus those rows, plus
+        the new ones of their partition); like compact(), readers see the
+        old or the new version, never a mix. Flat files are left alone.
+        """
+        if not self.partition_by:
+            raise ValueError("[FinalWriter] replace() needs a partitioned writer (partition_by)")
+
+        self._validate_schema(df)
+        self._validate_types(df)
+        df = df[self.expected_schema]
+
+        dataset = self.directory / name
+        # the files to rewrite are chosen from the manifest: hold it throughout
+        with self._locked(dataset):
+            return self._replace(name, dataset, df, column, _utc(start), _utc(end), key, keys)
+
+    def _replace(self, name, dataset, df, column, start, end, key, keys) -> int:
+        kept, removed = [], []
+
+        for entry in read_manifest(dataset)["files"]:
+            path = dataset / entry["path"]
+            values = pd.read_parquet(path, columns=[column] + ([key] if key else []))
+            hit = (values[column] >= start) & (values[column] < end)
+            if key:
+                hit &= values[key].isin(keys)
+            if not hit.any():
+                continue
+
+            old = pd.read_parquet(path)
+            kept.append(old[~hit.to_numpy()])
+            removed.append(entry)
+
+        parts = [part for part in [*kept, df] if len(part)]
+        new = pd.concat(parts, ignore_index=True) if parts else df
+        ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+        run = uuid.uuid4().hex[:8]
+
+        added = []
+        for (year, month), part in new.groupby(self._partition_keys(new), sort=True):
+            rel = Path(f"year={year}") / f"month={month}" / f"part-{ts}-{run}-replaced.parquet"
+            added.append(self._write_file(dataset, rel, part.sort_values(self.partition_by, kind="stable")))
+
+        self._update_manifest(dataset, add=added, remove=removed)
+        for entry in removed:
+            (dataset / entry["path"]).unlink(missing_ok=True)
+
+        version = read_manifest(dataset)["version"]
+        self.log.info(
+            f"[REPLACE] {name} v{version}: files_rewritten={len(removed)}, "
+            f"files_written={len(added)}, rows_in={len(df)}"
+        )
+        return version
+
+    # ----------------------------------------------------------------------------
+    # Partitioned dataset
+    # ----------------------------------------------------------------------------
+    def _partition_keys(self, df: pd.DataFrame) -> list[pd.Series]:
+        col = df[self.partition_by]
+        return [
+            col.dt.strftime("%Y").fillna(NULL_PARTITION).rename("year"),
+            col.dt.strftime("%m").fillna(NULL_PARTITION).rename("month"),
+        ]
+
+    def _save_partitioned(self, name: str, df: pd.DataFrame) -> Path:
+        """Write one file per touched year/month partition; returns the dataset dir."""
+        dataset = self.directory / name
+        ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+        run = uuid.uuid4().hex[:8]
+
+        added = []
+        for (year, month), part in df.groupby(self._partition_keys(df), sort=True):
+            rel = Path(f"year={year}") / f"month={month}" / f"part-{ts}-{run}.parquet"
+            added.append(self._write_file(dataset, rel, part))
+
+        self._update_manifest(dataset, add=added)
+        return dataset
+
+    def _write_file(self, dataset: Path, rel: Path, df: pd.DataFrame) -> dict:
+        path = dataset / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(path.name + ".tmp")
+        pq.write_table(
+            self._to_table(df),
+            tmp,
+            row_group_size=self.row_group_size,
+            compression=self.compression,
+        )
+        os.replace(tmp, path)
+
+        bounds = df[self.partition_by].dropna()
+        return {
+            "path": rel.as_posix(),
+            "rows": len(df),
+            "bytes": path.stat().st_size,
+            "min": bounds.min().isoformat() if len(bounds) else None,
+            "max": bounds.max().isoformat() if len(bounds) else None,
+        }
+
+    @contextmanager
+    def _locked(self, dataset: Path):
+        """
+        Exclusive hold on `dataset`'s manifest, across threads and processes.
+        Re-entrant in the holding thread.
+        """
+        with self._manifest_lock:
+            if dataset in self._flocks:
+                yield
+                return
+
+            dataset.mkdir(parents=True, exist_ok=True)
+            with (dataset / LOCK_FILE).open("a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                self._flocks[dataset] = lock
+                try:
+                    yield
+                finally:
+                    del self._flocks[dataset]
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _update_manifest(self, dataset: Path, add: list[dict], remove: list[dict] = ()) -> None:
+        with self._locked(dataset):
+            manifest = read_manifest(dataset)
+            gone = {e["path"] for e in remove}
+
+            manifest["files"] = [e for e in manifest["files"] if e["path"] not in gone] + add
+            manifest["version"] += 1
+            manifest["updated_at"] = datetime.now(UTC).isoformat()
+            manifest["partition_by"] = self.partition_by
+
+            tmp = dataset / f"{MANIFEST_FILE}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+            tmp.write_text(json.dumps(manifest, indent=2))
+            os.replace(tmp, dataset / MANIFEST_FILE)
+
+    def _to_table(self, df: pd.DataFrame) -> pa.Table:
+        """
+        Arrow table with the declared types for enforced columns, so every
+        file of a dataset has the same schema (an all-null column would
+        otherwise be written as `null`). Other columns are inferred.
+        """
+        inferred = pa.Schema.from_pandas(df, preserve_index=False)
+        declared = set(self.arrow_schema.names)
+        schema = pa.schema([
+            self.arrow_schema.field(f.name) if f.name in declared else f
+            for f in inferred
+        ])
+        return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
     # ----------------------------------------------------------------------------
     # Validation
     # ----------------------------------------------------------------------------
@@ -68,8 +318,15 @@ class FinalWriter:
         # NOTE: do NOT check column order
 
     def _validate_types(self, df: pd.DataFrame) -> None:
-        """Strict type validation for configured columns."""
-        for col, expected in self.enforce_types.items():
+        """
+        Strict type validation against the declared Arrow schema.
+
+        Columns whose dtype already is the declared type pass on inspection
+        alone; anything else (typically object columns) gets one vectorized
+        Arrow cast, and a failed cast raises with a report of what was found.
+        """
+        for field in self.arrow_schema:
+            col = field.name
 
             if col not in df.columns:
                 raise ValueError(f"[FinalWriter] Cannot enforce type. Missing column '{col}'.")
@@ -77,30 +334,125 @@ class FinalWriter:
             series = df[col]
 
             # ----------------------------------------------------------------------
-            # Datetime with timezone enforcement: "datetime64[ns, UTC]"
+            # Timestamps: dtype inspection only, no casting
+            # ----------------------------------------------------------------------
+            if pa.types.is_timestamp(field.type):
+                self._check_timestamp(col, series, field.type)
+                continue
+
+            # ----------------------------------------------------------------------
+            # Everything else: dtype match, or one safe cast of the whole column
             # ----------------------------------------------------------------------
-            if expected == "datetime64[ns, UTC]":
-                if not is_datetime64_any_dtype(series.dtype):
-                    raise TypeError(f"[FinalWriter] Column '{col}' must be datetime64.")
+            if _dtype_matches(series.dtype, field.type):
+                continue
+
+            try:
+                pa.array(series, type=field.type, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise TypeError(_failure_report(col, series, field.type, e)) from e
+
+    @staticmethod
+    def _check_timestamp(col: str, series: pd.Series, arrow_type: pa.DataType) -> None:
+        if not is_datetime64_any_dtype(series.dtype):
+            raise TypeError(f"[FinalWriter] Column '{col}' must be datetime64.")
+
+        if arrow_type.tz is None:
+            return
+
+        if not isinstance(series.dtype, pd.DatetimeTZDtype):
+            raise TypeError(
+                f"[FinalWriter] Column '{col}' must be timezone-aware datetime."
+            )
+
+        if str(series.dtype.tz) != arrow_type.tz:
+            raise TypeError(f"[FinalWriter] Column '{col}' must be {arrow_type.tz} timezone.")
+
 
-                if not is_datetime64tz_dtype(series.dtype):
-                    raise TypeError(
-                        f"[FinalWriter] Column '{col}' must be timezone-aware datetime."
-                    )
+# ----------------------------------------------------------------------------
+# Type declarations
+# ----------------------------------------------------------------------------
+# enforce_types may use Python types / the tz dtype string (older configs)
+# or Arrow types directly; all end up in one pa.Schema.
+PYTHON_TO_ARROW = {
+    str: pa.string(),
+    float: pa.float64(),
+    int: pa.int64(),
+    bool: pa.bool_(),
+    "datetime64[ns, UTC]": pa.timestamp("ns", tz="UTC"),
+}
 
-                if str(series.dtype.tz) != "UTC":
-                    raise TypeError(f"[FinalWriter] Column '{col}' must be UTC timezone.")
 
+def to_arrow_schema(enforce_types: Dict[str, Any] | pa.Schema | None) -> pa.Schema:
+    if isinstance(enforce_types, pa.Schema):
+        return enforce_types
+
+    fields = []
+    for col, expected in (enforce_types or {}).items():
+        if isinstance(expected, pa.DataType):
+            fields.append(pa.field(col, expected))
+        elif expected in PYTHON_TO_ARROW:
+            fields.append(pa.field(col, PYTHON_TO_ARROW[expected]))
+        else:
+            raise ValueError(f"[FinalWriter] Unsupported type for column '{col}': {expected!r}")
+    return pa.schema(fields)
+
+
+def _dtype_matches(dtype, arrow_type: pa.DataType) -> bool:
+    if isinstance(dtype, pd.StringDtype):
+        return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+    if isinstance(dtype, pd.BooleanDtype):
+        return pa.types.is_boolean(arrow_type)
+    if isinstance(dtype, np.dtype) and dtype != object:
+        return pa.from_numpy_dtype(dtype) == arrow_type
+    return False
+
+
+def _failure_report(col: str, series: pd.Series, arrow_type: pa.DataType, error) -> str:
+    # failure path only, so a per-value pass is fine here
+    non_null = series.dropna()
+    found = non_null.map(lambda v: type(v).__name__)
+    counts = found.value_counts().to_dict()
+    sample = non_null[found != found.mode().iloc[0]].head(3) if len(counts) > 1 else non_null.head(3)
+
+    return (
+        f"[FinalWriter] Column '{col}' has invalid values. "
+        f"Expected type {arrow_type}, found value types {counts}; "
+        f"e.g. rows {sample.to_dict()}. ({error})"
+    )
+
+
+# ----------------------------------------------------------------------------
+# Manifest readers
+# ----------------------------------------------------------------------------
+def read_manifest(dataset: str | Path) -> dict:
+    path = Path(dataset) / MANIFEST_FILE
+    if not path.exists():
+        return {"version": 0, "files": []}
+    return json.loads(path.read_text())
+
+
+def _utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def manifest_files(dataset: str | Path, start=None, end=None) -> list[Path]:
+    """
+    Live files of a partitioned dataset, pruned to those whose
+    [min, max] can overlap [start, end]. Files holding only NULL
+    timestamps are dropped as soon as a bound is given.
+    """
+    dataset = Path(dataset)
+    files = []
+
+    for entry in read_manifest(dataset)["files"]:
+        if start is not None or end is not None:
+            if entry["min"] is None:
+                continue
+            if start is not None and _utc(entry["max"]) < _utc(start):
+                continue
+            if end is not None and _utc(entry["min"]) > _utc(end):
                 continue
+        files.append(dataset / entry["path"])
 
-            # ----------------------------------------------------------------------
-            # Python scalar types (str, float, bool, etc.)
-            # ----------------------------------------------------------------------
-            non_null = series.dropna()
-            invalid_mask = non_null.map(lambda v: not isinstance(v, expected))
-
-            if invalid_mask.any():
-                raise TypeError(
-                    f"[FinalWriter] Column '{col}' has invalid values. "
-                    f"Expected type {expected}, got mismatches."
-                )
+    return files
@@ -0,0 +1,256 @@
+import fcntl
+import json
+import mmap
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from utils.logger import Logger
+
+
+class RawArchive:
+    """
+    Append-only, deduplicated store for raw SEC filings (Bronze layer).
+
+    Layout under `directory`:
+      - segment-NNNNNN.bin: concatenated zlib-compressed JSON records,
+        rolled over once a segment reaches `segment_bytes`
+      - index.sqlite: accession_no → (segment, offset, length) plus the
+        filing's filed_at / period_of_report dates for range scans
+
+    Each filing is stored once, keyed by `accessionNo`; records without
+    one (e.g. the API source's trailing `{}`) are not archived. Records
+    are compressed individually, so `get()` reads a single filing straight
+    out of an mmap of its segment. Appends hold an flock on `archive.lock`,
+    so several processes can share one archive.
+    """
+
+    INDEX_FILE = "index.sqlite"
+    LOCK_FILE = "archive.lock"
+    SEGMENT_PATTERN = "segment-{:06d}.bin"
+    # sqlite's default bound-variable limit is 999
+    LOOKUP_CHUNK = 500
+
+    def __init__(
+        self,
+        directory: str | Path = "data/raw/archive",
+        segment_bytes: int = 256 * 1024**2,
+    ):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.log = Logger(self.__class__.__name__)
+
+        # pipeline stages may run on worker threads; _lock serialises access
+        self._db = sqlite3.connect(self.dir / self.INDEX_FILE, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS filings (
+                accession_no     TEXT PRIMARY KEY,
+                filed_date       TEXT,
+                period_of_report TEXT,
+                segment          INTEGER NOT NULL,
+                offset           INTEGER NOT NULL,
+                length           INTEGER NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_filings_filed ON filings (filed_date)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_filings_period ON filings (period_of_report)")
+        self._db.commit()
+
+        self._maps: dict[int, mmap.mmap] = {}
+
+    # ----------------------------------------------------------------------
+    # Keys / dates
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def key(filing: dict) -> str | None:
+        accession_no = filing.get("accessionNo") if filing else None
+        if isinstance(accession_no, str) and accession_no:
+            return accession_no
+        return None
+
+    @staticmethod
+    def _date(value) -> str | None:
+        """ISO date (UTC for timestamps) so the index compares as plain text."""
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(UTC)
+        return parsed.date().isoformat()
+
+    # ----------------------------------------------------------------------
+    # Write
+    # ----------------------------------------------------------------------
+    def _existing(self, keys: list[str]) -> set[str]:
+        found = set()
+        for i in range(0, len(keys), self.LOOKUP_CHUNK):
+            chunk = keys[i:i + self.LOOKUP_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT accession_no FROM filings WHERE accession_no IN ({marks})", chunk
+            )
+            found.update(r[0] for r in rows)
+        return found
+
+    def _current_segment(self) -> int:
+        row = self._db.execute("SELECT MAX(segment) FROM filings").fetchone()
+        segment = row[0] or 1
+        path = self._segment_path(segment)
+        if path.exists() and path.stat().st_size >= self.segment_bytes:
+            segment += 1
+        return segment
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.dir / self.SEGMENT_PATTERN.format(segment)
+
+    def add(self, filings: Iterable[dict]) -> tuple[int, int]:
+        """Append filings not archived yet. Returns (added, skipped)."""
+        filings = list(filings)
+        with self._lock, (self.dir / self.LOCK_FILE).open("a") as lock:
+            # segment offsets come from the file end: one appender at a time
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                return self._add(filings)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _add(self, filings: list[dict]) -> tuple[int, int]:
+        keyed = [(self.key(f), f) for f in filings]
+        keyed = [(k, f) for k, f in keyed if k is not None]
+        invalid = len(filings) - len(keyed)
+        if invalid:
+            self.log.warning(f"[ARCHIVE] Skipped {invalid} records without accessionNo")
+        seen = self._existing([k for k, _ in keyed])
+
+        segment = self._current_segment()
+        path = self._segment_path(segment)
+        out = path.open("ab")
+        rows = []
+
+        try:
+            for key, filing in keyed:
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                if out.tell() >= self.segment_bytes:
+                    out.close()
+                    segment += 1
+                    path = self._segment_path(segment)
+                    out = path.open("ab")
+
+                blob = zlib.compress(json.dumps(filing, separators=(",", ":")).encode())
+                rows.append((
+                    key,
+                    self._date(filing.get("filedAt")),
+                    self._date(filing.get("periodOfReport")),
+                    segment,
+                    out.tell(),
+                    len(blob),
+                ))
+                out.write(blob)
+        finally:
+            out.close()
+
+        # data first, index second: a crash leaves unreferenced bytes, never dangling rows
+        self._db.executemany("INSERT INTO filings VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._db.commit()
+
+        added, skipped = len(rows), len(keyed) - len(rows)
+        self.log.info(f"[ARCHIVE] added={added}, skipped_duplicates={skipped}")
+        return added, skipped
+
+    def import_json(self, path: str | Path) -> tuple[int, int]:
+        """Ingest a legacy RawWriter JSON file (list of filings)."""
+        with Path(path).open("r") as f:
+            return self.add(json.load(f))
+
+    # ----------------------------------------------------------------------
+    # Read
+    # ----------------------------------------------------------------------
+    def _read(self, segment: int, offset: int, length: int) -> dict:
+        # callers hold _lock: another thread may remap the segment
+        mm = self._maps.get(segment)
+        if mm is None or offset + length > len(mm):
+            # first access, or the segment grew since it was mapped
+            if mm is not None:
+                mm.close()
+            with self._segment_path(segment).open("rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mm
+        return json.loads(zlib.decompress(mm[offset:offset + length]))
+
+    def get(self, accession_no: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT segment, offset, length FROM filings WHERE accession_no = ?",
+                (accession_no,),
+            ).fetchone()
+            return self._read(*row) if row else None
+
+    def __contains__(self, accession_no: str) -> bool:
+        with self._lock:
+            return bool(self._existing([accession_no]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM filings").fetchone()[0]
+
+    def iter_range(
+        self,
+        start: str | None = None,
+        end: str | None = None,
+        by: str = "filed_at",
+    ) -> Iterator[dict]:
+        """
+        Yield filings whose `by` date (filed_at or period_of_report, UTC)
+        falls in [start, end], in on-disk order for sequential reads.
+        """
+        column = {"filed_at": "filed_date", "period_of_report": "period_of_report"}[by]
+
+        clauses, params = [], []
+        if start:
+            clauses.append(f"{column} >= ?")
+            params.append(str(start)[:10])
+        if end:
+            clauses.append(f"{column} <= ?")
+            params.append(str(end)[:10])
+
+        sql = "SELECT segment, offset, length FROM filings"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY segment, offset"
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        for row in rows:
+            # lock per record, not across the yield
+            with self._lock:
+                filing = self._read(*row)
+            yield filing
+
+    def iter_batches(self, start=None, end=None, batch_size: int = 10_000, by: str = "filed_at"):
+        """iter_range grouped into lists of at most `batch_size` filings."""
+        batch = []
+        for filing in self.iter_range(start, end, by=by):
+            batch.append(filing)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def close(self) -> None:
+        with self._lock:
+            for mm in self._maps.values():
+                mm.close()
+            self._maps.clear()
+            self._db.close()
@@ -2,6 +2,8 @@ import json
 from pathlib import Path
 from datetime import datetime, UTC
 
+from .raw_archive import RawArchive
+
 
 class RawWriter:
     """
@@ -12,11 +14,30 @@ class RawWriter:
       - Every saved file is timestamped
       - Stores human-readable JSON for debugging
       - Produces reproducible artifacts for auditing
+
+    Filings go to the deduplicated RawArchive under `<directory>/archive`
+    (save_filings); save() keeps writing whole payloads as JSON.
     """
 
     def __init__(self, directory: str | Path = "data/raw"):
         self.dir = Path(directory)
         self.dir.mkdir(parents=True, exist_ok=True)
+        self._archive = None
+
+    @property
+    def archive(self) -> RawArchive:
+        if self._archive is None:
+            self._archive = RawArchive(self.dir / "archive")
+        return self._archive
+
+    def save_filings(self, filings: list[dict]) -> tuple[int, int]:
+        """
+        Archive filings once each, keyed by accessionNo.
+
+        Returns:
+            (added, skipped) counts; skipped ones were already archived.
+        """
+        return self.archive.add(filings)
 
     def save(self, name: str, data) -> Path:
         """
@@ -2,6 +2,8 @@ from pathlib import Path
 from datetime import datetime, UTC
 import pandas as pd
 
+from utils.metrics import span
+
 
 class StagingWriter:
     """
@@ -17,17 +19,18 @@ class StagingWriter:
         if not isinstance(df, pd.DataFrame):
             raise TypeError("StagingWriter only accepts pandas DataFrames.")
 
-        # Defensive copy — avoid mutating upstream DataFrames
-        df = df.copy()
+        with span("staging", rows_in=len(df)):
+            # Defensive copy — avoid mutating upstream DataFrames
+            df = df.copy()
 
-        # Optionally harmonize object columns to string
-        for col in df.select_dtypes(include=["object"]).columns:
-            df[col] = df[col].astype("string")
+            # Optionally harmonize object columns to string
+            for col in df.select_dtypes(include=["object"]).columns:
+                df[col] = df[col].astype("string")
 
-        timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-        filename = f"{name}_{timestamp}.parquet"
+            timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+            filename = f"{name}_{timestamp}.parquet"
 
-        path = self.dir / filename
-        df.to_parquet(path, index=False)
+            path = self.dir / filename
+            df.to_parquet(path, index=False)
 
         return path
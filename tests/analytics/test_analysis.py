@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from analytics.analysis import (
+    companies_bs_in_period,
+    distribution_by_codes,
+    fold_sums,
+    sector_stats_by_year,
+    total_sec_acq_dis_day,
+)
+
+
+@pytest.fixture
+def df():
+    rows = [
+        ("2022-01-03", "AAPL", "A", "P", "Technology", 100.0),
+        ("2022-01-03", "AAPL", "D", "S", "Technology", 50.0),
+        ("2022-01-04", "MSFT", "A", "P", "Technology", 30.0),
+        ("2022-02-01", "XOM", "D", "S", "Energy", 70.0),
+        ("2022-02-01", "AAPL", "A", "P", "Technology", 20.0),
+        ("2023-03-01", "XOM", "A", "A", "Energy", 10.0),
+        ("2023-03-02", "MSFT", "D", "F", "Technology", 5.0),
+    ]
+    out = pd.DataFrame(
+        rows,
+        columns=["period_of_report", "issuer_ticker", "acquired_disposed", "code", "sector", "total_value"],
+    )
+    out["period_of_report"] = pd.to_datetime(out["period_of_report"], utc=True)
+    return out
+
+
+def _chunks(df, size=2):
+    return (df.iloc[i:i + size] for i in range(0, len(df), size))
+
+
+def test_fold_sums_matches_total_sec_acq_dis_day(df):
+    expected = total_sec_acq_dis_day(df)
+    folded = fold_sums(_chunks(df), total_sec_acq_dis_day)
+
+    pd.testing.assert_frame_equal(folded, expected, check_freq=False)
+
+
+def test_fold_sums_matches_companies_bs_in_period(df):
+    expected = companies_bs_in_period(df, "2022-01-01", "2023-12-31")
+    folded = fold_sums(_chunks(df), companies_bs_in_period, "2022-01-01", "2023-12-31")
+
+    for got, want in zip(folded, expected):
+        pd.testing.assert_series_equal(got, want, check_dtype=False)
+
+
+def test_fold_sums_matches_distribution_by_codes(df):
+    expected = distribution_by_codes(df)
+    folded = fold_sums(_chunks(df, 3), distribution_by_codes)
+
+    pd.testing.assert_series_equal(folded, expected)
+
+
+def test_fold_sums_index_order_for_sector_stats(df):
+    expected = sector_stats_by_year(df)
+    folded = fold_sums(_chunks(df, 4), sector_stats_by_year, sort_values=False)
+
+    pd.testing.assert_series_equal(folded, expected)
+
+
+def test_fold_sums_empty_stream_returns_none():
+    assert fold_sums(iter([]), distribution_by_codes) is None
@@ -0,0 +1,71 @@
+import pandas as pd
+import pytest
+
+from analytics.report import CHARTS, PlotReport, timing_table
+
+
+# ------------------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------------------
+
+class FakeRepo:
+    """InsiderRepository stand-in that counts reads."""
+
+    def __init__(self):
+        rows = [
+            ("2022-01-03", "AAPL", "A", "P", "Jane Doe", 100.0),
+            ("2022-01-03", "AAPL", "D", "S", "John Roe", 50.0),
+            ("2022-02-01", "XOM", "D", "S", "John Roe", 70.0),
+            ("2023-03-01", "XOM", "A", "A", "Jane Doe", 10.0),
+        ]
+        self.tx = pd.DataFrame(
+            rows,
+            columns=["period_of_report", "issuer_ticker", "acquired_disposed", "code", "reporter", "total_value"],
+        )
+        self.tx["period_of_report"] = pd.to_datetime(self.tx["period_of_report"], utc=True)
+        self.reads = []
+
+    def get_daily_flow(self, start=None, end=None, columns=None, **kwargs):
+        self.reads.append("insider_daily_flow")
+        return self.tx[columns]
+
+    def get_transactions(self, start=None, end=None, columns=None, **kwargs):
+        self.reads.append("insider_transactions")
+        return self.tx[columns]
+
+    def get_mapping(self):
+        self.reads.append("exchange_mapping")
+        return pd.DataFrame({"issuer_ticker": ["AAPL", "XOM"], "sector": ["Technology", "Energy"], "exchange": "NYSE"})
+
+
+# ------------------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------------------
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_report_renders_every_chart_from_one_load(tmp_path, workers):
+    repo = FakeRepo()
+    report = PlotReport(repo, "2022-01-01", "2023-12-31", n=5, workers=workers).run(tmp_path)
+
+    assert sorted(repo.reads) == ["exchange_mapping", "insider_daily_flow", "insider_transactions"]
+    assert [row["chart"] for row in report["charts"]] == list(CHARTS)
+
+    index = (tmp_path / "index.html").read_text()
+    for row in report["charts"]:
+        assert "error" not in row and row["render_s"] > 0
+        assert (tmp_path / row["file"]).stat().st_size > 0
+        assert f'src="{row["file"]}"' in index
+
+    assert "sector_stats" in timing_table(report)
+
+
+def test_sector_stats_from_flow_match_rollup():
+    from analytics.analysis import sector_stats_by_year
+
+    repo = FakeRepo()
+    report = PlotReport(repo, "2022-01-01", "2023-12-31")
+    datasets = report.compute(report.load())
+
+    rollup = repo.tx.merge(repo.get_mapping()[["issuer_ticker", "sector"]], on="issuer_ticker")
+    (got,), _, _ = datasets["sector_stats"]
+    pd.testing.assert_series_equal(got, sector_stats_by_year(rollup))
@@ -0,0 +1,89 @@
+"""
+Parity tests: each analytics.sql_analysis function must return what its
+analytics.analysis twin computes from the rows the handlers fetch.
+Needs TEST_DATABASE_URL (see tests/conftest.py).
+"""
+import pandas as pd
+import pytest
+
+from analytics import analysis, sql_analysis
+from db.etl_db import ETLDatabase
+from db.repository import InsiderRepository
+
+START, END = "2018-01-01", "2021-06-30"
+
+
+@pytest.fixture(scope="module")
+def repo(seeded_engine):
+    etl = ETLDatabase()
+    etl.engine = seeded_engine
+    etl.rebuild_daily_flow()
+
+    repo = InsiderRepository()
+    repo.engine = seeded_engine
+    return repo
+
+
+def assert_same_series(sql_result, pandas_result):
+    assert sql_result.is_monotonic_decreasing == pandas_result.is_monotonic_decreasing
+    pd.testing.assert_series_equal(
+        sql_result.sort_index(),
+        pandas_result.sort_index(),
+        check_index_type=False,
+        check_names=False,
+    )
+
+
+def test_total_sec_acq_dis_day(repo):
+    df = repo.get_daily_flow(START, END, side=["A", "D"])
+
+    pd.testing.assert_frame_equal(
+        sql_analysis.total_sec_acq_dis_day(repo, START, END),
+        analysis.total_sec_acq_dis_day(df),
+        check_index_type=False,
+    )
+
+
+def test_companies_bs_in_period(repo):
+    df = repo.get_daily_flow(START, END, side=["A", "D"])
+
+    result = sql_analysis.companies_bs_in_period(repo, START, END)
+    assert all(len(side) for side in result)
+
+    for sql_side, pandas_side in zip(
+        result,
+        analysis.companies_bs_in_period(df, START, END),
+    ):
+        assert_same_series(sql_side, pandas_side)
+
+
+@pytest.mark.parametrize("ticker", [None, "T42"])
+def test_companies_bs_in_period_by_reporter(repo, ticker):
+    df = repo.get_transactions(START, END, ticker=ticker, side=["A", "D"])
+
+    result = sql_analysis.companies_bs_in_period_by_reporter(repo, START, END, ticker)
+    assert any(len(side) for side in result)
+
+    for sql_side, pandas_side in zip(
+        result,
+        analysis.companies_bs_in_period_by_reporter(df, START, END, ticker),
+    ):
+        assert_same_series(sql_side, pandas_side)
+
+
+def test_distribution_by_codes(repo):
+    df = repo.get_daily_flow(START, END)
+
+    assert_same_series(
+        sql_analysis.distribution_by_codes(repo, START, END),
+        analysis.distribution_by_codes(df),
+    )
+
+
+def test_sector_stats_by_year(repo):
+    df = repo.get_rollup(START, END)
+
+    assert_same_series(
+        sql_analysis.sector_stats_by_year(repo, START, END),
+        analysis.sector_stats_by_year(df),
+    )
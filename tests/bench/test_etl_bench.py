@@ -0,0 +1,57 @@
+import pytest
+
+from bench.baseline import compare
+from bench.etl import run
+from bench.synthetic import generate_filings
+from insider_trading.transform.insider_transformer import InsiderTransactionsTransformer
+
+
+def test_generator_is_deterministic_per_seed():
+    assert generate_filings(200, seed=3) == generate_filings(200, seed=3)
+    assert generate_filings(200, seed=3) != generate_filings(200, seed=4)
+
+
+def test_synthetic_filings_exercise_the_transformer():
+    filings = generate_filings(2_000, seed=1)
+    transformer = InsiderTransactionsTransformer()
+
+    normalized = transformer.normalize(filings)
+    final = transformer.transform(filings)
+
+    assert len(normalized) > len(filings)  # multi-row filings
+    assert set(normalized["table"]) == {"non-derivative", "derivative"}
+    assert normalized["is_10b5_1"].any()
+    assert normalized["price_per_share"].isna().any()
+    assert {"4", "4/A"} <= set(normalized["document_type"])
+    # validate drops the odd rows but keeps most of them
+    assert 0.5 * len(normalized) < len(final) < len(normalized)
+    assert final["filed_at"].dt.tz is not None
+
+
+def test_compare_flags_drops_beyond_tolerance():
+    baseline = {"cases": {"a": {"rows_per_s": 100.0}, "b": {"rows_per_s": 100.0}, "gone": {"rows_per_s": 1.0}}}
+    results = {"a": {"rows_per_s": 80.0}, "b": {"rows_per_s": 70.0}, "new": {"rows_per_s": 5.0}}
+
+    report = compare(results, baseline, "rows_per_s", tolerance=0.25).set_index("case")
+
+    assert list(report.index) == ["a", "b"]
+    assert not report.loc["a", "regression"]
+    assert report.loc["b", "regression"]
+    assert report.loc["b", "change"] == pytest.approx(-0.3)
+
+
+def test_compare_lower_is_better_for_timings():
+    baseline = {"cases": {"q": {"seconds": 1.0}}}
+
+    slower = compare({"q": {"seconds": 1.5}}, baseline, "seconds", 0.25, higher_is_better=False)
+    faster = compare({"q": {"seconds": 0.5}}, baseline, "seconds", 0.25, higher_is_better=False)
+
+    assert slower["regression"].tolist() == [True]
+    assert faster["regression"].tolist() == [False]
+
+
+def test_run_times_every_case():
+    results = run(50, repeat=1, min_time=0)
+
+    assert {"normalize", "transform", "final_write", "raw_archive_add"} <= set(results)
+    assert all(r["rows_per_s"] > 0 for r in results.values())
@@ -0,0 +1,78 @@
+"""
+bench.repository against a scratch schema. Needs TEST_DATABASE_URL.
+"""
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from bench import repository as bench
+
+
+@pytest.fixture(scope="module")
+def engine():
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL not set")
+
+    schema = f"test_bench_{uuid.uuid4().hex[:8]}"
+    engine = bench.bench_engine(url, schema)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        with create_engine(url, future=True).begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+
+
+def index_names(engine):
+    with engine.connect() as conn:
+        return set(conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+        )).scalars())
+
+
+def test_seed_loads_rows_and_rebuilds_indexes(engine):
+    bench.init_db(bind=engine)
+    before = index_names(engine)
+
+    bench.seed(engine, rows=3_000, seed=1)
+
+    assert index_names(engine) == before
+    assert bench.seeded_with(engine) == {"rows": 3_000, "seed": 1}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM insider_transactions")).scalar() == 3_000
+        assert conn.execute(text("SELECT COUNT(*) FROM insider_daily_flow")).scalar() > 0
+
+
+def test_run_times_each_case_per_width(engine):
+    if bench.seeded_with(engine) is None:
+        bench.seed(engine, rows=3_000, seed=1)
+
+    results = bench.run(engine, widths=[30, 3650], repeat=1)
+
+    assert results["get_transactions[plot_cols]@3650d"]["rows"] == 3_000
+    assert results["get_transactions@30d"]["rows"] < 3_000
+    assert "get_transactions@3650d" not in results  # full-width read capped
+    assert results["get_mapping"]["rows"] == bench.TICKERS
+    assert {"sql.sector_stats_by_year@30d", "pandas.sector_stats_by_year@3650d"} <= set(results)
+
+
+def test_refuses_public_and_foreign_schemas(engine):
+    url = os.getenv("TEST_DATABASE_URL")
+    with pytest.raises(ValueError, match="public"):
+        bench.bench_engine(url, "public")
+
+    schema = f"test_bench_foreign_{uuid.uuid4().hex[:8]}"
+    with create_engine(url, future=True).begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+        conn.execute(text(f'CREATE TABLE "{schema}".orders (id INT)'))
+    try:
+        with pytest.raises(ValueError, match="orders"):
+            bench.bench_engine(url, schema)
+        with pytest.raises(ValueError, match="orders"):
+            bench.drop_bench_schema(url, schema)
+    finally:
+        with create_engine(url, future=True).begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
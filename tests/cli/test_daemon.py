@@ -0,0 +1,128 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import click
+import pytest
+
+from cli import client
+from cli.daemon import CLIDaemon, run_argv
+from utils.logger import Logger
+
+
+# ------------------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------------------
+
+def tiny_cli() -> click.Group:
+    """Stand-in for build_cli(): state kept between commands shows the process is shared."""
+    calls = []
+
+    @click.group()
+    def cli():
+        pass
+
+    @cli.command()
+    @click.argument("word")
+    def echo(word):
+        calls.append(word)
+        Logger("TinyCLI").info(f"logged {word}")
+        click.echo(f"{word} #{len(calls)}")
+
+    @cli.command()
+    def boom():
+        raise click.ClickException("no luck")
+
+    return cli
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    d = CLIDaemon(tiny_cli(), str(tmp_path / "cli.sock"))
+    thread = threading.Thread(target=d.serve, kwargs={"warm": False})
+    thread.start()
+    assert d.ready.wait(5)
+    yield d
+    d._stopping = True
+    thread.join(5)
+
+
+def forwarded(daemon, argv):
+    """(exit code, stdout, stderr) of argv run by the daemon."""
+    # client.forward() would write to sys.stdout, which the daemon redirects
+    # process-wide while it runs a command: collect the messages instead
+    code, out = None, {"stdout": "", "stderr": ""}
+    for msg in client.send(client.connect(daemon.socket_path), {"argv": argv, "cwd": os.getcwd()}):
+        if "stream" in msg:
+            out[msg["stream"]] += msg["data"]
+        else:
+            code = msg["exit"]
+    return code, out["stdout"], out["stderr"]
+
+
+# ------------------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------------------
+
+def test_commands_share_one_process_and_stream_output(daemon):
+    assert forwarded(daemon, ["echo", "a"])[:2] == (0, "a #1\n")
+
+    code, out, err = forwarded(daemon, ["echo", "b"])
+    assert (code, out) == (0, "b #2\n")
+    assert "logged b" in err
+    assert daemon.requests == 2
+
+
+def test_errors_keep_cli_exit_codes(daemon):
+    code, _, err = forwarded(daemon, ["boom"])
+    assert code == 1 and "no luck" in err
+
+    code, _, err = forwarded(daemon, ["nope"])
+    assert code == 2 and "No such command" in err
+
+
+def test_other_working_directories_are_refused(daemon, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path.parent)
+    code, _, err = forwarded(daemon, ["echo", "a"])
+    assert code == 2 and "daemon serves" in err
+
+
+def test_stop_closes_the_socket(daemon):
+    list(client.send(client.connect(daemon.socket_path), {"op": "stop"}))
+
+    for _ in range(50):
+        if client.connect(daemon.socket_path) is None:
+            break
+        threading.Event().wait(0.1)
+    assert client.connect(daemon.socket_path) is None
+
+
+def test_client_entry_point_forwards_to_daemon(daemon, tmp_path):
+    src = Path(__file__).resolve().parents[2] / "src"
+    env = os.environ | {"CLI_SOCKET": daemon.socket_path, "PYTHONPATH": str(src)}
+
+    done = subprocess.run(
+        [sys.executable, "-m", "cli.client", "echo", "hi"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=30,
+    )
+    assert (done.returncode, done.stdout) == (0, "hi #1\n")
+    assert daemon.requests == 1
+
+
+def test_env_switches_keep_commands_local(monkeypatch):
+    assert client.forwardable(["echo", "hi"])
+    assert not client.forwardable(["--profile-memory", "echo"])
+    assert not client.forwardable(["poll", "--interval", "5"])
+
+    monkeypatch.setenv("MEMORY_PROFILE", "1")
+    assert not client.forwardable(["echo", "hi"])
+
+
+def test_run_argv_returns_exit_codes(capsys):
+    cli = tiny_cli()
+    assert run_argv(cli, ["echo", "x"]) == 0
+    assert run_argv(cli, ["--help"]) == 0
+    assert run_argv(cli, ["boom"]) == 1
@@ -0,0 +1,67 @@
+"""
+Start-up budget of the insider_cli entry point, measured in a fresh
+interpreter: building the command tree and printing --help must not
+import the heavy stacks that individual handlers pull in on demand.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+# cumulative import time of the entry point; ~20ms locally, so this only
+# trips when a heavy import creeps back in (pandas alone is ~400ms)
+BUDGET_S = 0.25
+
+HEAVY = ["pandas", "numpy", "pyarrow", "matplotlib", "yfinance", "openai", "sqlalchemy", "pydantic", "duckdb"]
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import cli.client
+from cli.run_cli import cli
+elapsed = time.perf_counter() - t0
+try:
+    cli.main(["--help"], standalone_mode=False)
+except SystemExit:
+    pass
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}), file=sys.stderr)
+"""
+
+
+@pytest.fixture(scope="module")
+def probe():
+    done = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=os.environ | {"PYTHONPATH": str(SRC)},
+        capture_output=True, text=True, timeout=60, check=True,
+    )
+    return done.stdout, json.loads(done.stderr.strip().splitlines()[-1])
+
+
+def test_help_lists_commands(probe):
+    out, _ = probe
+    assert "build-dataset" in out and "plot" in out
+
+
+def test_entry_point_imports_no_heavy_modules(probe):
+    _, result = probe
+    loaded = {name.split(".")[0] for name in result["modules"]}
+    assert not loaded & set(HEAVY)
+
+
+def test_entry_point_import_budget(probe):
+    _, result = probe
+    assert result["elapsed"] < BUDGET_S, f"entry point imports took {result['elapsed']:.3f}s"
+
+
+def test_every_handler_resolves():
+    from cli.cli_commands import COMMANDS
+    from cli.cli_factory import resolve_handler
+
+    for spec in COMMANDS.values():
+        assert callable(resolve_handler(spec["handler"]))
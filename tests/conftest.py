@@ -0,0 +1,106 @@
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+
+
+# ------------------------------------------------------------------------
+# Postgres-backed fixtures
+# Point TEST_DATABASE_URL at a scratch database (e.g. the docker-compose
+# `db` service) to run them; they are skipped otherwise.
+# ------------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    """Engine bound to a throwaway schema initialised with init_db()."""
+    from db.db import init_db
+
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL not set")
+
+    schema = f"test_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(url, future=True)
+
+    try:
+        with admin.begin() as conn:
+            conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    except DBAPIError as e:
+        pytest.skip(f"Postgres not reachable: {e}")
+
+    engine = create_engine(
+        url,
+        future=True,
+        connect_args={"options": f"-csearch_path={schema},public"},
+    )
+
+    try:
+        init_db(bind=engine)
+        yield engine
+    except DBAPIError as e:
+        pytest.skip(f"Cannot initialise test schema: {e}")
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin.dispose()
+
+
+@pytest.fixture(scope="session")
+def seeded_engine(pg_engine):
+    """
+    pg_engine with ~200k synthetic transactions over 11 years, 500 tickers,
+    a matching exchange_mapping and two years of OHLC for 50 tickers.
+    """
+    seed = """
+        INSERT INTO insider_transactions (
+            accession_no, filed_at, period_of_report, document_type,
+            issuer_ticker, issuer_cik, issuer_name, reporter, reporter_cik,
+            "table", code, acquired_disposed, transaction_date,
+            shares, price_per_share, total_value, is_10b5_1
+        )
+        SELECT
+            'acc-' || (g / 3),
+            timestamptz '2016-01-01' + g * interval '30 minutes',
+            date_trunc('day', timestamptz '2016-01-01' + g * interval '30 minutes', 'UTC'),
+            '4',
+            'T' || (g % 500),
+            lpad((g % 500)::text, 10, '0'),
+            'Issuer ' || (g % 500),
+            translate(lpad((g % 5000)::text, 4, '0'), '0123456789', 'abcdefghij') || ' Person',
+            lpad((g % 5000)::text, 10, '0'),
+            'non-derivative',
+            (ARRAY['P', 'S', 'A', 'F'])[g % 4 + 1],
+            (ARRAY['A', 'D'])[g % 2 + 1],
+            date_trunc('day', timestamptz '2016-01-01' + g * interval '30 minutes', 'UTC'),
+            10 + g % 100,
+            5,
+            5 * (10 + g % 100),
+            false
+        FROM generate_series(1, 200000) AS g;
+
+        INSERT INTO exchange_mapping (name, issuer_ticker, cik, exchange, is_delisted, sector, industry)
+        SELECT 'Issuer ' || g, 'T' || g, lpad(g::text, 10, '0'), 'nasdaq', false,
+               (ARRAY['Technology', 'Energy', 'Healthcare'])[g % 3 + 1], 'Industry ' || (g % 20)
+        FROM generate_series(0, 499) AS g;
+
+        INSERT INTO ohlc_prices (ticker, date, open, high, low, close, volume)
+        SELECT 'T' || t, d::date, 10, 11, 9, 10.5, 1000
+        FROM generate_series(0, 49) AS t,
+             generate_series(date '2022-01-01', date '2023-12-31', interval '1 day') AS d;
+
+        ANALYZE insider_transactions;
+        ANALYZE exchange_mapping;
+        ANALYZE ohlc_prices;
+    """
+    # raw DBAPI cursor: no bind params, so `%` (modulo) needs no escaping
+    raw = pg_engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            cur.execute(seed)
+        raw.commit()
+    finally:
+        raw.close()
+    return pg_engine
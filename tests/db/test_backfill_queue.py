@@ -0,0 +1,152 @@
+"""
+Backfill shard queue. Queue tests need TEST_DATABASE_URL (see tests/conftest.py).
+"""
+import time
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from db.backfill_queue import BackfillQueue, plan_shards
+from db.etl_db import ETLDatabase
+from insider_trading.tasks.backfill_task import BackfillTask, estimate_eta
+
+
+def test_plan_shards_clamps_months_and_weeks():
+    assert plan_shards("2024-01-15", "2024-03-10", "month") == [
+        (date(2024, 1, 15), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+        (date(2024, 3, 1), date(2024, 3, 10)),
+    ]
+    # 2024-01-03 is a Wednesday; weeks run Monday → Sunday
+    assert plan_shards("2024-01-03", "2024-01-16", "week") == [
+        (date(2024, 1, 3), date(2024, 1, 7)),
+        (date(2024, 1, 8), date(2024, 1, 14)),
+        (date(2024, 1, 15), date(2024, 1, 16)),
+    ]
+    with pytest.raises(ValueError):
+        plan_shards("2024-01-01", "2024-02-01", "day")
+
+
+def test_estimate_eta_prefers_observed_rate():
+    progress = {"remaining": 10, "avg_shard_s": 60.0}
+    assert estimate_eta(progress, done_here=5, elapsed=100.0, workers=4) == pytest.approx(200.0)
+    assert estimate_eta(progress, done_here=0, elapsed=5.0, workers=4) == pytest.approx(150.0)
+    assert estimate_eta({"remaining": 3, "avg_shard_s": None}, 0, 0.0, 4) is None
+    assert estimate_eta({"remaining": 0, "avg_shard_s": None}, 0, 0.0, 4) == 0.0
+
+
+@pytest.fixture
+def queue(pg_engine):
+    etl = ETLDatabase()
+    etl.engine = pg_engine
+    return BackfillQueue(etl, max_attempts=2)
+
+
+@pytest.fixture
+def job():
+    return f"test-{uuid.uuid4().hex[:8]}"
+
+
+def test_plan_is_idempotent(queue, job):
+    shards = plan_shards("2024-01-01", "2024-03-31")
+    assert queue.plan(job, "*:*", shards) == 3
+    assert queue.plan(job, "*:*", shards) == 0
+    assert queue.progress(job)["total"] == 3
+
+
+def test_claims_hand_out_each_shard_once(queue, job):
+    queue.plan(job, "*:*", plan_shards("2024-01-01", "2024-02-29"))
+
+    first, second = queue.claim(job, "a"), queue.claim(job, "b")
+    assert first["start_date"] == date(2024, 1, 1)
+    assert second["start_date"] == date(2024, 2, 1)
+    assert queue.claim(job, "c") is None
+
+    queue.complete(first, filings=10, rows_loaded=25)
+    progress = queue.progress(job)
+    assert (progress["done"], progress["running"], progress["remaining"]) == (1, 1, 1)
+    assert (progress["filings"], progress["rows_loaded"]) == (10, 25)
+
+
+def test_failed_shards_retry_until_max_attempts(queue, job):
+    queue.plan(job, "*:*", plan_shards("2024-01-01", "2024-01-31"))
+
+    for attempt in (1, 2):
+        shard = queue.claim(job, "a")
+        assert shard["attempts"] == attempt
+        queue.fail(shard, "boom")
+
+    assert queue.claim(job, "a") is None
+    progress = queue.progress(job)
+    assert (progress["failed"], progress["dead"], progress["remaining"]) == (1, 1, 0)
+
+
+def test_expired_lease_is_reclaimed(queue, job):
+    queue.plan(job, "*:*", plan_shards("2024-01-01", "2024-01-31"))
+    stale = queue.claim(job, "dead-worker")
+
+    queue.lease = 0
+    fresh = queue.claim(job, "b")
+    assert fresh["id"] == stale["id"] and fresh["worker"] == "b"
+    assert not queue.heartbeat(stale)
+    assert queue.heartbeat(fresh)
+
+    # the old holder's late outcome is ignored
+    queue.fail(stale, "late")
+    queue.complete(fresh, filings=1, rows_loaded=1)
+    assert queue.progress(job)["done"] == 1
+
+
+class FakeTask:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.extracted = []
+
+    def extract(self, params):
+        if params["start_date"] == self.fail_on:
+            raise RuntimeError("api down")
+        self.extracted.append(params["start_date"])
+        return [{}, {}]
+
+    def transform(self, raw):
+        return raw
+
+    def replace_final(self, df, start, end, accessions):
+        pass
+
+    def load(self, df):
+        self.loaded = True
+        return df
+
+
+def test_backfill_task_drains_and_resumes(queue, job):
+    queue.plan(job, "*:*", plan_shards("2024-01-01", "2024-06-30"))
+
+    task = FakeTask(fail_on="2024-03-01")
+    progress = BackfillTask(queue, task, job, workers=3).run()
+    assert sorted(task.extracted) == ["2024-01-01", "2024-02-01", "2024-04-01", "2024-05-01", "2024-06-01"]
+    assert (progress["done"], progress["dead"], progress["filings"]) == (5, 1, 10)
+
+    # rerun with the API back and one more attempt allowed: only the dead shard is left
+    rerun = FakeTask()
+    BackfillTask(BackfillQueue(queue.db, max_attempts=3), rerun, job, workers=2).run()
+    assert rerun.extracted == ["2024-03-01"]
+
+
+def test_backfill_task_abandons_a_stolen_shard(queue, job):
+    queue.plan(job, "*:*", plan_shards("2024-01-01", "2024-01-31"))
+
+    class StolenTask(FakeTask):
+        def extract(self, params):
+            # the lease ran out mid-shard and another worker claimed it
+            with queue.db.engine.begin() as conn:
+                conn.execute(text("UPDATE backfill_shards SET worker = 'thief' WHERE job = :job"), {"job": job})
+            time.sleep(0.3)
+            return super().extract(params)
+
+    task = StolenTask()
+    progress = BackfillTask(queue, task, job, workers=1, heartbeat_every=0.05).run()
+    assert not hasattr(task, "loaded")
+    assert (progress["running"], progress["failed"]) == (1, 0)
@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+from db import repository
+from db.cache import QueryCache
+from db.repository import STRING_DTYPE, InsiderRepository
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "issuer_ticker": pd.array(["TSLA", None], dtype=STRING_DTYPE),
+        "total_value": [100.0, 250.0],
+    })
+
+
+def test_key_depends_on_watermark():
+    a = QueryCache.make_key("SELECT 1", {"start": "2022-01-01"}, "2024-01-01")
+    b = QueryCache.make_key("SELECT 1", {"start": "2022-01-01"}, "2024-01-02")
+
+    assert a != b
+    assert a == QueryCache.make_key("SELECT 1", {"start": "2022-01-01"}, "2024-01-01")
+
+
+def test_memory_then_disk_hits(tmp_path, frame):
+    cache = QueryCache(tmp_path)
+    assert cache.get("k") is None
+
+    cache.put("k", frame)
+    pd.testing.assert_frame_equal(cache.get("k"), frame)
+
+    # a fresh process only has the Parquet file
+    other = QueryCache(tmp_path)
+    assert other.get("k")["total_value"].tolist() == [100.0, 250.0]
+
+    assert cache.stats()["memory_hits"] == 1
+    assert other.stats()["disk_hits"] == 1
+    cache.close()
+    lifetime = other.lifetime_stats()
+    assert (lifetime["misses"], lifetime["hit_ratio"]) == (1, 2 / 3)
+
+
+def test_counters_reach_stats_file_on_flush_only(tmp_path, frame):
+    first, second = QueryCache(tmp_path), QueryCache(tmp_path)
+    first.put("k", frame)
+    for _ in range(3):
+        first.get("k")
+    second.get("missing")
+
+    assert not (tmp_path / QueryCache.STATS_FILE).exists()
+
+    first.flush()
+    second.flush()
+    second.flush()  # nothing new: no double counting
+
+    assert QueryCache(tmp_path).lifetime_stats()["memory_hits"] == 3
+    assert QueryCache(tmp_path).lifetime_stats()["misses"] == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_returns_copies(tmp_path, frame):
+    cache = QueryCache(tmp_path)
+    cache.put("k", frame)
+
+    cache.get("k")["total_value"] = 0.0
+
+    assert cache.get("k")["total_value"].tolist() == [100.0, 250.0]
+
+
+def test_evicts_least_recently_used_by_size(tmp_path, frame):
+    entry = int(frame.memory_usage(deep=True).sum())
+    cache = QueryCache(tmp_path, max_memory_bytes=2 * entry)
+
+    cache.put("a", frame)
+    cache.put("b", frame)
+    cache.get("a")
+    cache.put("c", frame)
+
+    assert list(cache._memory) == ["a", "c"]
+
+    file_size = (tmp_path / "a.parquet").stat().st_size
+    small = QueryCache(tmp_path, max_disk_bytes=2 * file_size)
+    small.put("d", frame)
+
+    assert small.stats()["disk_entries"] == 2
+    assert small.stats()["evictions"] == 2
+    assert (tmp_path / "d.parquet").exists()
+
+
+def test_repository_reads_through_cache(tmp_path, frame, monkeypatch):
+    calls = []
+
+    def fake_read_sql(sql, con, params=None):
+        calls.append(sql)
+        return frame.astype({"issuer_ticker": object})
+
+    monkeypatch.setattr(repository.pd, "read_sql", fake_read_sql)
+    repo = InsiderRepository(cache=QueryCache(tmp_path))
+    monkeypatch.setattr(repo, "_watermark", lambda: "2024-01-01")
+
+    repo.get_transactions("2022-01-01", "2022-12-31", columns=["issuer_ticker", "total_value"])
+    df = repo.get_transactions("2022-01-01", "2022-12-31", columns=["issuer_ticker", "total_value"])
+
+    assert len(calls) == 1
+    assert df["issuer_ticker"].dtype == STRING_DTYPE
+
+    # a new load moves the watermark → re-read
+    monkeypatch.setattr(repo, "_watermark", lambda: "2024-01-02")
+    repo.get_transactions("2022-01-01", "2022-12-31", columns=["issuer_ticker", "total_value"])
+
+    assert len(calls) == 2
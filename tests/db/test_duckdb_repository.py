@@ -0,0 +1,163 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from analytics import analysis, sql_analysis
+from db.duckdb_repository import DuckDBRepository
+from db.repository import STRING_DTYPE, TRANSACTION_COLUMNS
+from writers.final_writer import FinalWriter
+
+
+def transactions_frame(rows):
+    df = pd.DataFrame(
+        rows,
+        columns=[
+            "period_of_report", "issuer_ticker", "reporter", "acquired_disposed", "code", "total_value",
+        ],
+    )
+    for col in TRANSACTION_COLUMNS:
+        if col not in df.columns and col != "id":
+            df[col] = None
+    df["period_of_report"] = pd.to_datetime(df["period_of_report"], utc=True)
+    df["filed_at"] = df["period_of_report"]
+    df["shares"] = 1.0
+    return df[[c for c in TRANSACTION_COLUMNS if c != "id"]]
+
+
+def mapping_frame(sector):
+    return pd.DataFrame({
+        "name": ["Apple Inc", "Exxon"],
+        "issuer_ticker": ["AAPL", "XOM"],
+        "cik": ["320193", "34088"],
+        "exchange": ["nasdaq", "nyse"],
+        "is_delisted": [False, False],
+        "category": [None, None],
+        "sector": [sector, "Energy"],
+        "industry": [None, None],
+        "sic_sector": [None, None],
+        "sic_industry": [None, None],
+    })
+
+
+@pytest.fixture
+def gold(tmp_path):
+    transactions_frame([
+        ("2022-01-03 10:00", "AAPL", "Cook Timothy", "A", "P", 100.0),
+        ("2022-01-03 15:00", "AAPL", "Cook Timothy", "D", "S", 50.0),
+        ("2022-02-01 00:00", "XOM", "Woods Darren", "D", "S", 70.0),
+    ]).to_parquet(tmp_path / "insider_transactions_final_20240101_000000.parquet")
+    transactions_frame([
+        ("2023-03-01 00:00", "XOM", "Woods Darren", "A", "A", 10.0),
+        ("2023-03-02 00:00", "AAPL", "Cook Timothy", "A", "P", 5.0),
+    ]).to_parquet(tmp_path / "insider_transactions_final_20240201_000000.parquet")
+
+    old = tmp_path / "exchange_mapping_final_20240101_000000.parquet"
+    mapping_frame("Old sector").to_parquet(old)
+    os.utime(old, (1, 1))
+    mapping_frame("Technology").to_parquet(tmp_path / "exchange_mapping_final_20240201_000000.parquet")
+    return tmp_path
+
+
+@pytest.fixture
+def repo(gold):
+    return DuckDBRepository(gold)
+
+
+def test_reads_every_transactions_file_with_pushdown(repo):
+    df = repo.get_transactions(
+        "2022-01-01", "2023-12-31", columns=["issuer_ticker", "total_value"], ticker="AAPL", side="A"
+    )
+
+    assert list(df.columns) == ["issuer_ticker", "total_value"]
+    assert df["total_value"].tolist() == [100.0, 5.0]
+    assert df["issuer_ticker"].dtype == STRING_DTYPE
+
+
+def test_reporter_filter(repo):
+    df = repo.get_transactions(columns=["reporter"], reporter="timothy cook")
+
+    assert set(df["reporter"]) == {"Cook Timothy"}
+
+
+def test_rollup_joins_newest_mapping_snapshot(repo):
+    df = repo.get_rollup(columns=["issuer_ticker", "ticker_name", "sector"], ticker="AAPL")
+
+    assert set(df["sector"]) == {"Technology"}
+    assert set(df["ticker_name"]) == {"Apple Inc"}
+
+
+def test_daily_flow_and_streaming(repo):
+    flow = repo.get_daily_flow("2022-01-03", "2022-01-03")
+    assert flow["n_transactions"].sum() == 2
+    assert flow["period_of_report"].dt.hour.eq(0).all()
+
+    chunks = list(repo.iter_transactions(chunksize=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+def test_picks_up_new_gold_files(repo, gold):
+    transactions_frame([
+        ("2024-05-01 00:00", "XOM", "Woods Darren", "D", "S", 1.0),
+    ]).to_parquet(gold / "insider_transactions_final_20240501_000000.parquet")
+
+    assert len(repo.get_transactions()) == 6
+
+
+def test_sql_analysis_runs_on_duckdb(repo):
+    start, end = "2022-01-01", "2023-12-31"
+
+    pd.testing.assert_series_equal(
+        sql_analysis.distribution_by_codes(repo, start, end).sort_index(),
+        analysis.distribution_by_codes(repo.get_daily_flow(start, end)).sort_index(),
+        check_index_type=False,
+    )
+    pd.testing.assert_series_equal(
+        sql_analysis.sector_stats_by_year(repo, start, end),
+        analysis.sector_stats_by_year(repo.get_rollup(start, end)),
+        check_index_type=False,
+        check_names=False,
+    )
+
+
+def test_ohlc_reads_go_to_postgres(repo, monkeypatch):
+    calls = []
+
+    class Postgres:
+        def __init__(self, cache=None):
+            pass
+
+        def ohlc_exists_in_range(self, ticker, start, end):
+            calls.append((ticker, start, end))
+            return True
+
+    monkeypatch.setattr("db.duckdb_repository.InsiderRepository", Postgres)
+
+    assert repo.ohlc_exists_in_range("AAPL", "2024-01-01", "2024-02-01")
+    assert calls == [("AAPL", "2024-01-01", "2024-02-01")]
+
+
+def test_missing_gold_files(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DuckDBRepository(tmp_path)
+
+
+def test_partitioned_dataset_is_pruned_by_range(gold):
+    writer = FinalWriter(
+        gold,
+        expected_schema=[c for c in TRANSACTION_COLUMNS if c != "id"],
+        partition_by="period_of_report",
+    )
+    writer.save("insider_transactions_final", transactions_frame([
+        ("2021-05-01 00:00", "AAPL", "Cook Timothy", "A", "P", 1.0),
+        ("2021-07-01 00:00", "AAPL", "Cook Timothy", "A", "P", 2.0),
+    ]))
+    repo = DuckDBRepository(gold)
+
+    df = repo.get_transactions("2021-06-01", "2021-12-31", columns=["total_value"])
+
+    assert df["total_value"].tolist() == [2.0]
+    partition_files = [p for p in repo._scoped_files if "year=" in str(p)]
+    assert [p.parent.name for p in partition_files] == ["month=07"]
@@ -0,0 +1,110 @@
+"""
+ETLDatabase write paths. Needs TEST_DATABASE_URL (see tests/conftest.py).
+"""
+from datetime import datetime, UTC
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+from db.etl_db import ETLDatabase
+from insider_trading.transform.insider_transformer import InsiderTransactionsTransformer
+
+# far past the seeded data, so other tests' ranges are untouched
+START, END = datetime(2031, 1, 1, tzinfo=UTC), datetime(2031, 2, 1, tzinfo=UTC)
+
+
+def transactions(rows):
+    df = pd.DataFrame(rows, columns=["accession_no", "filed_at", "period_of_report", "total_value"])
+    for col in InsiderTransactionsTransformer.SCHEMA:
+        if col not in df.columns:
+            df[col] = None
+    for col in ["filed_at", "period_of_report"]:
+        df[col] = pd.to_datetime(df[col], utc=True)
+    df["issuer_ticker"] = "REPLAY"
+    df["acquired_disposed"] = "A"
+    df["code"] = "P"
+    df["shares"] = 1.0
+    return df[InsiderTransactionsTransformer.SCHEMA]
+
+
+@pytest.fixture
+def etl(pg_engine):
+    etl = ETLDatabase()
+    etl.engine = pg_engine
+    yield etl
+    # the database is shared by the whole session
+    with pg_engine.begin() as conn:
+        conn.execute(text("DELETE FROM insider_transactions WHERE issuer_ticker = 'REPLAY'"))
+        conn.execute(text("DELETE FROM insider_daily_flow WHERE issuer_ticker = 'REPLAY'"))
+
+
+def flow(engine):
+    with engine.connect() as conn:
+        return dict(conn.execute(text("""
+            SELECT to_char(period_of_report AT TIME ZONE 'UTC', 'MM-DD'), total_value::float8
+            FROM insider_daily_flow WHERE issuer_ticker = 'REPLAY'
+        """)).all())
+
+
+def replay_accessions(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT accession_no FROM insider_transactions WHERE issuer_ticker = 'REPLAY' ORDER BY 1"
+        )).scalars().all()
+
+
+def test_replace_transactions_swaps_range_and_daily_flow(etl, pg_engine):
+    loaded = transactions([
+        ("old-1", "2031-01-05", "2031-01-04", 10.0),
+        ("old-2", "2031-01-06", "2031-01-04", 20.0),
+        ("keep", "2031-02-03", "2031-01-04", 5.0),  # filed outside the range
+    ])
+    etl.replace_transactions(loaded, START, datetime(2031, 3, 1, tzinfo=UTC), set(loaded["accession_no"]))
+    assert flow(pg_engine) == {"01-04": 35.0}
+
+    stats = etl.replace_transactions(transactions([
+        ("new-1", "2031-01-05", "2031-01-09", 7.0),
+    ]), START, END, {"old-1", "old-2", "keep", "new-1"})
+
+    assert stats == {"deleted": 2, "inserted": 1, "flow_days": 2}
+    assert replay_accessions(pg_engine) == ["keep", "new-1"]
+    assert flow(pg_engine) == {"01-04": 5.0, "01-09": 7.0}
+
+
+def test_replace_transactions_keeps_filings_not_replayed(etl, pg_engine):
+    loaded = transactions([
+        ("archived", "2031-01-05", "2031-01-04", 10.0),
+        ("legacy", "2031-01-06", "2031-01-04", 20.0),  # never archived
+    ])
+    etl.replace_transactions(loaded, START, END, set(loaded["accession_no"]))
+
+    stats = etl.replace_transactions(transactions([]), START, END, {"archived"})
+
+    assert stats["deleted"] == 1
+    assert replay_accessions(pg_engine) == ["legacy"]
+    assert flow(pg_engine) == {"01-04": 20.0}
+
+
+def test_high_water_only_moves_forward(etl):
+    key = "insider_transactions[test-high-water]"
+    assert etl.high_water(key) is None
+
+    etl.set_high_water(key, datetime(2024, 3, 2, tzinfo=UTC))
+    etl.set_high_water(key, datetime(2024, 3, 1, tzinfo=UTC))
+
+    assert etl.high_water(key) == datetime(2024, 3, 2, tzinfo=UTC)
+
+
+def test_seed_mark_comes_from_loaded_rows_until_any_query_has_one(etl, pg_engine):
+    etl.replace_transactions(
+        transactions([{"accession_no": "seed", "filed_at": "2031-01-05 14:00", "period_of_report": "2031-01-04"}]),
+        START, END, {"seed"},
+    )
+    with pg_engine.begin() as conn:
+        conn.execute(text(r"DELETE FROM etl_state WHERE table_name LIKE 'insider\_transactions[%'"))
+
+    assert etl.unmarked_transactions_high_water() == datetime(2031, 1, 5, 14, tzinfo=UTC)
+
+    etl.set_high_water("insider_transactions[test-seed]", datetime(2024, 3, 2, tzinfo=UTC))
+    assert etl.unmarked_transactions_high_water() is None
@@ -0,0 +1,122 @@
+"""
+EXPLAIN-based regression tests: the repository's query shapes must be
+able to use the indexes declared in db.models / migrations c7e2f1a9d804
+and e41b9c2d7a6f.
+
+enable_seqscan is turned off so the assertion is about the index being
+usable for the query shape, not about seed-size cost estimates.
+"""
+import pytest
+from sqlalchemy import text
+
+from db.repository import (
+    OHLC_EXISTS_SQL,
+    ROLLUP_COLUMNS,
+    TRANSACTION_COLUMNS,
+    _build_select,
+)
+from insider_trading.load.accession_filter import LOADED_ACCESSIONS_SQL
+
+
+def _index_names(plan) -> set[str]:
+    found = set()
+    if isinstance(plan, dict):
+        if "Index Name" in plan:
+            found.add(plan["Index Name"])
+        for value in plan.values():
+            found |= _index_names(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            found |= _index_names(item)
+    return found
+
+
+def explain(engine, sql, params=None, driver_sql=True):
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        if driver_sql:
+            plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql, params or {}).scalar()
+        else:
+            plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql), params).scalar()
+        conn.rollback()
+    return _index_names(plan)
+
+
+def test_ticker_date_range_uses_composite(seeded_engine):
+    sql, params = _build_select(
+        "insider_transactions",
+        TRANSACTION_COLUMNS,
+        columns=["period_of_report", "reporter", "acquired_disposed", "total_value"],
+        start="2022-01-01",
+        end="2022-12-31",
+        ticker="T42",
+    )
+    assert "ix_insider_transactions_ticker_period" in explain(seeded_engine, sql, params)
+
+
+def test_date_range_only_uses_covering_index(seeded_engine):
+    sql, params = _build_select(
+        "insider_transactions",
+        TRANSACTION_COLUMNS,
+        columns=["period_of_report", "issuer_ticker", "acquired_disposed", "total_value"],
+        start="2022-01-01",
+        end="2022-01-31",
+    )
+    assert "ix_insider_transactions_period_cover" in explain(seeded_engine, sql, params)
+
+
+def test_reporter_tokens_use_trigram_index(seeded_engine):
+    sql, params = _build_select(
+        "insider_transactions",
+        TRANSACTION_COLUMNS,
+        columns=["period_of_report", "reporter", "total_value"],
+        reporter="Ecec Person",
+    )
+    assert "ix_insider_transactions_reporter_trgm" in explain(seeded_engine, sql, params)
+
+
+def test_reporter_cik_lookup_uses_composite(seeded_engine):
+    sql = (
+        "SELECT period_of_report, total_value FROM insider_transactions "
+        "WHERE reporter_cik = %(cik)s AND period_of_report >= %(start)s"
+    )
+    names = explain(seeded_engine, sql, {"cik": "0000004242", "start": "2020-01-01"})
+    assert "ix_insider_transactions_reporter_cik_period" in names
+
+
+def test_rollup_join_uses_ticker_indexes(seeded_engine):
+    sql, params = _build_select(
+        "insider_rollup",
+        ROLLUP_COLUMNS,
+        columns=["sector", "total_value", "period_of_report", "acquired_disposed"],
+        start="2022-01-01",
+        end="2022-12-31",
+        ticker="T42",
+    )
+    names = explain(seeded_engine, sql, params)
+    assert "ix_insider_transactions_ticker_period" in names
+    assert "uq_exchange_mapping_issuer_ticker" in names
+
+
+def test_filed_at_range_uses_brin(seeded_engine):
+    sql = (
+        "SELECT accession_no FROM insider_transactions "
+        "WHERE filed_at >= %(start)s AND filed_at < %(end)s"
+    )
+    names = explain(seeded_engine, sql, {"start": "2024-03-01", "end": "2024-03-02"})
+    assert "ix_insider_transactions_filed_at_brin" in names
+
+
+def test_ohlc_exists_in_range_uses_primary_key(seeded_engine):
+    names = explain(
+        seeded_engine,
+        OHLC_EXISTS_SQL,
+        {"ticker": "T7", "start": "2022-03-01", "end": "2022-03-31"},
+        driver_sql=False,
+    )
+    assert "ohlc_prices_pkey" in names
+
+
+def test_accession_skip_uses_accession_index(seeded_engine):
+    plan = explain(seeded_engine, LOADED_ACCESSIONS_SQL, {"keys": ["acc-1", "acc-2"]}, driver_sql=False)
+    assert "ix_insider_transactions_accession_no" in plan
@@ -0,0 +1,106 @@
+import pytest
+
+from db.repository import (
+    DAILY_FLOW_COLUMNS,
+    ROLLUP_COLUMNS,
+    TRANSACTION_COLUMNS,
+    _build_select,
+)
+
+
+def test_build_select_defaults_to_all_columns():
+    sql, params = _build_select("insider_transactions", TRANSACTION_COLUMNS)
+
+    assert sql.startswith('SELECT "id", "accession_no"')
+    assert "WHERE" not in sql
+    assert sql.endswith("ORDER BY period_of_report")
+    assert params == {}
+
+
+def test_build_select_projects_and_quotes_columns():
+    sql, _ = _build_select(
+        "insider_transactions", TRANSACTION_COLUMNS, columns=["table", "code"]
+    )
+
+    assert sql.startswith('SELECT "table", "code" FROM insider_transactions')
+
+
+def test_build_select_rejects_unknown_columns():
+    with pytest.raises(ValueError):
+        _build_select("insider_transactions", TRANSACTION_COLUMNS, columns=["total_value; DROP"])
+
+
+def test_build_select_binds_filters_as_params():
+    sql, params = _build_select(
+        "insider_rollup",
+        ROLLUP_COLUMNS,
+        start="2022-01-01",
+        end="2022-12-31",
+        ticker="TSLA",
+        side=["A", "D"],
+    )
+
+    assert "period_of_report >= %(start)s" in sql
+    assert "period_of_report <= %(end)s" in sql
+    assert '"issuer_ticker" = %(ticker)s' in sql
+    assert '"acquired_disposed" = ANY(%(side)s)' in sql
+    assert params == {
+        "start": "2022-01-01",
+        "end": "2022-12-31",
+        "ticker": "TSLA",
+        "side": ["A", "D"],
+    }
+
+
+def test_build_select_reporter_tokens_prefilter():
+    sql, params = _build_select(
+        "insider_transactions", TRANSACTION_COLUMNS, reporter="Musk, Elon"
+    )
+
+    assert sql.count("reporter ILIKE") == 2
+    assert sorted(params.values()) == ["%elon%", "%musk%"]
+
+
+def test_build_select_skips_none_filters():
+    sql, params = _build_select(
+        "insider_transactions", TRANSACTION_COLUMNS, ticker=None, cik=None, code=None
+    )
+
+    assert "WHERE" not in sql
+    assert params == {}
+
+
+def test_build_select_rejects_filter_missing_from_source():
+    with pytest.raises(ValueError):
+        _build_select("insider_daily_flow", DAILY_FLOW_COLUMNS, cik="0001318605")
+
+
+def test_build_select_casts_numeric_columns_to_float():
+    sql, _ = _build_select(
+        "insider_transactions", TRANSACTION_COLUMNS, columns=["code", "total_value"]
+    )
+
+    assert sql.startswith('SELECT "code", "total_value"::float8 AS "total_value"')
+
+
+def test_apply_read_dtypes_compacts_columns():
+    from decimal import Decimal
+
+    import pandas as pd
+
+    from db.repository import STRING_DTYPE, apply_read_dtypes
+
+    df = pd.DataFrame({
+        "total_value": [Decimal("1.5"), None],
+        "sector": ["Energy", None],
+        "is_officer": [True, None],
+        "id": [1, 2],
+    })
+    out = apply_read_dtypes(df)
+
+    assert out["total_value"].dtype == "float64"
+    assert out["sector"].dtype == STRING_DTYPE
+    assert out["is_officer"].dtype == "boolean"
+    assert out["id"].dtype == "int64"
+    # NaN-backed strings keep comparisons as plain bool masks
+    assert (out["sector"] == "Energy").tolist() == [True, False]
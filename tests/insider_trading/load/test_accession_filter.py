@@ -0,0 +1,27 @@
+"""
+AccessionFilter against the seeded database (accessions 'acc-0' … 'acc-66666').
+Needs TEST_DATABASE_URL (see tests/conftest.py).
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from insider_trading.load.accession_filter import AccessionFilter
+
+
+@pytest.fixture
+def accession_filter(seeded_engine):
+    return AccessionFilter(SimpleNamespace(engine=seeded_engine))
+
+
+def test_drop_loaded_keeps_only_new_filings(accession_filter):
+    new = {"accessionNo": uuid4().hex, "filedAt": "2016-01-01T05:00:00Z"}
+    raw = [
+        {"accessionNo": "acc-10", "filedAt": "2016-01-01T10:00:00Z"},
+        new,
+        {"accessionNo": "acc-20"},
+        {"documentType": "4"},  # no accession → cannot tell, keep
+    ]
+
+    assert accession_filter.drop_loaded(raw) == [new, {"documentType": "4"}]
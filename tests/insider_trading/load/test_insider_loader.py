@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from insider_trading.load.insider_loader import InsiderTransactionsLoader
+
+
+@pytest.fixture
+def transactions():
+    return pd.DataFrame([
+        {
+            "issuer_ticker": "TSLA",
+            "period_of_report": "2022-03-14T00:00:00Z",
+            "acquired_disposed": "D",
+            "code": "S",
+            "shares": 10.0,
+            "total_value": 1000.0,
+        },
+        {
+            "issuer_ticker": "TSLA",
+            "period_of_report": "2022-03-14T16:30:00Z",
+            "acquired_disposed": "D",
+            "code": "S",
+            "shares": 5.0,
+            "total_value": 600.0,
+        },
+        {
+            "issuer_ticker": "TSLA",
+            "period_of_report": "2022-03-14T00:00:00Z",
+            "acquired_disposed": "A",
+            "code": "P",
+            "shares": 1.0,
+            "total_value": 200.0,
+        },
+        {
+            "issuer_ticker": None,
+            "period_of_report": "2022-03-15T00:00:00Z",
+            "acquired_disposed": "A",
+            "code": "P",
+            "shares": 2.0,
+            "total_value": 50.0,
+        },
+    ]).assign(period_of_report=lambda d: pd.to_datetime(d["period_of_report"], utc=True))
+
+
+def test_daily_flow_sums_and_counts_per_key(transactions):
+    flow = InsiderTransactionsLoader.daily_flow(transactions)
+
+    sold = flow[(flow["issuer_ticker"] == "TSLA") & (flow["acquired_disposed"] == "D")]
+    assert len(sold) == 1
+    assert sold.iloc[0]["total_value"] == 1600.0
+    assert sold.iloc[0]["shares"] == 15.0
+    assert sold.iloc[0]["n_transactions"] == 2
+
+
+def test_daily_flow_truncates_to_day(transactions):
+    flow = InsiderTransactionsLoader.daily_flow(transactions)
+
+    days = {ts.isoformat() for ts in flow["period_of_report"]}
+    assert days == {"2022-03-14T00:00:00+00:00", "2022-03-15T00:00:00+00:00"}
+
+
+def test_daily_flow_keeps_null_keys_as_none(transactions):
+    flow = InsiderTransactionsLoader.daily_flow(transactions)
+
+    unknown = flow[flow["issuer_ticker"].isna()]
+    assert len(unknown) == 1
+    assert unknown.iloc[0]["issuer_ticker"] is None
+    assert unknown.iloc[0]["n_transactions"] == 1
+
+
+def test_daily_flow_total_matches_raw(transactions):
+    flow = InsiderTransactionsLoader.daily_flow(transactions)
+
+    assert flow["total_value"].sum() == transactions["total_value"].sum()
+    assert flow["n_transactions"].sum() == len(transactions)
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, UTC
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from insider_trading.extract.sources.insider_api_source import InsiderApiSource
+from insider_trading.tasks.poll_task import PollTask, freshness_lags
+from utils.metrics import start_run
+
+
+# ------------------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------------------
+
+class FakeTask:
+    """Stages of InsiderTransactionsTask over a list of (accession, filed_at) batches."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.params = []
+
+    def extract(self, params):
+        self.params.append(params)
+        batch = self.batches.pop(0)
+        if isinstance(batch, Exception):
+            raise batch
+        return batch
+
+    def transform(self, raw):
+        if not raw:
+            return None
+        return pd.DataFrame(raw, columns=["accession_no", "filed_at"])
+
+    def write_final(self, df):
+        pass
+
+    def load(self, df):
+        return df
+
+
+@pytest.fixture
+def run():
+    return start_run("poll")
+
+
+def poller(task, marks):
+    return PollTask(
+        task,
+        query="*:*",
+        since=lambda: marks[-1] if marks else None,
+        on_loaded=lambda df: df is not None and marks.append(df["filed_at"].max().to_pydatetime()),
+        interval=0,
+    )
+
+
+# ------------------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------------------
+
+def test_polls_from_high_water_minus_overlap_and_advances_it(run):
+    now = datetime.now(UTC)
+    mark = now - timedelta(hours=1)
+    new = pd.Timestamp(now - timedelta(minutes=2))
+    task = FakeTask([[("a", new), ("a", new)], []])
+    marks = [mark]
+
+    assert poller(task, marks).run(max_polls=2) == 1
+
+    assert task.params[0]["since"] == mark - PollTask.OVERLAP
+    assert task.params[1]["since"] == new.to_pydatetime() - PollTask.OVERLAP
+    fresh = run.report()["freshness"]
+    assert (fresh["filings"], fresh["batches"]) == (1, 2)
+    assert 120 <= fresh["lag_s"][1.0] < 180
+    assert fresh["newest_filed_at"] == new.timestamp()
+
+
+def test_failed_batch_keeps_polling(run):
+    filed = pd.Timestamp(datetime.now(UTC))
+    task = FakeTask([RuntimeError("api down"), [("b", filed)]])
+    marks = []
+
+    assert poller(task, marks).run(max_polls=2) == 1
+    # no mark yet → first lookback window, for the failed and the retried poll alike
+    assert task.params[0]["since"] < datetime.now(UTC) - PollTask.FIRST_LOOKBACK + timedelta(seconds=5)
+    assert marks == [filed.to_pydatetime()]
+
+
+def test_freshness_lags_count_filings_once():
+    committed = datetime(2024, 1, 1, 12, tzinfo=UTC)
+    df = pd.DataFrame({
+        "accession_no": ["a", "a", "b"],
+        "filed_at": pd.to_datetime(["2024-01-01T11:59:00Z"] * 2 + ["2024-01-01T11:00:00Z"]),
+    })
+    assert freshness_lags(df, committed) == [60.0, 3600.0]
+    assert freshness_lags(None, committed) == []
+
+
+def test_prometheus_exports_freshness(run):
+    run.record_freshness([10.0, 20.0, 600.0], datetime(2024, 1, 1, tzinfo=UTC))
+    prom = run.prometheus()
+
+    assert 'insider_etl_freshness_lag_seconds{run="poll",quantile="1.0"} 600.0' in prom
+    assert 'insider_etl_freshness_filings_total{run="poll"} 3' in prom
+
+
+def test_fetch_since_stops_at_first_older_filing():
+    adapter = MagicMock()
+    adapter.fetch.side_effect = [
+        {"transactions": [
+            {"accessionNo": "new", "filedAt": "2024-03-05T10:00:00-05:00"},
+            {"accessionNo": "old", "filedAt": "2024-03-05T08:00:00-05:00"},
+        ]},
+        {"transactions": [{"accessionNo": "older", "filedAt": "2024-03-04T08:00:00-05:00"}]},
+    ]
+    source = InsiderApiSource(sec_api_adapter=adapter, http_adapter=MagicMock())
+
+    since = datetime(2024, 3, 5, 14, tzinfo=UTC)  # 09:00 New York
+    got = list(source.fetch_insider_transactions_since("*:*", since, sleep_seconds=0))
+
+    assert [t["accessionNo"] for t in got] == ["new"]
+    assert adapter.fetch.call_count == 1
+    query = adapter.fetch.call_args.args[2]["query"]["query_string"]["query"]
+    assert query == "(*:*) AND filedAt:[2024-03-05 TO *]"
@@ -0,0 +1,144 @@
+import json
+import os
+
+import pytest
+
+from db.etl_db import ETLDatabase
+from db.file_ledger import ProcessedFileLedger, file_sha256
+from insider_trading.tasks import raw_files_task
+from insider_trading.tasks.raw_files_task import RawFilesTask
+
+
+# ------------------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------------------
+
+class MemoryLedger(ProcessedFileLedger):
+    """ProcessedFileLedger over a dict instead of processed_raw_files."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def get(self, sha256):
+        return self.rows.get(sha256)
+
+    def get_by_stat(self, path, size_bytes, mtime_ns):
+        for entry in self.rows.values():
+            if (entry["path"], entry["size_bytes"], entry["mtime_ns"]) == (path, size_bytes, mtime_ns):
+                return entry
+        return None
+
+    def set_stat(self, sha256, path, mtime_ns):
+        self.rows[sha256].update(path=path, mtime_ns=mtime_ns)
+
+    def record(self, sha256, name, size_bytes, status, filings=None, rows_loaded=None, error=None,
+               path=None, mtime_ns=None):
+        self.rows[sha256] = {
+            "sha256": sha256, "name": name, "status": status, "filings": filings, "rows_loaded": rows_loaded,
+            "path": path, "size_bytes": size_bytes, "mtime_ns": mtime_ns,
+        }
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"insider_transactions_{n}.json"
+        path.write_text(json.dumps([{"accessionNo": f"acc-{n}"}] * (n + 1)))
+        paths.append(path)
+    return paths
+
+
+def counting_process(calls, fail_on=None):
+    def process(path):
+        if path.name == fail_on:
+            raise ValueError("bad file")
+        calls.append(path.name)
+        filings = len(json.loads(path.read_text()))
+        return filings, 2 * filings
+    return process
+
+
+def manifest_of(tmp_path):
+    (path,) = (tmp_path / "manifests").glob("build_dataset_*.json")
+    return json.loads(path.read_text())
+
+
+# ------------------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------------------
+
+def test_second_run_skips_loaded_files_and_force_reprocesses(files, tmp_path):
+    ledger, calls = MemoryLedger(), []
+    task = RawFilesTask(ledger, counting_process(calls), manifest_dir=tmp_path / "manifests")
+
+    manifest = task.run(files)
+    assert calls == [f.name for f in files]
+    assert manifest["totals"] == {
+        "loaded": 3, "skipped": 0, "failed": 0, "not_reached": 0, "filings": 6, "rows_loaded": 12,
+    }
+    assert manifest_of(tmp_path)["files"][2]["sha256"] == file_sha256(files[2])
+
+    # a renamed copy has the same content → same ledger entry
+    files[0].rename(files[0].with_name("insider_transactions_copy.json"))
+    rerun = task.run(sorted(tmp_path.glob("insider_transactions_*.json")))
+    assert rerun["totals"]["skipped"] == 3 and len(calls) == 3
+
+    forced = task.run(files[1:], force=True)
+    assert forced["totals"]["loaded"] == 2 and len(calls) == 5
+
+
+def test_unchanged_files_are_skipped_without_hashing(files, tmp_path, monkeypatch):
+    hashed = []
+
+    def counting_sha256(path):
+        hashed.append(path.name)
+        return file_sha256(path)
+
+    monkeypatch.setattr(raw_files_task, "file_sha256", counting_sha256)
+    task = RawFilesTask(MemoryLedger(), counting_process([]), manifest_dir=tmp_path / "manifests")
+
+    task.run(files)
+    assert len(hashed) == 3
+
+    # touched, same content: hashed once, then known by stat again
+    st = files[0].stat()
+    os.utime(files[0], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert task.run(files)["totals"]["skipped"] == 3
+    assert task.run(files)["totals"]["skipped"] == 3
+    assert hashed == [f.name for f in files] + [files[0].name]
+
+
+def test_failure_is_recorded_and_stops_the_run(files, tmp_path):
+    ledger, calls = MemoryLedger(), []
+    task = RawFilesTask(ledger, counting_process(calls, fail_on=files[1].name), manifest_dir=tmp_path / "manifests")
+
+    with pytest.raises(RuntimeError, match="bad file"):
+        task.run(files)
+
+    assert calls == [files[0].name]
+    assert ledger.get(file_sha256(files[1]))["status"] == "failed"
+    assert manifest_of(tmp_path)["totals"]["not_reached"] == 1
+
+    # failed files are retried without --force
+    assert not ledger.is_loaded(file_sha256(files[1]))
+
+
+def test_ledger_round_trip(pg_engine):
+    db = ETLDatabase()
+    db.engine = pg_engine
+    ledger = ProcessedFileLedger(db)
+
+    assert ledger.get("f" * 64) is None
+    ledger.record("f" * 64, "a.json", 10, ProcessedFileLedger.FAILED, error="boom")
+    ledger.record("f" * 64, "a.json", 10, ProcessedFileLedger.LOADED, filings=3, rows_loaded=7,
+                  path="/raw/a.json", mtime_ns=123)
+
+    entry = ledger.get("f" * 64)
+    assert (entry["status"], entry["filings"], entry["rows_loaded"], entry["error"]) == ("loaded", 3, 7, None)
+    assert ledger.is_loaded("f" * 64)
+
+    assert ledger.get_by_stat("/raw/a.json", 10, 123)["sha256"] == "f" * 64
+    ledger.set_stat("f" * 64, "/raw/b.json", 456)
+    assert ledger.get_by_stat("/raw/a.json", 10, 123) is None
+    assert ledger.get_by_stat("/raw/b.json", 10, 456)["sha256"] == "f" * 64
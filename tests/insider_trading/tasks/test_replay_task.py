@@ -0,0 +1,132 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from insider_trading.tasks.replay_task import ReplayTask
+from insider_trading.transform.insider_transformer import InsiderTransactionsTransformer
+from writers.final_writer import FinalWriter, read_manifest
+from writers.raw_archive import RawArchive
+
+
+# ------------------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------------------
+
+def filing(n: int, filed_at: str, price: float):
+    return {
+        "accessionNo": f"acc-{n}",
+        "filedAt": filed_at,
+        "periodOfReport": filed_at[:10],
+        "documentType": "4",
+        "issuer": {"tradingSymbol": "AAPL", "cik": "320193", "name": "Apple Inc"},
+        "reportingOwner": {"name": "Cook Timothy", "cik": "1214156", "relationship": {}},
+        "nonDerivativeTable": {"transactions": [{
+            "coding": {"code": "P"},
+            "amounts": {"shares": 10, "pricePerShare": price, "acquiredDisposedCode": "A"},
+            "transactionDate": filed_at[:10],
+        }]},
+    }
+
+
+class StricterTransformer(InsiderTransactionsTransformer):
+    """A changed business rule: drop anything priced at 100 or more."""
+
+    def validate(self, df):
+        df = super().validate(df)
+        return df[df["price_per_share"] < 100]
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = RawArchive(tmp_path / "archive")
+    archive.add([
+        filing(1, "2022-01-03T10:00:00-05:00", 50.0),
+        filing(2, "2022-01-04T10:00:00-05:00", 150.0),
+        filing(3, "2022-02-01T10:00:00-05:00", 150.0),  # outside the replay range
+    ])
+    yield archive
+    archive.close()
+
+
+@pytest.fixture
+def writer(tmp_path):
+    transformer = InsiderTransactionsTransformer()
+    return FinalWriter(
+        tmp_path / "final",
+        expected_schema=transformer.SCHEMA,
+        partition_by="period_of_report",
+    )
+
+
+def gold(writer):
+    return pd.read_parquet(writer.directory / ReplayTask.DATASET).sort_values("accession_no")
+
+
+# ------------------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------------------
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_replay_swaps_only_the_filed_range(archive, writer, workers):
+    # first load under the old rules
+    writer.save(ReplayTask.DATASET, InsiderTransactionsTransformer().transform(
+        list(archive.iter_range())
+    ))
+    db = MagicMock()
+    db.replace_transactions.return_value = {}
+
+    task = ReplayTask(archive, StricterTransformer(), writer, db, workers=workers)
+    stats = task.run("2022-01-01", "2022-01-31", batch_size=1)
+
+    assert gold(writer)["accession_no"].tolist() == ["acc-1", "acc-3"]
+    assert stats["gold_version"] == 2
+
+    df, start, end, accessions = db.replace_transactions.call_args.args
+    assert df["accession_no"].tolist() == ["acc-1"]
+    assert accessions == {"acc-1", "acc-2"}
+    assert (start.isoformat(), end.isoformat()) == (
+        "2022-01-01T00:00:00+00:00", "2022-02-01T00:00:00+00:00"
+    )
+
+
+def test_replay_with_no_surviving_rows_still_clears_the_range(archive, writer):
+    writer.save(ReplayTask.DATASET, InsiderTransactionsTransformer().transform(
+        list(archive.iter_range())
+    ))
+    before = len(read_manifest(writer.directory / ReplayTask.DATASET)["files"])
+
+    task = ReplayTask(archive, StricterTransformer(), writer, MagicMock(), workers=1)
+    task.run("2022-01-04", "2022-01-04")
+
+    assert gold(writer)["accession_no"].tolist() == ["acc-1", "acc-3"]
+    # only the January file was rewritten
+    assert len(read_manifest(writer.directory / ReplayTask.DATASET)["files"]) == before
+
+
+def test_replay_keeps_filings_that_were_never_archived(archive, writer):
+    # loaded straight from a legacy raw JSON file, filed inside the range
+    legacy = filing(9, "2022-01-05T10:00:00-05:00", 150.0)
+    writer.save(ReplayTask.DATASET, InsiderTransactionsTransformer().transform(
+        list(archive.iter_range()) + [legacy]
+    ))
+
+    task = ReplayTask(archive, StricterTransformer(), writer, MagicMock(), workers=1)
+    task.run("2022-01-01", "2022-01-31")
+
+    assert gold(writer)["accession_no"].tolist() == ["acc-1", "acc-3", "acc-9"]
+
+
+def test_failed_db_swap_leaves_gold_on_the_old_rules(archive, writer):
+    writer.save(ReplayTask.DATASET, InsiderTransactionsTransformer().transform(
+        list(archive.iter_range())
+    ))
+    db = MagicMock()
+    db.replace_transactions.side_effect = RuntimeError("connection lost")
+
+    task = ReplayTask(archive, StricterTransformer(), writer, db, workers=1)
+    with pytest.raises(RuntimeError):
+        task.run("2022-01-01", "2022-01-31")
+
+    assert gold(writer)["accession_no"].tolist() == ["acc-1", "acc-2", "acc-3"]
+    assert read_manifest(writer.directory / ReplayTask.DATASET)["version"] == 1
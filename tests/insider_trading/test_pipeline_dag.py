@@ -0,0 +1,34 @@
+from datetime import datetime, UTC
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from insider_trading.pipeline import InsiderTradingPipeline
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # writers create data/* under cwd
+    config = SimpleNamespace(base_url="", sec_api_key="", test_mode_map=False, test_mode_tx=False)
+    db = MagicMock()
+    db.last_updated.return_value = None  # everything stale
+    db.high_water.return_value = None
+    db.unmarked_transactions_high_water.return_value = None
+    return InsiderTradingPipeline(config, db)
+
+
+def test_transactions_load_waits_for_mapping_load_only(pipeline):
+    dag = pipeline.build_dag()
+
+    assert dag.deps("transactions.load") == (
+        "transactions.transform", "transactions.final", "mapping.load"
+    )
+    assert dag.deps("transactions.extract") == ()
+    assert dag.deps("mapping.extract") == ()
+
+
+def test_fresh_stages_are_left_out(pipeline):
+    pipeline.db.last_updated.return_value = datetime.now(UTC)
+
+    assert pipeline.build_dag().tasks == {}
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, UTC
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from insider_trading.pipeline import InsiderTradingPipeline
+
+
+# ------------------------------------------------------------------------
+# Fixtures
+# ------------------------------------------------------------------------
+
+@pytest.fixture
+def marks():
+    return {}
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch, marks):
+    monkeypatch.chdir(tmp_path)  # writers create data/* under cwd
+    db = MagicMock()
+    db.high_water.side_effect = marks.get
+    db.unmarked_transactions_high_water.return_value = None
+    return InsiderTradingPipeline(SimpleNamespace(base_url="", sec_api_key=""), db)
+
+
+TODAY = datetime.now(UTC).date()
+
+
+# ------------------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------------------
+
+def test_first_run_takes_refresh_days(pipeline):
+    start, end = pipeline._compute_transactions_window()
+
+    assert start == (TODAY - timedelta(days=InsiderTradingPipeline.TRANSACTION_REFRESH_DAYS)).isoformat()
+    assert end == TODAY.isoformat()
+
+
+def test_window_restarts_at_high_water_minus_overlap(pipeline, marks):
+    # one day of overlap behind the newest filing loaded
+    marks["insider_transactions[*:*]"] = datetime(2024, 3, 5, 2, 30, tzinfo=UTC)
+
+    start, _ = pipeline._compute_transactions_window()
+
+    assert start == "2024-03-04"
+
+
+def test_upgraded_deployment_seeds_the_mark_from_loaded_rows(pipeline):
+    # rows loaded before high-water marks existed: no 7-day fallback
+    pipeline.db.unmarked_transactions_high_water.return_value = datetime(2024, 3, 5, 2, 30, tzinfo=UTC)
+
+    assert pipeline._compute_transactions_window("issuer.tradingSymbol:TSLA")[0] == "2024-03-04"
+    pipeline.db.set_high_water.assert_called_once_with(
+        "insider_transactions[*:*]", datetime(2024, 3, 5, 2, 30, tzinfo=UTC)
+    )
+
+
+def test_query_watermark_is_separate_but_honours_global(pipeline, marks):
+    query = "issuer.tradingSymbol:TSLA"
+    marks[InsiderTradingPipeline.watermark_key("*:*")] = datetime(2024, 3, 1, tzinfo=UTC)
+    marks[InsiderTradingPipeline.watermark_key(query)] = datetime(2024, 6, 1, tzinfo=UTC)
+
+    assert pipeline._compute_transactions_window(query)[0] == "2024-05-31"
+    assert pipeline._compute_transactions_window()[0] == "2024-02-29"
+
+
+def test_only_loaded_rows_advance_the_watermark(pipeline):
+    pipeline._advance_watermark("*:*", None)
+    pipeline._advance_watermark("*:*", pd.DataFrame({"filed_at": pd.Series([], dtype="datetime64[ns, UTC]")}))
+    pipeline.db.set_high_water.assert_not_called()
+
+    loaded = pd.DataFrame({"filed_at": pd.to_datetime(["2024-03-01 10:00", "2024-03-02 09:00"], utc=True)})
+    pipeline._advance_watermark("issuer.tradingSymbol:TSLA", loaded)
+
+    pipeline.db.set_high_water.assert_called_once_with(
+        "insider_transactions[issuer.tradingSymbol:TSLA]", datetime(2024, 3, 2, 9, tzinfo=UTC)
+    )
+
+
+def test_ticker_run_does_not_make_the_global_run_fresh(pipeline):
+    ran = {
+        "insider_transactions": datetime.now(UTC),  # bumped by every load
+        "insider_transactions[issuer.tradingSymbol:TSLA]": datetime.now(UTC),
+    }
+    pipeline.db.last_updated.side_effect = ran.get
+
+    assert not pipeline.transactions_are_stale("issuer.tradingSymbol:TSLA")
+    assert pipeline.transactions_are_stale()
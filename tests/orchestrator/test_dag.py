@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pytest
+
+from orchestrator.dag import DAG
+
+
+def test_inputs_are_passed_and_after_orders():
+    calls = []
+    dag = DAG(max_workers=2)
+    dag.add("a", lambda: 2)
+    dag.add("b", lambda: calls.append("b") or 3)
+    dag.add("c", lambda a, b: calls.append("c") or a * b, inputs=["a", "b"])
+    dag.add("d", lambda: calls.append("d"), after=["c"])
+
+    run = dag.run()
+
+    assert run.results["c"] == 6
+    assert calls == ["b", "c", "d"]
+    assert set(run.timings) == {"a", "b", "c", "d"}
+
+
+def test_independent_tasks_overlap():
+    both_started = threading.Barrier(2, timeout=5)
+    dag = DAG(max_workers=2)
+    dag.add("left", both_started.wait)
+    dag.add("right", both_started.wait)
+
+    dag.run()  # would time out (BrokenBarrierError) if run one after the other
+
+
+def test_critical_path_follows_the_slowest_chain():
+    dag = DAG(max_workers=4)
+    dag.add("fast_extract", lambda: time.sleep(0.01))
+    dag.add("slow_extract", lambda: time.sleep(0.15))
+    dag.add("load", lambda: None, after=["fast_extract", "slow_extract"])
+
+    run = dag.run()
+
+    assert run.critical_path == ["slow_extract", "load"]
+    assert run.task_wall("slow_extract") >= 0.15
+    assert "critical path" in run.report()
+
+
+def test_failure_stops_downstream_and_reraises():
+    ran = []
+    dag = DAG()
+    dag.add("extract", lambda: 1 / 0)
+    dag.add("load", lambda x: ran.append(x), inputs=["extract"])
+
+    with pytest.raises(ZeroDivisionError):
+        dag.run()
+    assert ran == []
+
+
+@pytest.mark.parametrize("edges, message", [
+    ({"a": ["b"], "b": ["a"]}, "Cycle"),
+    ({"a": ["missing"]}, "unknown"),
+])
+def test_invalid_graphs_are_rejected(edges, message):
+    dag = DAG()
+    for name, deps in edges.items():
+        dag.add(name, lambda: None, after=deps)
+
+    with pytest.raises(ValueError, match=message):
+        dag.run()
@@ -0,0 +1,77 @@
+import pytest
+
+from utils import memprofile
+from utils.metrics import span, start_run
+
+MiB = 1024**2
+
+
+@pytest.fixture
+def profiled():
+    memprofile.enable()
+    yield start_run("test")
+    memprofile.disable()
+
+
+def allocate(n_bytes):
+    return bytearray(n_bytes)
+
+
+def test_span_records_peak_of_temporary_allocation(profiled):
+    with span("transform"):
+        allocate(8 * MiB)  # freed before the span ends
+
+    stage = profiled.stages()["transform"]
+    assert stage["mem_peak_bytes"] >= 8 * MiB
+    assert "rss_delta_bytes" in stage
+
+
+def test_child_peak_propagates_to_parent(profiled):
+    with span("outer"):
+        with span("inner"):
+            allocate(4 * MiB)
+        with span("small"):
+            allocate(1024)
+
+    stages = profiled.stages()
+    assert stages["outer.inner"]["mem_peak_bytes"] >= 4 * MiB
+    assert stages["outer.small"]["mem_peak_bytes"] < MiB
+    # reset_peak() in the later child must not hide the earlier one
+    assert stages["outer"]["mem_peak_bytes"] >= 4 * MiB
+
+
+def test_parent_peak_before_first_child_is_kept(profiled):
+    with span("outer"):
+        allocate(50 * MiB)  # freed before the child starts
+        with span("inner"):
+            allocate(1 * MiB)
+
+    stages = profiled.stages()
+    assert stages["outer"]["mem_peak_bytes"] >= 50 * MiB
+    assert stages["outer.inner"]["mem_peak_bytes"] < 50 * MiB
+
+
+def test_top_sites_point_at_retained_allocation(profiled):
+    kept = []
+    with span("load"):
+        kept.append(allocate(2 * MiB))
+
+    report = profiled.report()
+    top = report["memory_top_sites"][0]
+    assert top["stage"] == "load"
+    assert "test_memprofile.py" in top["site"]
+    assert top["size_diff_bytes"] >= 2 * MiB
+
+    text = memprofile.format_report(profiled)
+    assert "load" in text and "top allocation sites" in text
+    assert "stage_mem_peak_bytes" in profiled.prometheus()
+
+
+def test_disabled_spans_have_no_memory_fields():
+    run = start_run("test")
+    with span("transform"):
+        allocate(MiB)
+
+    assert "mem_peak_bytes" not in run.stages()["transform"]
+    assert "memory_top_sites" not in run.report()
+    assert "stage_mem_peak_bytes" not in run.prometheus()
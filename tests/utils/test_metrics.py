@@ -0,0 +1,67 @@
+import json
+import threading
+
+import pytest
+
+from insider_trading.transform.insider_transformer import InsiderTransactionsTransformer
+from utils import metrics
+from utils.metrics import RunMetrics, measured, span, start_run
+
+
+@pytest.fixture
+def run():
+    return start_run("test")
+
+
+def test_nested_spans_are_prefixed_and_repeats_summed(run):
+    with span("transactions.transform", rows_in=3) as s:
+        measured("clean", lambda rows: rows[:2], [1, 2, 3])
+        measured("clean", lambda rows: rows, [1])
+        s.rows_out = 2
+
+    stages = run.stages()
+
+    assert set(stages) == {"transactions.transform", "transactions.transform.clean"}
+    clean = stages["transactions.transform.clean"]
+    assert (clean["calls"], clean["rows_in"], clean["rows_out"]) == (2, 4, 3)
+    assert stages["transactions.transform"]["rows_per_s"] > 0
+
+
+def test_spans_on_other_threads_are_roots(run):
+    with span("parent"):
+        t = threading.Thread(target=lambda: measured("worker", list, []))
+        t.start()
+        t.join()
+
+    assert set(run.stages()) == {"parent", "worker"}
+
+
+def test_transformer_reports_each_step(run):
+    InsiderTransactionsTransformer().transform([])
+
+    assert {"normalize", "clean", "dedupe", "validate"} <= set(run.stages())
+
+
+def test_emit_writes_json_report_and_prometheus_textfile(run, tmp_path):
+    with span("mapping.load", rows_in=10):
+        pass
+    run.extra["status"] = "ok"
+
+    json_path, prom_path = run.emit(tmp_path)
+
+    report = json.loads(json_path.read_text())
+    assert report["status"] == "ok"
+    assert report["stages"]["mapping.load"]["rows_in"] == 10
+
+    prom = prom_path.read_text()
+    assert "# TYPE insider_etl_stage_wall_seconds gauge" in prom
+    assert 'insider_etl_stage_rows_in{run="test",stage="mapping.load"} 10' in prom
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_start_run_replaces_current():
+    first = start_run("a")
+    second = start_run("b")
+
+    assert metrics.current_run() is second is not first
+    assert isinstance(second, RunMetrics)
@@ -3,7 +3,10 @@ import pytest
 import time
 from pathlib import Path
 
-from writers.final_writer import FinalWriter
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from writers.final_writer import NULL_PARTITION, FinalWriter, manifest_files, read_manifest
 
 
 # ------------------------------------------------------------
@@ -150,3 +153,158 @@ def test_final_writer_overwrite_mode(tmp_dir, schema, enforce_types, valid_df):
 
     assert path1 == path2
     assert path1.exists()
+
+
+# ------------------------------------------------------------
+# Partitioned dataset mode
+# ------------------------------------------------------------
+
+@pytest.fixture
+def partitioned(tmp_dir):
+    return FinalWriter(
+        directory=tmp_dir,
+        expected_schema=["issuer_ticker", "period_of_report", "total_value"],
+        partition_by="period_of_report",
+        row_group_size=2,
+    )
+
+
+def tx(*periods):
+    return pd.DataFrame({
+        "issuer_ticker": ["AAPL"] * len(periods),
+        "period_of_report": pd.to_datetime(list(periods), utc=True),
+        "total_value": [float(i) for i in range(len(periods))],
+    })
+
+
+def test_partitioned_save_writes_hive_layout_and_manifest(partitioned, tmp_dir):
+    dataset = partitioned.save("tx", tx("2022-01-03", "2022-01-20", "2022-03-01", None))
+
+    manifest = read_manifest(dataset)
+    paths = sorted(Path(e["path"]).parent.as_posix() for e in manifest["files"])
+    assert paths == [
+        "year=2022/month=01",
+        "year=2022/month=03",
+        f"year={NULL_PARTITION}/month={NULL_PARTITION}",
+    ]
+    assert manifest["version"] == 1
+    assert sum(e["rows"] for e in manifest["files"]) == 4
+
+    january = next(e for e in manifest["files"] if "month=01" in e["path"])
+    meta = pq.ParquetFile(dataset / january["path"]).metadata
+    assert meta.num_row_groups == 1
+    assert meta.row_group(0).column(0).compression == "ZSTD"
+
+
+def test_manifest_files_prunes_by_range(partitioned):
+    dataset = partitioned.save("tx", tx("2022-01-03", "2022-03-01", "2023-06-01", None))
+
+    assert len(manifest_files(dataset)) == 4
+    selected = manifest_files(dataset, start="2022-02-01", end="2022-12-31")
+    assert [p.parent.name for p in selected] == ["month=03"]
+
+
+def test_compact_merges_small_files(partitioned):
+    partitioned.save("tx", tx("2022-01-03"))
+    partitioned.save("tx", tx("2022-01-04", "2022-01-05"))
+    dataset = partitioned.save("tx", tx("2022-02-01"))
+
+    stats = partitioned.compact("tx")
+
+    assert stats == {"partitions": 1, "files_merged": 2, "files_written": 1}
+    files = manifest_files(dataset)
+    assert len(files) == 2
+    assert len(list(dataset.rglob("*.parquet"))) == 2
+
+    january = pd.read_parquet(next(f for f in files if f.parent.name == "month=01"))
+    assert january["period_of_report"].is_monotonic_increasing
+    assert len(january) == 3
+
+
+# ------------------------------------------------------------
+# Arrow schema enforcement
+# ------------------------------------------------------------
+
+def test_final_writer_accepts_arrow_schema(tmp_dir, valid_df, schema):
+    writer = FinalWriter(
+        directory=tmp_dir,
+        expected_schema=schema,
+        enforce_types=pa.schema([("issuer_ticker", pa.string()), ("cik", pa.string())]),
+    )
+    df = valid_df.astype({"issuer_ticker": "string"})
+
+    writer.save("exchange_mapping_final", df)
+
+
+def test_final_writer_widens_ints_to_declared_float(tmp_dir):
+    writer = FinalWriter(tmp_dir, ["total_value"], enforce_types={"total_value": float})
+
+    writer.save("tx", pd.DataFrame({"total_value": [1, 2]}))
+
+
+def test_final_writer_type_failure_report_names_offending_values(writer, valid_df):
+    df = pd.concat([valid_df] * 3, ignore_index=True)
+    df.loc[2, "cik"] = 320193
+
+    with pytest.raises(TypeError) as e:
+        writer.save("exchange_mapping_final", df)
+
+    assert "'cik'" in str(e.value)
+    assert "{'str': 2, 'int': 1}" in str(e.value)
+    assert "{2: 320193}" in str(e.value)
+
+
+def test_final_writer_rejects_unsupported_type_declaration(tmp_dir):
+    with pytest.raises(ValueError):
+        FinalWriter(tmp_dir, ["x"], enforce_types={"x": list})
+
+
+def test_partitions_share_the_declared_schema(tmp_dir):
+    writer = FinalWriter(
+        directory=tmp_dir,
+        expected_schema=["issuer_ticker", "period_of_report", "officer_title"],
+        enforce_types={"issuer_ticker": str, "officer_title": str},
+        partition_by="period_of_report",
+    )
+    df = pd.DataFrame({
+        "issuer_ticker": ["AAPL", "MSFT"],
+        "period_of_report": pd.to_datetime(["2022-01-03", "2022-02-01"], utc=True),
+        "officer_title": ["CEO", None],  # February's only value is null
+    })
+    dataset = writer.save("tx", df)
+
+    schemas = {
+        str(pq.read_schema(dataset / e["path"]).field("officer_title").type)
+        for e in read_manifest(dataset)["files"]
+    }
+    assert schemas == {"string"}
+    back = pd.read_parquet(dataset)
+    assert back.sort_values("issuer_ticker")["officer_title"].tolist() == ["CEO", None]
+
+
+def _save_many(directory, worker):
+    writer = FinalWriter(
+        directory=directory,
+        expected_schema=["issuer_ticker", "period_of_report", "total_value"],
+        partition_by="period_of_report",
+    )
+    for _ in range(15):
+        writer.save("tx", tx("2022-01-03", f"2022-0{worker + 2}-01"))
+
+
+def test_concurrent_processes_keep_every_manifest_entry(tmp_dir):
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_save_many, args=(tmp_dir, w)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+
+    manifest = read_manifest(tmp_dir / "tx")
+    assert len(manifest["files"]) == 4 * 15 * 2
+    assert manifest["version"] == 4 * 15
+    assert sorted(p.name for p in (tmp_dir / "tx").rglob("*.parquet")) == sorted(
+        Path(e["path"]).name for e in manifest["files"]
+    )
@@ -0,0 +1,130 @@
+import json
+import multiprocessing
+
+import pytest
+
+from writers.raw_archive import RawArchive
+from writers.raw_writer import RawWriter
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+
+def filing(n: int, filed_at: str, period: str = "2022-01-03"):
+    return {
+        "accessionNo": f"0000000000-22-{n:06d}",
+        "filedAt": filed_at,
+        "periodOfReport": period,
+        "issuer": {"tradingSymbol": "AAPL"},
+    }
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = RawArchive(tmp_path / "archive")
+    yield archive
+    archive.close()
+
+
+# ------------------------------------------------------------
+# Tests
+# ------------------------------------------------------------
+
+def test_add_skips_already_archived_accessions(archive):
+    first = [filing(1, "2022-01-04T10:00:00-05:00"), filing(2, "2022-01-05T10:00:00-05:00")]
+
+    assert archive.add(first) == (2, 0)
+    # overlapping page plus a duplicate inside the same batch
+    assert archive.add([filing(2, "2022-01-05T10:00:00-05:00"), filing(3, "2022-01-06"), filing(3, "2022-01-06")]) == (1, 2)
+    assert len(archive) == 3
+
+
+def test_get_roundtrips_the_filing(archive):
+    original = filing(7, "2022-01-04T10:00:00-05:00")
+    archive.add([original])
+
+    assert archive.get(original["accessionNo"]) == original
+    assert original["accessionNo"] in archive
+    assert archive.get("missing") is None
+
+
+def test_get_sees_records_appended_after_mapping(archive):
+    archive.add([filing(1, "2022-01-04")])
+    archive.get(filing(1, "2022-01-04")["accessionNo"])  # maps the segment
+
+    archive.add([filing(2, "2022-01-05")])
+
+    assert archive.get(filing(2, "2022-01-05")["accessionNo"])["filedAt"] == "2022-01-05"
+
+
+def test_records_without_accession_are_not_archived(archive):
+    bare = {"filedAt": "2022-01-04", "issuer": {"tradingSymbol": "XOM"}}
+
+    # {} is the API source's end-of-stream sentinel
+    assert archive.add([bare, {}, filing(1, "2022-01-04")]) == (1, 0)
+    assert len(archive) == 1
+
+
+def test_iter_range_uses_utc_filed_date(archive):
+    archive.add([
+        filing(1, "2022-01-03T23:30:00-05:00"),  # 2022-01-04 in UTC
+        filing(2, "2022-01-05T10:00:00-05:00"),
+        filing(3, "2022-02-01T10:00:00-05:00", period="2021-12-31"),
+    ])
+
+    in_range = [f["accessionNo"][-1] for f in archive.iter_range("2022-01-04", "2022-01-31")]
+    by_period = [f["accessionNo"][-1] for f in archive.iter_range(end="2021-12-31", by="period_of_report")]
+
+    assert in_range == ["1", "2"]
+    assert by_period == ["3"]
+
+
+def test_segments_roll_over_and_batches_cover_them(tmp_path):
+    archive = RawArchive(tmp_path / "archive", segment_bytes=64)
+    archive.add([filing(n, "2022-01-04") for n in range(5)])
+    archive.add([filing(n, "2022-01-04") for n in range(5, 10)])
+
+    assert len(list((tmp_path / "archive").glob("segment-*.bin"))) > 1
+
+    batches = list(archive.iter_batches(batch_size=4))
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert [f["accessionNo"] for b in batches for f in b] == [filing(n, "")["accessionNo"] for n in range(10)]
+    archive.close()
+
+
+FIRSTS = (0, 1000, 2000, 3000)
+
+
+def _append(directory, first):
+    archive = RawArchive(directory, segment_bytes=4096)
+    for n in range(first, first + 200):
+        archive.add([filing(n, "2022-01-04")])
+    archive.close()
+
+
+def test_processes_appending_to_one_archive_get_distinct_offsets(tmp_path):
+    directory = tmp_path / "archive"
+    RawArchive(directory).close()  # create the index before the race
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_append, args=(directory, first)) for first in FIRSTS]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(60)
+
+    archive = RawArchive(directory)
+    keys = [filing(n, "")["accessionNo"] for first in FIRSTS for n in range(first, first + 200)]
+    assert [archive.get(k)["accessionNo"] for k in keys] == keys
+    archive.close()
+
+
+def test_raw_writer_archives_and_imports_json(tmp_path):
+    writer = RawWriter(directory=tmp_path)
+    legacy = tmp_path / "insider_transactions_2022.json"
+    legacy.write_text(json.dumps([filing(1, "2022-01-04"), filing(2, "2022-01-05")]))
+
+    assert writer.archive.import_json(legacy) == (2, 0)
+    assert writer.save_filings([filing(2, "2022-01-05"), filing(3, "2022-01-06")]) == (1, 1)
+    assert (tmp_path / "archive" / RawArchive.INDEX_FILE).exists()